@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import multiprocessing
 import os
 import sys
 
@@ -16,6 +17,8 @@ from helper import Helper
 
 
 def main() -> None:
+    # Parallel search starts its worker processes from this executable, also when it's a packaged build.
+    multiprocessing.freeze_support()
     parser = ArgumentParser(description="Inspect JSON file with GUI")
     parser.add_argument("path", nargs="?")
     a: Namespace = parser.parse_args()
@@ -27,6 +30,7 @@ def main() -> None:
     QGuiApplication.setDesktopFileName("Json Inspector")
 
     manager = JsonManager(a.path if a.path else None)
+    app.aboutToQuit.connect(manager.shutdown)  # type: ignore
     win = manager.gui
     win.show()
     win.setWindowIcon(icon)
@@ -0,0 +1,375 @@
+import bz2
+import gzip
+import io
+import lzma
+import os
+import struct
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import IO, Any, ClassVar, Deque, Iterable, Iterator, List, Tuple, Type
+
+try:
+    import zstandard  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    lz4_frame = None
+
+
+class Codec:
+    name: ClassVar[str] = ""
+    package: ClassVar[str] = ""
+    extensions: ClassVar[Tuple[str, ...]] = ()
+    magic: ClassVar[bytes] = b""
+
+    @classmethod
+    def available(cls) -> bool:
+        return True
+
+    @classmethod
+    def require(cls) -> None:
+        if not cls.available():
+            raise OSError(f"{cls.name} compressed files need the {cls.package} package")
+
+    @classmethod
+    def errors(cls) -> Tuple[Type[Exception], ...]:
+        # What the library raises for data that is cut off or corrupt, callers only expect OSError from a read.
+        return (EOFError,)
+
+    @classmethod
+    def corrupt(cls, error: Exception) -> OSError:
+        return OSError(f"The {cls.name} compressed data is damaged: {error}")
+
+    @classmethod
+    def compress(cls, data: bytes) -> bytes:
+        raise NotImplementedError
+
+    @classmethod
+    def compressor(cls) -> Any:
+        # An object with compress() and flush(), like zlib's.
+        raise NotImplementedError
+
+    @classmethod
+    def compress_stream(cls, pieces: Iterable[bytes]) -> Iterator[bytes]:
+        # Compresses pieces as they come in, a writer never has to hold all of its output at once.
+        compressor: Any = cls.compressor()
+        for piece in pieces:
+            out: bytes = compressor.compress(piece)
+            if out:
+                yield out
+        yield compressor.flush()
+
+    @classmethod
+    def decompress(cls, data: bytes | bytearray) -> bytes:
+        raise NotImplementedError
+
+    @classmethod
+    def reader(cls, raw: IO[bytes]) -> IO[bytes]:
+        raise NotImplementedError
+
+
+class GzipCodec(Codec):
+    # Saved as independent members of BLOCK_SIZE input bytes, compressed on a thread each (zlib lets go of the
+    # GIL). Every member's header carries its compressed length in an extra field, so loading can find the
+    # members without inflating them and inflate them in parallel too. Any gzip reader still reads the file.
+    name = "gzip"
+    extensions = (".gz",)
+    magic = b"\x1f\x8b"
+    BLOCK_SIZE = 4 * 1024 * 1024
+    LEVEL = 6
+    _SUBFIELD = b"JI"
+    # Magic, deflate, FEXTRA, no mtime, no extra flags, unknown OS, then XLEN and the one subfield.
+    _HEADER = struct.Struct("<2sBBIBBH2sHI")
+
+    @classmethod
+    def errors(cls) -> Tuple[Type[Exception], ...]:
+        return (EOFError, zlib.error)
+
+    @classmethod
+    def compress(cls, data: bytes) -> bytes:
+        view = memoryview(data)
+        blocks: List[memoryview] = [view[i : i + cls.BLOCK_SIZE] for i in range(0, len(data), cls.BLOCK_SIZE)]
+        if len(blocks) < 2:
+            return cls._member(data)
+        with ThreadPoolExecutor(Compression.threads()) as pool:
+            return b"".join(pool.map(cls._member, blocks))
+
+    @classmethod
+    def compress_stream(cls, pieces: Iterable[bytes]) -> Iterator[bytes]:
+        # Blocks are compressed while the next ones are still being produced, a few per thread are kept queued.
+        with ThreadPoolExecutor(Compression.threads()) as pool:
+            pending: Deque[Future[bytes]] = deque()
+            block: bytearray = bytearray()
+            for piece in pieces:
+                block += piece
+                while len(block) >= cls.BLOCK_SIZE:
+                    pending.append(pool.submit(cls._member, bytes(block[: cls.BLOCK_SIZE])))
+                    del block[: cls.BLOCK_SIZE]
+                    while len(pending) > 2 * Compression.threads():
+                        yield pending.popleft().result()
+            if block or not pending:
+                pending.append(pool.submit(cls._member, bytes(block)))
+            while pending:
+                yield pending.popleft().result()
+
+    @classmethod
+    def _member(cls, block: bytes | memoryview) -> bytes:
+        deflate = zlib.compressobj(cls.LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS)
+        body: bytes = deflate.compress(block) + deflate.flush()
+        size: int = cls._HEADER.size + len(body) + 8
+        header: bytes = cls._HEADER.pack(cls.magic, 8, 4, 0, 0, 255, 8, cls._SUBFIELD, 4, size)
+        return header + body + struct.pack("<II", zlib.crc32(block), len(block) & 0xFFFFFFFF)
+
+    @classmethod
+    def decompress(cls, data: bytes | bytearray) -> bytes:
+        members: List[Tuple[int, int]] | None = cls._members(data)
+        if members is None or len(members) < 2:
+            return gzip.decompress(data)
+        view = memoryview(data)
+
+        def member(span: Tuple[int, int]) -> bytes:
+            return gzip.decompress(view[span[0] : span[1]])
+
+        with ThreadPoolExecutor(Compression.threads()) as pool:
+            return b"".join(pool.map(member, members))
+
+    @classmethod
+    def _members(cls, data: bytes | bytearray) -> List[Tuple[int, int]] | None:
+        # Start and end of every member, or None when a member doesn't say how long it is or says so wrongly.
+        members: List[Tuple[int, int]] = []
+        offset: int = 0
+        while offset < len(data):
+            if len(data) - offset < cls._HEADER.size:
+                return None
+            magic, _, flags, _, _, _, xlen, subfield, length, size = cls._HEADER.unpack_from(data, offset)
+            if magic != cls.magic or flags != 4 or xlen != 8 or subfield != cls._SUBFIELD or length != 4:
+                return None
+            if size < cls._HEADER.size + 8 or offset + size > len(data):
+                return None
+            members.append((offset, offset + size))
+            offset += size
+        return members
+
+    @classmethod
+    def reader(cls, raw: IO[bytes]) -> IO[bytes]:
+        return gzip.GzipFile(fileobj=raw, mode="rb")  # type: ignore[return-value]
+
+
+class ZstdCodec(Codec):
+    name = "zstd"
+    package = "zstandard"
+    extensions = (".zst", ".zstd")
+    magic = b"\x28\xb5\x2f\xfd"
+    LEVEL = 3
+
+    @classmethod
+    def available(cls) -> bool:
+        return zstandard is not None
+
+    @classmethod
+    def errors(cls) -> Tuple[Type[Exception], ...]:
+        return (zstandard.ZstdError,)  # type: ignore
+
+    @classmethod
+    def compress(cls, data: bytes) -> bytes:
+        # zstd splits the input into jobs for its own worker threads.
+        compressor = zstandard.ZstdCompressor(level=cls.LEVEL, threads=Compression.threads())  # type: ignore
+        return compressor.compress(data)
+
+    @classmethod
+    def compressor(cls) -> Any:
+        return zstandard.ZstdCompressor(level=cls.LEVEL, threads=Compression.threads()).compressobj()  # type: ignore
+
+    @classmethod
+    def decompress(cls, data: bytes | bytearray) -> bytes:
+        # Frames written by streaming compressors don't record their size, reading them as a stream always works.
+        reader = zstandard.ZstdDecompressor().stream_reader(data, read_across_frames=True)  # type: ignore
+        return reader.read()
+
+    @classmethod
+    def reader(cls, raw: IO[bytes]) -> IO[bytes]:
+        return zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True)  # type: ignore
+
+
+class Lz4Codec(Codec):
+    name = "lz4"
+    package = "lz4"
+    extensions = (".lz4",)
+    magic = b"\x04\x22\x4d\x18"
+
+    @classmethod
+    def available(cls) -> bool:
+        return lz4_frame is not None
+
+    @classmethod
+    def errors(cls) -> Tuple[Type[Exception], ...]:
+        # The frame decoder reports damaged data as RuntimeError.
+        return (EOFError, RuntimeError)
+
+    @classmethod
+    def compress(cls, data: bytes) -> bytes:
+        return lz4_frame.compress(data)  # type: ignore
+
+    @classmethod
+    def compress_stream(cls, pieces: Iterable[bytes]) -> Iterator[bytes]:
+        compressor = lz4_frame.LZ4FrameCompressor()  # type: ignore
+        yield compressor.begin()
+        for piece in pieces:
+            yield compressor.compress(piece)  # type: ignore
+        yield compressor.flush()
+
+    @classmethod
+    def decompress(cls, data: bytes | bytearray) -> bytes:
+        return lz4_frame.decompress(data)  # type: ignore
+
+    @classmethod
+    def reader(cls, raw: IO[bytes]) -> IO[bytes]:
+        return lz4_frame.LZ4FrameFile(raw, mode="rb")  # type: ignore
+
+
+class Bz2Codec(Codec):
+    name = "bzip2"
+    extensions = (".bz2",)
+    magic = b"BZh"
+
+    @classmethod
+    def errors(cls) -> Tuple[Type[Exception], ...]:
+        return (EOFError, ValueError)
+
+    @classmethod
+    def compress(cls, data: bytes) -> bytes:
+        return bz2.compress(data)
+
+    @classmethod
+    def compressor(cls) -> Any:
+        return bz2.BZ2Compressor()
+
+    @classmethod
+    def decompress(cls, data: bytes | bytearray) -> bytes:
+        return bz2.decompress(data)
+
+    @classmethod
+    def reader(cls, raw: IO[bytes]) -> IO[bytes]:
+        return bz2.BZ2File(raw, mode="rb")  # type: ignore[return-value]
+
+
+class XzCodec(Codec):
+    name = "xz"
+    extensions = (".xz",)
+    magic = b"\xfd7zXZ\x00"
+
+    @classmethod
+    def errors(cls) -> Tuple[Type[Exception], ...]:
+        return (EOFError, lzma.LZMAError)
+
+    @classmethod
+    def compress(cls, data: bytes) -> bytes:
+        return lzma.compress(data)
+
+    @classmethod
+    def compressor(cls) -> Any:
+        return lzma.LZMACompressor()
+
+    @classmethod
+    def decompress(cls, data: bytes | bytearray) -> bytes:
+        return lzma.decompress(data)
+
+    @classmethod
+    def reader(cls, raw: IO[bytes]) -> IO[bytes]:
+        return lzma.LZMAFile(raw, mode="rb")  # type: ignore[return-value]
+
+
+class CheckedReader(io.RawIOBase):
+    # A codec's stream whose errors for damaged data come out as OSError, like those of the file underneath.
+    def __init__(self, codec: Type[Codec], stream: IO[bytes]) -> None:
+        super().__init__()
+        self._codec: Type[Codec] = codec
+        self._stream: IO[bytes] = stream
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        try:
+            return self._stream.read(size)
+        except self._codec.errors() as e:
+            raise self._codec.corrupt(e) from e
+
+    def readinto(self, buffer: Any) -> int:
+        data: bytes = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def close(self) -> None:
+        if not self.closed:
+            self._stream.close()
+        super().close()
+
+
+class Compression:
+    # Loading goes by the first bytes of the file, saving by its extension. Anything else is plain JSON.
+    _registry: ClassVar[List[Type[Codec]]] = [GzipCodec, ZstdCodec, Lz4Codec, Bz2Codec, XzCodec]
+    MAGIC_SIZE: ClassVar[int] = 6
+
+    @classmethod
+    def threads(cls) -> int:
+        return os.cpu_count() or 1
+
+    @classmethod
+    def extensions(cls) -> List[str]:
+        return [ext for codec in cls._registry for ext in codec.extensions]
+
+    @classmethod
+    def file_filter(cls) -> str:
+        patterns: str = " ".join(f"*{ext}" for ext in (".json", *cls.extensions()))
+        return f"JSON files ({patterns});;All files (*)"
+
+    @classmethod
+    def detect(cls, head: bytes | bytearray | memoryview) -> Type[Codec] | None:
+        head = bytes(head[: cls.MAGIC_SIZE])
+        for codec in cls._registry:
+            if head.startswith(codec.magic):
+                return codec
+        return None
+
+    @classmethod
+    def for_path(cls, path: str) -> Type[Codec] | None:
+        lowered: str = path.lower()
+        for codec in cls._registry:
+            if lowered.endswith(codec.extensions):
+                return codec
+        return None
+
+    @classmethod
+    def decompress(cls, data: bytes | bytearray) -> bytes | bytearray:
+        codec: Type[Codec] | None = cls.detect(data)
+        if codec is None:
+            return data
+        codec.require()
+        try:
+            return codec.decompress(data)
+        except codec.errors() as e:
+            raise codec.corrupt(e) from e
+
+    @classmethod
+    def compress(cls, data: bytes, path: str) -> bytes:
+        codec: Type[Codec] | None = cls.for_path(path)
+        if codec is None:
+            return data
+        codec.require()
+        return codec.compress(data)
+
+    @classmethod
+    def open(cls, raw: IO[bytes]) -> IO[bytes]:
+        # A readable stream of the decompressed contents, or raw itself for plain files.
+        head: bytes = raw.read(cls.MAGIC_SIZE)
+        raw.seek(0)
+        codec: Type[Codec] | None = cls.detect(head)
+        if codec is None:
+            return raw
+        codec.require()
+        return CheckedReader(codec, codec.reader(raw))  # type: ignore[return-value]
@@ -0,0 +1,79 @@
+from typing import Any, Callable, Dict, List, Set, Tuple, Union
+
+from helper import LoadCancelled
+
+Path = Tuple[Union[str, int], ...]
+
+
+class DocumentDiff:
+    # Lists are compared a slice at a time first, so runs of equal items are skipped in one comparison.
+    LIST_CHUNK = 1024
+    CANCEL_CHECK_INTERVAL = 4096
+
+    def __init__(self) -> None:
+        # Containers whose contents differ, mapped to True when their keys changed rather than only values under
+        # them. Lists that only grew or shrank at the end keep their keys.
+        self.containers: Dict[Path, bool] = {}
+        # Values that were replaced: scalars that differ, or a different type of value under the same key.
+        self.changed: Set[Path] = set()
+        self.added: List[Path] = []
+        self.removed: List[Path] = []
+
+    @classmethod
+    def compare(cls, old: Any, new: Any, is_cancelled: Callable[[], bool] | None = None) -> "DocumentDiff":
+        # Top down, a pair of subtrees is only looked into when == says they differ. That comparison runs in C
+        # and stops at the first difference, so unchanged branches cost next to nothing and are never visited.
+        diff = cls()
+        stack: List[Tuple[Path, Any, Any]] = [((), old, new)]
+        checked: int = 0
+        while stack:
+            path, a, b = stack.pop()
+            checked += 1
+            if checked % cls.CANCEL_CHECK_INTERVAL == 0 and is_cancelled is not None and is_cancelled():
+                raise LoadCancelled()
+            if cls._same(a, b):
+                continue
+            if isinstance(a, dict) and isinstance(b, dict):
+                diff._compare_dicts(path, a, b, stack)  # type: ignore[arg-type]
+            elif isinstance(a, list) and isinstance(b, list):
+                diff._compare_lists(path, a, b, stack)  # type: ignore[arg-type]
+            else:
+                diff.changed.add(path)
+        return diff
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.containers and not self.changed
+
+    @staticmethod
+    def _same(a: Any, b: Any) -> bool:
+        # 1, 1.0 and True are equal but not the same JSON value. Only checked where values are compared one by
+        # one, a 1 that became true deep inside a container that otherwise compares equal isn't noticed.
+        return a is b or (a.__class__ is b.__class__ and a == b)
+
+    def _compare_dicts(
+        self, path: Path, a: Dict[Any, Any], b: Dict[Any, Any], stack: List[Tuple[Path, Any, Any]]
+    ) -> None:
+        keys_changed: bool = len(a) != len(b) or list(a) != list(b)
+        self.containers[path] = keys_changed
+        if keys_changed:
+            self.removed.extend((*path, key) for key in a if key not in b)
+            self.added.extend((*path, key) for key in b if key not in a)
+        same = self._same
+        for key, value in b.items():
+            if key in a and not same(a[key], value):
+                stack.append(((*path, key), a[key], value))
+
+    def _compare_lists(self, path: Path, a: List[Any], b: List[Any], stack: List[Tuple[Path, Any, Any]]) -> None:
+        self.containers[path] = False
+        common: int = min(len(a), len(b))
+        same = self._same
+        for start in range(0, common, self.LIST_CHUNK):
+            end: int = min(start + self.LIST_CHUNK, common)
+            if a[start:end] == b[start:end]:
+                continue
+            for i in range(start, end):
+                if not same(a[i], b[i]):
+                    stack.append(((*path, i), a[i], b[i]))
+        self.removed.extend((*path, i) for i in range(common, len(a)))
+        self.added.extend((*path, i) for i in range(common, len(b)))
@@ -0,0 +1,216 @@
+import heapq
+import itertools
+import sys
+from array import array
+from collections import Counter
+from typing import Any, Callable, Counter as CounterType, Dict, Iterator, List, Tuple, Union
+
+from helper import LoadCancelled
+
+Path = Tuple[Union[str, int], ...]
+# Size, then the negated order it was seen in so ties rank in document order.
+Ranked = Tuple[int, int, Path]
+# Descendants, compact JSON bytes and in-memory bytes of a subtree.
+Subtree = Tuple[int, int, int]
+
+
+class DocumentStats:
+    # Largest containers and longest strings kept per table. Edits can push entries out but not bring back the
+    # ones that were just below the cut, so more are kept than are shown.
+    TOP = 10
+    KEEP = 50
+    CANCEL_CHECK_INTERVAL = 65536
+    # Typed as plain types so values checked against them stay Any.
+    CONTAINERS: Tuple[type, ...] = (dict, list, tuple, set)
+
+    def __init__(self) -> None:
+        self.node_count: int = 0
+        self._types: CounterType[type] = Counter()
+        # Nodes per depth rather than just the deepest, so an edit that removes the deepest branch can be undone.
+        self._depths: CounterType[int] = Counter()
+        self.key_counts: CounterType[str] = Counter()
+        self._largest: List[Ranked] = []
+        self._longest: List[Ranked] = []
+        self._heaviest: List[Ranked] = []
+        self._order = itertools.count()
+        self._root: Any = None
+        # Subtree totals of every container, by id() since containers aren't hashable. A row per container in
+        # flat arrays keeps this small next to the document, rows of replaced containers are left unused.
+        self._subtree_rows: Dict[int, int] = {}
+        self._descendants: array[int] = array("q")
+        self._json_sizes: array[int] = array("q")
+        self._memory_sizes: array[int] = array("q")
+
+    @classmethod
+    def build(cls, data: Any, is_cancelled: Callable[[], bool] | None = None) -> "DocumentStats":
+        stats = cls()
+        stats._root = data
+        stats._walk(data, (), 1, is_cancelled)
+        return stats
+
+    def update(self, path: Path, old: Any, new: Any, root: Any = None) -> None:
+        # root is the new document when the edit copied the containers along path instead of changing them.
+        removed: Subtree = self._walk(old, path, -1)
+        # The replaced subtree and every container above it leave the rankings, the ancestors come back below
+        # with their new totals.
+        for name in ("_largest", "_longest", "_heaviest"):
+            heap: List[Ranked] = [
+                entry
+                for entry in getattr(self, name)
+                if entry[2][: len(path)] != path and path[: len(entry[2])] != entry[2]
+            ]
+            heapq.heapify(heap)
+            setattr(self, name, heap)
+        added: Subtree = self._walk(new, path, 1)
+
+        delta: Subtree = (added[0] - removed[0], added[1] - removed[1], added[2] - removed[2])
+        obj: Any = self._root
+        copy: Any = self._root if root is None else root
+        for depth in range(len(path)):
+            # The copies take over the rows of the containers they replace.
+            row: int | None = self._subtree_rows.pop(id(obj), None)
+            if row is not None:
+                self._subtree_rows[id(copy)] = row
+                self._descendants[row] += delta[0]
+                self._json_sizes[row] += delta[1]
+                self._memory_sizes[row] += delta[2]
+                self._rank(self._largest, len(obj), path[:depth])
+                self._rank(self._heaviest, self._json_sizes[row], path[:depth])
+            obj, copy = obj[path[depth]], copy[path[depth]]
+        if root is not None:
+            self._root = root
+
+    def subtree(self, container: Any) -> Subtree | None:
+        row: int | None = self._subtree_rows.get(id(container))
+        if row is None:
+            return None
+        return self._descendants[row], self._json_sizes[row], self._memory_sizes[row]
+
+    def heaviest_subtrees(self, limit: int = KEEP) -> List[Tuple[Path, Subtree]]:
+        return [(path, self._subtree_at(path)) for _, _, path in heapq.nlargest(limit, self._heaviest)]
+
+    def _subtree_at(self, path: Path) -> Subtree:
+        obj: Any = self._root
+        for key in path:
+            obj = obj[key]
+        return self.subtree(obj) or (0, 0, 0)
+
+    @property
+    def type_counts(self) -> List[Tuple[str, int]]:
+        counts: CounterType[str] = Counter()
+        for typ, count in self._types.items():
+            # Lazy containers subclass dict and list, like everywhere else they count as the plain types.
+            name: str = "dict" if issubclass(typ, dict) else "list" if issubclass(typ, list) else typ.__name__
+            counts[name] += count
+        return [(name, count) for name, count in counts.most_common() if count > 0]
+
+    @property
+    def max_depth(self) -> int:
+        return max((depth for depth, count in self._depths.items() if count > 0), default=0)
+
+    def largest_containers(self, limit: int = TOP) -> List[Tuple[int, Path]]:
+        return [(size, path) for size, _, path in heapq.nlargest(limit, self._largest)]
+
+    def longest_strings(self, limit: int = TOP) -> List[Tuple[int, Path]]:
+        return [(size, path) for size, _, path in heapq.nlargest(limit, self._longest)]
+
+    def common_keys(self, limit: int = TOP) -> List[Tuple[str, int]]:
+        return [(key, count) for key, count in self.key_counts.most_common(limit) if count > 0]
+
+    @staticmethod
+    def _children(data: Any) -> Iterator[Tuple[Any, Any]]:
+        return iter(data.items()) if isinstance(data, dict) else enumerate(data)  # type: ignore
+
+    def _rank(self, heap: List[Ranked], size: int, path: Path) -> None:
+        if len(heap) < self.KEEP:
+            heapq.heappush(heap, (size, -next(self._order), path))
+        elif size > heap[0][0]:
+            heapq.heapreplace(heap, (size, -next(self._order), path))
+
+    @staticmethod
+    def _scalar_json_size(value: Any) -> int:
+        # Compact JSON, ignoring escapes. repr() gives the same length for numbers, True/False and None/null.
+        return len(value) + 2 if isinstance(value, str) else len(repr(value))
+
+    def _walk(self, data: Any, path: Path, sign: int, is_cancelled: Callable[[], bool] | None = None) -> Subtree:
+        # One iterative pass over the subtree at path, adding its nodes to every table or (with sign -1) taking
+        # them out again, returns the subtree's totals. Container totals are summed up as their iterators run
+        # out. Rankings are only added to, update() drops the entries under a replaced path.
+        types, depths, key_counts = self._types, self._depths, self.key_counts
+        largest, longest = self._largest, self._longest
+        rows, descendants, json_sizes, memory_sizes = (
+            self._subtree_rows, self._descendants, self._json_sizes, self._memory_sizes
+        )
+        getsizeof = sys.getsizeof
+        containers: Tuple[type, ...] = self.CONTAINERS
+        base: int = len(path)
+        keys: List[Any] = list(path)
+        count: int = 1
+
+        types[type(data)] += sign
+        depths[base] += sign
+        stack: List[Iterator[Tuple[Any, Any]]] = []
+        # Per open container: the container and its (descendants, json size, memory size) so far.
+        frames: List[Tuple[Any, Subtree]] = []
+        total: Subtree = (0, 0, 0)
+        if isinstance(data, containers):
+            if sign > 0:
+                self._rank(largest, len(data), path)
+            stack.append(self._children(data))
+            frames.append((data, (0, 2 + max(len(data) - 1, 0), getsizeof(data))))
+        else:
+            if isinstance(data, str) and sign > 0:
+                self._rank(longest, len(data), path)
+            total = (0, self._scalar_json_size(data), getsizeof(data))
+
+        while stack:
+            # The innermost container's totals are kept in locals while its children are visited.
+            container, (desc, json_size, memory) = frames[-1]
+            for key, value in stack[-1]:
+                count += 1
+                if count % self.CANCEL_CHECK_INTERVAL == 0 and is_cancelled is not None and is_cancelled():
+                    raise LoadCancelled()
+                desc += 1
+                if key.__class__ is str:
+                    key_counts[key] += sign
+                    json_size += len(key) + 3
+                    memory += getsizeof(key)
+                types[value.__class__] += sign
+                depths[base + len(stack)] += sign
+
+                if isinstance(value, containers):
+                    if sign > 0 and (len(largest) < self.KEEP or len(value) > largest[0][0]):
+                        self._rank(largest, len(value), (*keys, key))
+                    frames[-1] = (container, (desc, json_size, memory))
+                    stack.append(self._children(value))
+                    frames.append((value, (0, 2 + max(len(value) - 1, 0), getsizeof(value))))
+                    keys.append(key)
+                    break
+                if value.__class__ is str:
+                    json_size += len(value) + 2
+                    if sign > 0 and (len(longest) < self.KEEP or len(value) > longest[0][0]):
+                        self._rank(longest, len(value), (*keys, key))
+                else:
+                    json_size += len(repr(value))
+                memory += getsizeof(value)
+            else:
+                stack.pop()
+                frames.pop()
+                if sign > 0:
+                    rows[id(container)] = len(descendants)
+                    descendants.append(desc)
+                    json_sizes.append(json_size)
+                    memory_sizes.append(memory)
+                    heaviest: List[Ranked] = self._heaviest
+                    if len(heaviest) < self.KEEP or json_size > heaviest[0][0]:
+                        self._rank(heaviest, json_size, tuple(keys))
+                else:
+                    rows.pop(id(container), None)
+                if stack:
+                    keys.pop()
+                    parent, (p_desc, p_json, p_memory) = frames[-1]
+                    frames[-1] = (parent, (p_desc + desc, p_json + json_size, p_memory + memory))
+                else:
+                    total = (desc, json_size, memory)
+        self.node_count += sign * count
+        return total
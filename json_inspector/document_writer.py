@@ -0,0 +1,261 @@
+import multiprocessing
+import os
+import stat
+import tempfile
+import threading
+from collections import deque
+from multiprocessing.pool import AsyncResult, Pool
+from typing import IO, Any, Callable, Deque, Iterator, List, Tuple, Type, Union
+
+from compression import Codec, Compression
+from json_backend import JsonBackends
+
+# Whether the entries are key/value pairs, the entries, and the depth of the container they are in.
+Chunk = Tuple[bool, List[Any], int]
+Piece = Union[bytes, Chunk]
+
+# Read once while there is only one thread, new files get the permissions open() would have given them.
+_UMASK: int = os.umask(0)
+os.umask(_UMASK)
+
+
+class SaveCancelled(Exception):
+    pass
+
+
+class DocumentWriter:
+    # The document is written as pieces: brackets, separators and keys of the containers that are split up, and
+    # chunks of entries the JSON backend encodes in one call each. Containers with at least SPLIT_MIN entries
+    # are split, the rest are part of a chunk, so a document with a few huge branches still saves in steps.
+    CHUNK_ENTRIES = 1000
+    SPLIT_MIN = 1000
+    WRITE_BUFFER = 8 * 1024 * 1024
+
+    def __init__(self, data: Any, indent: int | None = 4, encoder: "ParallelEncoder | None" = None) -> None:
+        self._data: Any = data
+        self._indent: int | None = indent or None
+        self._encoder: ParallelEncoder | None = encoder
+
+    def pieces(self) -> List[Piece]:
+        pieces: List[Piece] = []
+        data: Any = self._data
+        if isinstance(data, (dict, list)) and data:
+            self._split(data, 0, b"", pieces)
+        else:
+            pieces.append(JsonBackends.dumps(data, self._indent))
+        return pieces
+
+    def _split(self, container: Any, depth: int, prefix: bytes, pieces: List[Piece]) -> None:
+        indent: int | None = self._indent
+        is_dict: bool = isinstance(container, dict)
+        pad: bytes = b" " * (indent * (depth + 1)) if indent else b""
+        separator: bytes = b",\n" if indent else b","
+        pieces.append(prefix + (b"{" if is_dict else b"[") + (b"\n" if indent else b""))
+        run: List[Any] = []
+        written: int = 0
+
+        def _flush() -> None:
+            nonlocal run, written
+            if run:
+                if written:
+                    pieces.append(separator)
+                pieces.append((is_dict, run, depth))
+                written += len(run)
+                run = []
+
+        for entry in container.items() if is_dict else container:  # type: ignore
+            value: Any = entry[1] if is_dict else entry  # type: ignore
+            if isinstance(value, (dict, list)) and len(value) >= self.SPLIT_MIN:  # type: ignore[arg-type]
+                _flush()
+                if written:
+                    pieces.append(separator)
+                written += 1
+                key: bytes = self._key(entry[0]) + (b": " if indent else b":") if is_dict else b""
+                self._split(value, depth + 1, pad + key, pieces)
+                continue
+            run.append(entry)
+            if len(run) == self.CHUNK_ENTRIES:
+                _flush()
+        _flush()
+        closing: bytes = b"}" if is_dict else b"]"
+        pieces.append(b"\n" + b" " * (indent * depth) + closing if indent else closing)
+
+    @staticmethod
+    def _key(key: Any) -> bytes:
+        # Encoded the way the backend encodes keys, non-string ones included.
+        return JsonBackends.dumps({key: None})[1:-6]
+
+    @staticmethod
+    def encode(chunk: Chunk, indent: int | None) -> bytes:
+        is_dict, entries, depth = chunk
+        encoded: bytes = JsonBackends.dumps(dict(entries) if is_dict else entries, indent)
+        if not indent:
+            return encoded[1:-1]
+        # Between the brackets the backend already indents the entries one level, deeper chunks get the rest.
+        inner: bytes = encoded[2:-2]
+        if depth:
+            pad: bytes = b" " * (indent * depth)
+            inner = pad + inner.replace(b"\n", b"\n" + pad)
+        return inner
+
+    def encoded(
+        self, progress: Callable[[int, int], None] | None = None, is_cancelled: Callable[[], bool] | None = None
+    ) -> Iterator[bytes]:
+        pieces: List[Piece] = self.pieces()
+        total: int = sum(1 for piece in pieces if not isinstance(piece, bytes))
+        if self._encoder is not None and total > 1 and self._encoder.worthwhile(self._indent):
+            yield from self._encoder.encode(pieces, self._indent, total, progress, is_cancelled)
+            return
+        done: int = 0
+        for piece in pieces:
+            if isinstance(piece, bytes):
+                yield piece
+                continue
+            if is_cancelled is not None and is_cancelled():
+                raise SaveCancelled()
+            yield self.encode(piece, self._indent)
+            done += 1
+            if progress is not None:
+                progress(done, total)
+
+    def write(
+        self,
+        path: str,
+        progress: Callable[[int, int], None] | None = None,
+        is_cancelled: Callable[[], bool] | None = None,
+    ) -> None:
+        codec: Type[Codec] | None = Compression.for_path(path)
+        if codec is not None:
+            codec.require()
+
+        def _fill(out: IO[bytes]) -> None:
+            encoded: Iterator[bytes] = self.encoded(progress, is_cancelled)
+            for piece in encoded if codec is None else codec.compress_stream(encoded):
+                out.write(piece)
+
+        self.write_atomically(path, _fill)
+
+    @classmethod
+    def write_atomically(cls, path: str, fill: Callable[[IO[bytes]], None]) -> None:
+        # Written next to the target and renamed over it once it is on disk, the target is either the old file or
+        # the new one, never half of it.
+        path = os.path.realpath(path)
+        directory: str = os.path.dirname(path)
+        fd, temp = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "wb", buffering=cls.WRITE_BUFFER) as out:
+                fill(out)
+                out.flush()
+                os.fsync(out.fileno())
+            try:
+                mode: int = stat.S_IMODE(os.stat(path).st_mode)
+            except FileNotFoundError:
+                mode = 0o666 & ~_UMASK
+            os.chmod(temp, mode)
+            os.replace(temp, path)
+        except BaseException:
+            try:
+                os.remove(temp)
+            except OSError:
+                pass
+            raise
+        cls._sync_directory(directory)
+
+    @staticmethod
+    def _sync_directory(directory: str) -> None:
+        # Makes the rename itself durable, not every platform or file system can open a directory for this.
+        try:
+            fd: int = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+def _encode_chunk(chunk: Chunk, indent: int | None, backend: str) -> bytes:
+    # Runs in a pool process, which starts out with the automatic backend choice.
+    JsonBackends.prefer(backend)
+    return DocumentWriter.encode(chunk, indent)
+
+
+class ParallelEncoder:
+    # Chunks queued per process, enough to keep every process busy while results are collected in order.
+    IN_FLIGHT_PER_PROCESS = 4
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, processes: int | None = None) -> None:
+        self.processes: int = processes or os.cpu_count() or 1
+        self._pool: Pool | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        return self.processes > 1
+
+    def worthwhile(self, indent: int | None) -> bool:
+        # Sending a chunk to a process and its fragment back costs about as much as a C encoder takes for it.
+        return self.available and not JsonBackends.get(indent=indent).encodes_natively(indent)
+
+    def _get_pool(self) -> Pool:
+        with self._lock:
+            if self._pool is None:
+                # Forking a process with running Qt threads isn't safe, the pool is started once and kept.
+                self._pool = multiprocessing.get_context("spawn").Pool(self.processes)
+            return self._pool
+
+    def encode(
+        self,
+        pieces: List[Piece],
+        indent: int | None,
+        total: int,
+        progress: Callable[[int, int], None] | None = None,
+        is_cancelled: Callable[[], bool] | None = None,
+    ) -> Iterator[bytes]:
+        # Same output as encoding the chunks one after the other, the fragments are put back in document order.
+        pool: Pool = self._get_pool()
+        backend: str = JsonBackends.preferred()
+        queue: Iterator[Piece] = iter(pieces)
+        pending: Deque[bytes | AsyncResult[bytes]] = deque()
+        in_flight: int = 0
+        done: int = 0
+
+        def submit() -> None:
+            nonlocal in_flight
+            while in_flight < self.processes * self.IN_FLIGHT_PER_PROCESS:
+                piece: Piece | None = next(queue, None)
+                if piece is None:
+                    return
+                if isinstance(piece, bytes):
+                    pending.append(piece)
+                else:
+                    pending.append(pool.apply_async(_encode_chunk, (piece, indent, backend)))
+                    in_flight += 1
+
+        submit()
+        while pending:
+            item: bytes | AsyncResult[bytes] = pending.popleft()
+            if isinstance(item, bytes):
+                yield item
+                continue
+            while True:
+                if is_cancelled is not None and is_cancelled():
+                    raise SaveCancelled()
+                if item.ready():
+                    break
+                item.wait(self.POLL_INTERVAL)
+            in_flight -= 1
+            submit()
+            yield item.get()
+            done += 1
+            if progress is not None:
+                progress(done, total)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.terminate()
+                self._pool = None
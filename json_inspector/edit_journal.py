@@ -0,0 +1,91 @@
+from typing import Any, List, NamedTuple, Tuple, Union
+
+from lazy_document import LazyDict, LazyList
+
+Path = Tuple[Union[str, int], ...]
+
+
+class Edit(NamedTuple):
+    path: Path
+    old: Any
+    new: Any
+    # The document before and after, both stay valid: an edit copies the containers along its path and leaves
+    # everything else shared with the versions before it.
+    before: Any
+    after: Any
+
+
+class EditJournal:
+    # Documents are never changed in place once an edit went through here, so any version can be handed to a
+    # worker as is and undoing an edit is switching back to the version before it.
+
+    def __init__(self) -> None:
+        self._undo: List[Edit] = []
+        self._redo: List[Edit] = []
+
+    @classmethod
+    def assign(cls, root: Any, path: Path, value: Any) -> Edit:
+        # A new version of root with value at path. Each container along the path is copied once, which costs
+        # its length in references, its other children are shared.
+        if not path:
+            return Edit(path, root, value, root, value)
+        containers: List[Any] = [root]
+        for key in path[:-1]:
+            containers.append(cls._child(containers[-1], path, key))
+        parent: Any = containers[-1]
+        old: Any = cls._child(parent, path, path[-1])
+        replacement: Any = value
+        for container, key in zip(reversed(containers), reversed(path)):
+            copy: Any = cls._copy(container)
+            copy[key] = replacement
+            replacement = copy
+        return Edit(path, old, value, root, replacement)
+
+    @staticmethod
+    def _child(container: Any, path: Path, key: Union[str, int]) -> Any:
+        if isinstance(container, dict):
+            if key not in container:
+                raise KeyError(path)
+        elif (
+            not isinstance(container, list)
+            or not isinstance(key, int)
+            or not 0 <= key < len(container)  # type: ignore[arg-type]
+        ):
+            raise KeyError(path)
+        return container[key]  # type: ignore[index]
+
+    @staticmethod
+    def _copy(container: Any) -> Any:
+        if isinstance(container, (LazyDict, LazyList)):
+            # Stays lazy so the document is still known to be backed by its file, with its children loaded.
+            return container.clone()
+        return dict(container) if isinstance(container, dict) else list(container)  # type: ignore
+
+    def record(self, edit: Edit) -> None:
+        self._undo.append(edit)
+        self._redo.clear()
+
+    def undo(self) -> Edit | None:
+        # The edit that was taken back, its before is the document now.
+        if not self._undo:
+            return None
+        edit: Edit = self._undo.pop()
+        self._redo.append(edit)
+        return edit
+
+    def redo(self) -> Edit | None:
+        if not self._redo:
+            return None
+        edit: Edit = self._redo.pop()
+        self._undo.append(edit)
+        return edit
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def clear(self) -> None:
+        self._undo.clear()
+        self._redo.clear()
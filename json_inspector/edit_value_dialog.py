@@ -17,14 +17,18 @@ from PyQt6.QtWidgets import (
 )
 
 from json_inspector.helper import Helper
+from json_inspector.preview import Preview
 
 
 class EditValueDialog(QtWidgets.QDialog):
+    # Lists and dicts are shown read-only, past this many characters the rest is left out.
+    PRETTY_LIMIT = 200_000
+
     def __init__(
         self,
         parent: QtWidgets.QWidget,
         current_type: str,
-        current_val: str,
+        current_val: Any,
     ) -> None:
         super().__init__(parent)
         self.setWindowTitle("Edit Value")
@@ -125,18 +129,12 @@ class EditValueDialog(QtWidgets.QDialog):
 
         elif new_type == "list":
             self.editor_stack.setCurrentWidget(self.list_view)
-            if self._initializing:
-                self.list_view.setPlainText(self._raw_initial)
-            else:
-                self.list_view.setPlainText(self._pretty(new_val))
+            self.list_view.setPlainText(self._pretty(new_val))
             self._ok_button.setEnabled(False)
 
         elif new_type == "dict":
             self.editor_stack.setCurrentWidget(self.dict_view)
-            if self._initializing:
-                self.dict_view.setPlainText(self._raw_initial)
-            else:
-                self.dict_view.setPlainText(self._pretty(new_val))
+            self.dict_view.setPlainText(self._pretty(new_val))
             self._ok_button.setEnabled(False)
 
         else:  # NoneType
@@ -158,12 +156,9 @@ class EditValueDialog(QtWidgets.QDialog):
 
         return self._last_val
 
-    @staticmethod
-    def _pretty(val: Any) -> str:
-        try:
-            return json.dumps(val, indent=2, ensure_ascii=False)
-        except Exception:
-            return repr(val)
+    @classmethod
+    def _pretty(cls, val: Any) -> str:
+        return Preview.pretty(val, cls.PRETTY_LIMIT)
 
     @staticmethod
     def attempt_cast(val: Any, target: str) -> Any:
@@ -0,0 +1,166 @@
+import codecs
+import json
+import re
+from enum import Enum, auto
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+
+class JsonEvent(Enum):
+    START_MAP = auto()
+    MAP_KEY = auto()
+    END_MAP = auto()
+    START_ARRAY = auto()
+    END_ARRAY = auto()
+    VALUE = auto()
+
+
+class JsonEventParser:
+    WHITESPACE = re.compile(r"[ \t\n\r]*")
+    NUMBER_CHARS = re.compile(r"[-+0-9.eE]*")
+    CLOSING: Dict[str, str] = {"{": "}", "[": "]"}
+    # A value that does not fit the buffer is decoded again from its start, so grow aggressively to keep
+    # the repeated work small.
+    GROWTH_FACTOR = 8
+
+    def __init__(self, read: Callable[[int], bytes], max_depth: int | None = None, chunk_size: int = 1024 * 1024):
+        # Containers nested deeper than max_depth are not broken up into events, they are decoded in one go
+        # by the C scanner and reported as a single VALUE event.
+        self._read = read
+        self.max_depth: int | None = max_depth
+        self.chunk_size: int = chunk_size
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._raw_decode = json.JSONDecoder().raw_decode
+        self._buf: str = ""
+        self._pos: int = 0
+        self._eof: bool = False
+        self._offset: int = 0
+        self._lines: int = 0
+
+    @property
+    def offset(self) -> int:
+        return self._offset + self._pos
+
+    def _fill(self, grow: bool = False) -> bool:
+        if self._eof:
+            return False
+        remaining: int = len(self._buf) - self._pos
+        data: bytes = self._read(max(self.chunk_size, remaining * self.GROWTH_FACTOR if grow else 0))
+        self._eof = not data
+        text: str = self._decoder.decode(data, final=self._eof)
+        self._offset += self._pos
+        self._lines += self._buf.count("\n", 0, self._pos)
+        self._buf = self._buf[self._pos :] + text
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        while True:
+            self._pos = self.WHITESPACE.match(self._buf, self._pos).end()  # type: ignore
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def _error(self, msg: str, error: json.JSONDecodeError | None = None) -> json.JSONDecodeError:
+        pos: int = error.pos if error is not None else self._pos
+        exc = json.JSONDecodeError(msg, self._buf, pos)
+        exc.pos += self._offset
+        exc.lineno += self._lines
+        return exc
+
+    def _value(self) -> Any:
+        while True:
+            try:
+                value, end = self._raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError as e:
+                if self._fill(grow=True):
+                    continue
+                raise self._error(e.msg, e)
+            if (
+                isinstance(value, (int, float))
+                and self.NUMBER_CHARS.match(self._buf, end).end() == len(self._buf)  # type: ignore
+                and self._fill(grow=True)
+            ):
+                continue  # the number may continue in the next chunk
+            self._pos = end
+            return value
+
+    def __iter__(self) -> Iterator[Tuple[JsonEvent, Any]]:
+        stack: List[str] = []
+        state: str = "value"
+        while True:
+            c: str = self._peek()
+            if state == "value":
+                if c in self.CLOSING and (self.max_depth is None or len(stack) < self.max_depth):
+                    self._pos += 1
+                    stack.append(c)
+                    yield (JsonEvent.START_MAP if c == "{" else JsonEvent.START_ARRAY), None
+                    state = "first"
+                    continue
+                yield JsonEvent.VALUE, self._value()
+                state = "after"
+            elif state == "first":
+                if c == self.CLOSING[stack[-1]]:
+                    state = "after"
+                    self._pos += 1
+                    yield (JsonEvent.END_MAP if stack.pop() == "{" else JsonEvent.END_ARRAY), None
+                else:
+                    state = "key" if stack[-1] == "{" else "value"
+            elif state == "key":
+                if c != '"':
+                    raise self._error("Expecting property name enclosed in double quotes")
+                yield JsonEvent.MAP_KEY, self._value()
+                if self._peek() != ":":
+                    raise self._error("Expecting ':' delimiter")
+                self._pos += 1
+                state = "value"
+            else:
+                if not stack:
+                    if c:
+                        raise self._error("Extra data")
+                    return
+                if c == ",":
+                    self._pos += 1
+                    state = "key" if stack[-1] == "{" else "value"
+                elif c == self.CLOSING[stack[-1]]:
+                    self._pos += 1
+                    yield (JsonEvent.END_MAP if stack.pop() == "{" else JsonEvent.END_ARRAY), None
+                else:
+                    raise self._error("Expecting ',' delimiter")
+
+
+class JsonEventBuilder:
+    def __init__(self) -> None:
+        self.root: Any = None
+        self._stack: List[Any] = []
+        self._keys: List[Any] = []
+
+    @property
+    def depth(self) -> int:
+        return len(self._stack)
+
+    def feed(self, event: JsonEvent, value: Any) -> None:
+        if event is JsonEvent.START_MAP or event is JsonEvent.START_ARRAY:
+            container: Any = {} if event is JsonEvent.START_MAP else []
+            if not self._stack:
+                self.root = container
+            else:
+                self._attach(container)
+            self._stack.append(container)
+            self._keys.append(None)
+        elif event is JsonEvent.MAP_KEY:
+            self._keys[-1] = value
+        elif event is JsonEvent.END_MAP or event is JsonEvent.END_ARRAY:
+            self._stack.pop()
+            self._keys.pop()
+        elif not self._stack:
+            self.root = value
+        else:
+            self._attach(value)
+
+    def _attach(self, value: Any) -> None:
+        parent = self._stack[-1]
+        if isinstance(parent, dict):
+            parent[self._keys[-1]] = value
+        else:
+            parent.append(value)  # type: ignore
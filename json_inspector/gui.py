@@ -1,13 +1,23 @@
 import json
-from typing import TYPE_CHECKING, Any, Dict, List, Tuple, Union
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Tuple, Union
 from edit_value_dialog import EditValueDialog
 from about_dialog import AboutDialog
+from stats_dialog import StatsDialog
 
-from load_children_worker import LoadChildrenWorker
+from load_worker import LoadWorker
+from save_worker import SaveWorker
+from compression import Compression
+from document_diff import DocumentDiff
+from settings import Settings
 from settings_dialog import SettingsDialog
 from helper import Helper, OSHelper
 from search import Search
 from monitor import JsonFileMonitor
+from tree_model import JsonTreeModel, TreeNode
+from property_model import PropertyTableModel
+from ngram_index import NgramIndex
+from json_pointer import JsonPointer
 
 if TYPE_CHECKING:
     from manager import JsonManager
@@ -30,14 +40,24 @@ COLOR_MAP: Dict[str, str] = {
 
 
 class Gui(QtWidgets.QMainWindow):
+    LOAD_PROGRESS_STEPS = 1000
+    RELOAD_MESSAGE_MS = 10000
+
+    _gui_call = QtCore.pyqtSignal(object)
+
     def __init__(self, manager: "JsonManager") -> None:
         super().__init__()
         self.manager: "JsonManager" = manager
         self._current_path = manager.path
         self.application_icon = QtGui.QIcon(str((Helper.assets_path() / "application_icon_512.png").resolve()))
-        self._cache: Dict[Tuple[Union[str, int], ...], List[Any]] = {}
         self._threadpool: QtCore.QThreadPool | None = QtCore.QThreadPool.globalInstance()
-        self._active_workers: list[LoadChildrenWorker] = []
+        self._gui_call.connect(self._run_gui_call, QtCore.Qt.ConnectionType.QueuedConnection)  # type: ignore
+
+    def _on_gui_thread(self) -> bool:
+        return threading.current_thread() is threading.main_thread()
+
+    def _run_gui_call(self, fn: Callable[[], None]) -> None:
+        fn()
 
     def load(self) -> None:
         self.setWindowTitle(f"Json Inspector <{self._current_path}>")
@@ -50,9 +70,12 @@ class Gui(QtWidgets.QMainWindow):
 
         self._build_ui()
 
-        self._search_controller = Search(self.manager, self._threadpool)
+        # Scans get their own thread so a long one doesn't hold up loading tree rows.
+        self._search_pool = QtCore.QThreadPool(self)
+        self._search_pool.setMaxThreadCount(1)
+        self._search_controller = Search(self.manager, self._search_pool)
 
-        self.search_btn.clicked.connect(lambda: self._search_controller.perform_search(self.search_edit.text()))  # type: ignore
+        self.search_btn.clicked.connect(self._perform_search)  # type: ignore
         self.clear_btn.clicked.connect(self._search_controller.clear)  # type: ignore
         self.prev_btn.clicked.connect(lambda: self._search_controller.step(-1))  # type: ignore
         self.next_btn.clicked.connect(lambda: self._search_controller.step(+1))  # type: ignore
@@ -64,10 +87,24 @@ class Gui(QtWidgets.QMainWindow):
         self.setWindowIcon(self.application_icon)
         self.resize(1400, 800)
 
-        self.tree.itemExpanded.connect(self._on_item_expanded)  # type: ignore
-
-        self.tree.itemClicked.connect(self._on_path_item_clicked)  # type: ignore
-        self.prop_table.itemClicked.connect(self._on_path_prop_clicked)  # type: ignore
+        self.tree.clicked.connect(self._on_path_item_clicked)  # type: ignore
+
+        # Prefetching follows what the tree shows, a burst of scroll or expand events asks only once.
+        self._prefetch_timer = QtCore.QTimer(self)
+        self._prefetch_timer.setSingleShot(True)
+        self._prefetch_timer.setInterval(50)
+        self._prefetch_timer.timeout.connect(self._prefetch_visible)  # type: ignore
+        for signal in (
+            self.tree.verticalScrollBar().valueChanged,  # type: ignore
+            self.tree.expanded,
+            self.tree_model.rowsInserted,
+            self.tree_model.modelReset,
+        ):
+            signal.connect(lambda *_: self._prefetch_timer.start())  # type: ignore
+
+        self.manager.add_edit_listener(self.tree_model.value_changed)
+        self.manager.add_stats_listener(self._on_stats_changed)
+        self.prop_table.clicked.connect(self._on_path_prop_clicked)  # type: ignore
 
         self.populate_tree()
 
@@ -77,6 +114,7 @@ class Gui(QtWidgets.QMainWindow):
         assert menu_bar is not None, "Menu bar should not be None"
 
         file_menu: QtWidgets.QMenu | None = menu_bar.addMenu("File")
+        edit_menu: QtWidgets.QMenu | None = menu_bar.addMenu("Edit")
         view_menu: QtWidgets.QMenu | None = menu_bar.addMenu("View")
         settings_menu: QtWidgets.QMenu | None = menu_bar.addMenu("Settings")
         about_menu: QtWidgets.QMenu | None = menu_bar.addMenu("About")
@@ -113,6 +151,22 @@ class Gui(QtWidgets.QMainWindow):
         exit_action.setShortcut("Ctrl+Q")
         exit_action.triggered.connect(self.close)  # type: ignore
 
+        assert edit_menu is not None, "Edit menu should not be None"
+
+        undo_action: QtGui.QAction | None = edit_menu.addAction("Undo")  # type: ignore
+
+        assert undo_action is not None, "Undo action should not be None"
+
+        undo_action.setShortcut("Ctrl+Z")
+        undo_action.triggered.connect(self.undo)  # type: ignore
+
+        redo_action: QtGui.QAction | None = edit_menu.addAction("Redo")  # type: ignore
+
+        assert redo_action is not None, "Redo action should not be None"
+
+        redo_action.setShortcuts(["Ctrl+Shift+Z", "Ctrl+Y"])  # type: ignore
+        redo_action.triggered.connect(self.redo)  # type: ignore
+
         assert view_menu is not None, "View menu should not be None"
 
         reload_action: QtGui.QAction | None = view_menu.addAction("Reload")  # type: ignore
@@ -120,7 +174,7 @@ class Gui(QtWidgets.QMainWindow):
         assert reload_action is not None, "Reload action should not be None"
 
         reload_action.setShortcut("Ctrl+R")
-        reload_action.triggered.connect(self.reload)  # type: ignore
+        reload_action.triggered.connect(lambda: self.reload())  # type: ignore
 
         clear_action: QtGui.QAction | None = view_menu.addAction("Clear")  # type: ignore
 
@@ -134,6 +188,9 @@ class Gui(QtWidgets.QMainWindow):
         view_menu.addSeparator()
 
         expand_all_action: QtGui.QAction | None = view_menu.addAction("Expand All")  # type: ignore
+
+        assert expand_all_action is not None, "Expand All action should not be None"
+
         expand_all_action.triggered.connect(lambda: self.tree.expandRecursively(QModelIndex(), 20))  # type: ignore
 
         collapse_all_action: QtGui.QAction | None = view_menu.addAction("Collapse All")  # type: ignore
@@ -143,6 +200,14 @@ class Gui(QtWidgets.QMainWindow):
         collapse_all_action.setShortcut("Ctrl+Shift+E")
         collapse_all_action.triggered.connect(lambda: self.tree.collapseAll())  # type: ignore
 
+        view_menu.addSeparator()
+
+        stats_action: QtGui.QAction | None = view_menu.addAction("Statistics…")  # type: ignore
+
+        assert stats_action is not None, "Statistics action should not be None"
+
+        stats_action.triggered.connect(self.show_stats_dialog)  # type: ignore
+
         settings_action: QtGui.QAction | None = settings_menu.addAction("Settings…")  # type: ignore
 
         assert settings_action is not None, "Settings action should not be None"
@@ -158,9 +223,19 @@ class Gui(QtWidgets.QMainWindow):
 
         self.search_edit = QtWidgets.QLineEdit()
         self.search_edit.setPlaceholderText("Find key or value…")
-        self.search_edit.returnPressed.connect(lambda: self._search_controller.perform_search(self.search_edit.text()))  # type: ignore
+        self.search_edit.returnPressed.connect(self._perform_search)  # type: ignore
         tool_bar.addWidget(self.search_edit)
 
+        self.search_mode_cb = QtWidgets.QComboBox()
+        for label, mode in (
+            ("Exact", NgramIndex.EXACT),
+            ("Contains", NgramIndex.SUBSTRING),
+            ("Starts with", NgramIndex.PREFIX),
+            ("Regex", NgramIndex.REGEX),
+        ):
+            self.search_mode_cb.addItem(label, mode)
+        tool_bar.addWidget(self.search_mode_cb)
+
         self.search_btn = QtWidgets.QPushButton("Search")
         tool_bar.addWidget(self.search_btn)
 
@@ -176,22 +251,38 @@ class Gui(QtWidgets.QMainWindow):
         self.match_label = QtWidgets.QLabel("0/0")
         tool_bar.addWidget(self.match_label)
 
+        self.addToolBarBreak()
+        path_bar = QtWidgets.QToolBar()
+        self.addToolBar(path_bar)
+
+        path_bar.addWidget(QtWidgets.QLabel("Path: "))
+        self.path_edit = QtWidgets.QLineEdit()
+        self.path_edit.setPlaceholderText("Go to JSON Pointer or dotted path, e.g. /items/0/name or items[0].name")
+        self.path_edit.returnPressed.connect(self._go_to_path)  # type: ignore
+        path_bar.addWidget(self.path_edit)
+
         splitter = QtWidgets.QSplitter(self)
         self.setCentralWidget(splitter)
 
-        self.tree = QtWidgets.QTreeWidget()
-        self.tree.setHeaderLabels(["Key", "Type"])  # type: ignore
+        self.tree = QtWidgets.QTreeView()
+        self.tree_model = JsonTreeModel(
+            self._threadpool, COLOR_MAP, self, Settings.child_cache_mb() * 1024 * 1024  # type: ignore
+        )
+        self.tree.setModel(self.tree_model)
+        self.tree.setUniformRowHeights(True)
         self.tree.header().resizeSection(0, 300)  # type: ignore
-        self.tree.itemSelectionChanged.connect(slot=self._on_select)  # type: ignore
+        self.tree.selectionModel().selectionChanged.connect(self._on_select)  # type: ignore
 
         splitter.addWidget(self.tree)
 
-        self.prop_table = QtWidgets.QTableWidget()
-        self.prop_table.setColumnCount(4)
-        self.prop_table.setHorizontalHeaderLabels(["Key", "Type", "Value", "Raw"])  # type: ignore
-        self.prop_table.setColumnHidden(3, True)
+        self.prop_table = QtWidgets.QTableView()
+        self.prop_model = PropertyTableModel(COLOR_MAP, self)
+        self.prop_table.setModel(self.prop_model)
+        self.prop_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
+        self.prop_table.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
         self.prop_table.horizontalHeader().setStretchLastSection(True)  # type: ignore
-        self.prop_table.itemDoubleClicked.connect(self._on_prop_double_click)  # type: ignore
+        self.prop_table.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.Fixed)  # type: ignore
+        self.prop_table.doubleClicked.connect(self._on_prop_double_click)  # type: ignore
 
         splitter.addWidget(self.prop_table)
         splitter.setSizes([500, 1000])  #    type: ignore
@@ -199,7 +290,7 @@ class Gui(QtWidgets.QMainWindow):
         self.footer = QtWidgets.QStatusBar()
         self.setStatusBar(self.footer)
 
-        self.loaded_label = QtWidgets.QLabel(f"Loaded {self.manager.get_total_count()} items")
+        self.loaded_label = QtWidgets.QLabel(self._loaded_text())
         self.footer.addWidget(self.loaded_label)
 
         self.path_label = QtWidgets.QLabel("")
@@ -208,6 +299,10 @@ class Gui(QtWidgets.QMainWindow):
         self.file_monitor_label = QtWidgets.QLabel("Monitoring: No file Loaded")
         self.footer.addPermanentWidget(self.file_monitor_label)
 
+        self.cache_label = QtWidgets.QLabel(self._cache_text())
+        self.cache_label.setToolTip("Prepared tree rows kept so recently visited nodes open instantly")
+        self.footer.addPermanentWidget(self.cache_label)
+
         self.memory_usage_label = QtWidgets.QLabel(f"Memory Usage: {OSHelper.get_memory_usage_human()}")
         self.footer.addPermanentWidget(self.memory_usage_label)
 
@@ -216,9 +311,31 @@ class Gui(QtWidgets.QMainWindow):
             raise RuntimeError("Manager does not have a monitor.")
         return self.manager.get_monitor()
 
+    def _loaded_text(self) -> str:
+        # Only ever reads counts that are already known, the footer must never walk the document.
+        if self.manager.data is None:
+            return "Loaded 0 items"
+        containers: int | None = self.manager.get_container_count()
+        if containers is not None:
+            # Counting items would read the whole file.
+            return f"Indexed {containers:,} containers"
+        if self.manager.stats is None:
+            return "Counting items…"
+        return f"Loaded {self.manager.stats.node_count:,} items"
+
+    def _cache_text(self) -> str:
+        cache = self.tree_model.cache
+        return (
+            f"Row cache: {Helper.human_size(cache.size)} / {Helper.human_size(cache.budget)}, "
+            f"{cache.hit_rate:.0%} hits ({cache.hits:,}/{cache.hits + cache.misses:,})"
+        )
+
+    def _update_loaded_label(self) -> None:
+        self.loaded_label.setText(self._loaded_text())
+
     def update_footer(self) -> None:
-        total = self.manager.get_total_count(cache=True)
-        self.loaded_label.setText(f"Loaded {total} items")
+        self._update_loaded_label()
+        self.cache_label.setText(self._cache_text())
         self.memory_usage_label.setText(f"Memory Usage: {OSHelper.get_memory_usage_human()}")
 
         if self.manager.path is None:
@@ -263,280 +380,180 @@ class Gui(QtWidgets.QMainWindow):
         dlg = AboutDialog(self)
         dlg.exec()
 
-    def populate_tree(self) -> None:
-        self.tree.clear()
-        root = QtWidgets.QTreeWidgetItem(["root", type(self.manager.data).__name__])
-        self.tree.addTopLevelItem(root)
-        if isinstance(self.manager.data, (dict, list, tuple, set)):
-            placeholder = QtWidgets.QTreeWidgetItem(["Loading...", ""])
-            root.addChild(placeholder)
-            root.setChildIndicatorPolicy(QtWidgets.QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator)
-        self.tree.expandItem(root)
-
-    def _on_path_item_clicked(self, item: QtWidgets.QTreeWidgetItem, col: int) -> None:
-        path: List[Any] = []
-        tmp: QtWidgets.QTreeWidgetItem | None = item
-        while tmp and tmp.parent():
-            path.insert(0, tmp.text(0))
-            tmp = tmp.parent()
-        path.insert(0, "root")
-        self._update_footer_path(path)
-
-    def _update_footer_path(self, path: List[str]) -> None:
-        parts: List[Any] = []
-        obj: Dict[str | int | float, Any] | None = self.manager.data
-        for key in path:
-            if isinstance(obj, dict):
-                obj = obj.get(key, obj)  # type: ignore
-            else:
-                try:
-                    obj = obj[int(key)]  # type: ignore[index]
-                except Exception:
-                    pass
-            t: str = type(obj).__name__ if obj is not None else "NoneType"  # type: ignore
-            color: str = COLOR_MAP.get(t, "#000000")
-            parts.append(f"<span style='color:{color}'>{key}</span>")
-        html = " &gt; ".join(parts)
-        self.path_label.setText(html)
-
-    def _on_path_prop_clicked(self, item: QtWidgets.QTableWidgetItem) -> None:
-        sel: List[QtWidgets.QTreeWidgetItem] = self.tree.selectedItems()
-        if not sel:
+    def show_stats_dialog(self) -> None:
+        if self.manager.data is None:
             return
-        item_tree: QtWidgets.QTreeWidgetItem = sel[0]
-        path: List[Any] = []
-        tmp = item_tree
-        while tmp and tmp.parent():
-            path.insert(0, tmp.text(0))
-            tmp: QtWidgets.QTreeWidgetItem | None = tmp.parent()
-
-        path.insert(0, "root")
-
-        row = item.row()
-        key = self.prop_table.item(row, 0).text()  # type: ignore
-        path.append(key)
-        self._update_footer_path(path)
-
-    def _current_obj_from_item(self, item: QtWidgets.QTreeWidgetItem) -> Any:
-        keys: List[Union[str, int]] = []
-        tmp: QtWidgets.QTreeWidgetItem | None = item
-
-        while tmp is not None and tmp.parent() is not None:
-            keys.insert(0, tmp.text(0))
-            tmp = tmp.parent()
-
-        return self._get_obj_by_path(tuple(keys))
-
-    def _on_item_expanded(self, item: QtWidgets.QTreeWidgetItem) -> None:
-        if item.data(0, QtCore.Qt.ItemDataRole.UserRole) is True:  # type: ignore
+        if self.manager.is_lazy():
+            QtWidgets.QMessageBox.information(
+                self, "Statistics", "Statistics are not available in low memory mode, they would read the whole file."
+            )
             return
+        if self.manager.stats is None:
+            QtWidgets.QMessageBox.information(self, "Statistics", "Statistics are still being computed.")
+            return
+        StatsDialog(self.manager.stats, self.select_path, self).exec()
 
-        if item.childCount() == 1 and (child := item.child(0)) is not None and child.text(0) == "Loading...":
-            item.takeChild(0)
-
-            path: List[str] = []
-            tmp = item
-            assert tmp is not None, "Item should not be None"
-
-            while tmp is not None and tmp.parent() is not None:
-                path.insert(0, tmp.text(0))
-                tmp: QtWidgets.QTreeWidgetItem | None = tmp.parent()
-            path_tuple: Tuple[str, ...] = tuple(path)
+    def _perform_search(self) -> None:
+        self._search_controller.perform_search(self.search_edit.text(), self.search_mode_cb.currentData())
 
-            if path_tuple in self._cache:
-                self._add_children(item, self._cache[path_tuple])
-                item.setData(0, QtCore.Qt.ItemDataRole.UserRole, True)
-                return
+    def populate_tree(self) -> None:
+        self.tree_model.set_root(self.manager.data)
+        self.tree_model.set_stats(self.manager.stats)
+        self.tree.expand(self.tree_model.root_index())
+
+    def _prefetch_visible(self) -> None:
+        # The visible rows and a page below them.
+        viewport: QtWidgets.QWidget = self.tree.viewport()  # type: ignore
+        index: QModelIndex = self.tree.indexAt(QtCore.QPoint(0, 0))
+        row_height: int = max(self.tree.rowHeight(index), 1) if index.isValid() else 1
+        limit: int = 2 * (viewport.height() // row_height + 1)
+        nodes: List[TreeNode] = []
+        while index.isValid() and len(nodes) < limit:
+            nodes.append(self.tree_model.node(index))
+            index = self.tree.indexBelow(index)
+        self.tree_model.prefetch(nodes)
+
+    def _on_stats_changed(self) -> None:
+        self._update_loaded_label()
+        if self.tree_model.root_index().isValid():
+            self.tree_model.set_stats(self.manager.stats)
+            self.tree.viewport().update()  # type: ignore
+
+    def populate_outline(self, root_type: str, entries: List[Tuple[Union[str, int], str, int | None]], more: int) -> None:
+        self.tree_model.set_outline(root_type, entries, more)
+        self.tree.expand(self.tree_model.root_index())
+
+    def _on_path_item_clicked(self, index: QModelIndex) -> None:
+        node: TreeNode = self.tree_model.node(index)
+        if node.is_placeholder:
+            self.tree_model.fetch_previous(node.parent)  # type: ignore[arg-type]
+            return
+        self._update_footer_path(node)
+
+    def _update_footer_path(self, node: TreeNode, extra: Tuple[Union[str, int], str] | None = None) -> None:
+        # Keys and types come from the nodes along the way, the document itself isn't looked at.
+        parts: List[Tuple[Union[str, int], str]] = [extra] if extra is not None else []
+        current: TreeNode = node
+        while current.parent is not None:
+            parts.append((current.key, current.type_name))
+            current = current.parent
+        html = " &gt; ".join(
+            f"<span style='color:{COLOR_MAP.get(t, '#000000')}'>{key}</span>" for key, t in reversed(parts)
+        )
+        self.path_label.setText(html)
 
-            worker = LoadChildrenWorker(item, obj=self._current_obj_from_item(item), path=path_tuple)
-            self._active_workers.append(worker)
-
-            def _cleanup_and_dispatch(
-                _sig_parent: QtWidgets.QTreeWidgetItem,
-                items: List[Tuple[Union[str, int], str, str, bool]],
-                path: Tuple[Union[str, int], ...],
-                wrk: LoadChildrenWorker = worker,
-                parent: QtWidgets.QTreeWidgetItem = item,
-            ) -> None:
-                try:
-                    self._on_children_loaded(parent, items, path)
-                finally:
-                    self._active_workers.remove(wrk)
-
-            worker.signals.loaded.connect(_cleanup_and_dispatch, QtCore.Qt.ConnectionType.QueuedConnection)  # type: ignore
-            self._threadpool.start(worker)  # type: ignore
-
-    @QtCore.pyqtSlot(object, list, tuple)  # type: ignore
-    def _on_children_loaded(
-        self,
-        parent_item: QtWidgets.QTreeWidgetItem,
-        items: List[Tuple[Union[str, int], str, str, bool]],
-        path_tuple: Tuple[Union[str, int], ...],
-    ) -> None:
-        self._add_children(parent_item, items)
-        parent_item.setData(0, QtCore.Qt.ItemDataRole.UserRole, True)
-
-        for key, typ, val, is_cont in items:  # type: ignore
-            if is_cont:
-                child_path = path_tuple + (key,)
-                child_obj = self._get_obj_by_path(child_path)
-                w = LoadChildrenWorker(parent_item.child(key if isinstance(key, int) else 0), child_obj, child_path)  # type: ignore
-                w.signals.loaded.connect(self._on_cache_only, QtCore.Qt.ConnectionType.QueuedConnection)  # type: ignore
-                self._threadpool.start(w)  # type: ignore
-
-    @QtCore.pyqtSlot(object, list, tuple)  # type: ignore[no-untyped-def]
-    def _on_cache_only(
-        self,
-        parent_item: QtWidgets.QTreeWidgetItem,
-        items: List[Tuple[Union[str, int], str, str, bool]],
-        path_tuple: Tuple[Union[str, int], ...],
-    ) -> None:
-        self._cache[path_tuple] = items
+    def _on_path_prop_clicked(self, index: QModelIndex) -> None:
+        node: TreeNode | None = self._selected_node()
+        if node is None:
+            return
+        self._update_footer_path(node, (self.prop_model.key_at(index.row()), self.prop_model.type_at(index.row())))
 
-    def _add_children(
-        self, parent_item: QtWidgets.QTreeWidgetItem, items: List[Tuple[Union[str, int], str, str, bool]]
-    ) -> None:
-        for key, typ, displayed, is_cont in items:
-            child = QtWidgets.QTreeWidgetItem([str(key), typ])
-
-            child.setData(0, QtCore.Qt.ItemDataRole.UserRole, displayed if not is_cont else "")
-            if typ in COLOR_MAP:
-                c = QtGui.QColor(COLOR_MAP[typ])
-                brush = QtGui.QBrush(c)
-                child.setForeground(0, brush)
-                child.setForeground(1, brush)
-
-            if is_cont:
-                placeholder = QtWidgets.QTreeWidgetItem(["Loading...", "", ""])
-                child.addChild(placeholder)
-                child.setChildIndicatorPolicy(QtWidgets.QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator)
-
-            try:
-                parent_item.addChild(child)
-            except RuntimeError as e:
-                print(f"Error adding child {key} to parent: {e}")
-                continue
-
-    def _get_obj_by_path(self, path: Tuple[Union[str, int], ...]) -> Any:
-        obj: Dict[str | int | float, Any] | None = self.manager.data
-        for k in path:
-            if isinstance(obj, dict):
-                obj = obj[k]  # type: ignore[index]
-            else:
-                obj = obj[int(k)]  # type: ignore[index]
-        return obj  # type: ignore[return-value]
+    def _selected_node(self) -> TreeNode | None:
+        rows: List[QModelIndex] = self.tree.selectionModel().selectedRows()  # type: ignore
+        return self.tree_model.node(rows[0]) if rows else None
 
     def _on_select(self) -> None:
-        items: List[QtWidgets.QTreeWidgetItem] = self.tree.selectedItems()
-        if not items:
+        node: TreeNode | None = self._selected_node()
+        if node is None:
             return
-        item: QtWidgets.QTreeWidgetItem = items[0]
-        obj = self._current_obj_from_item(item)
-        self._populate_properties(obj)
-
-    def _populate_properties(self, obj: Any) -> None:
-        self.prop_table.clearContents()
-        self.prop_table.setRowCount(0)
-
-        if isinstance(obj, dict):
-            for i, (k, v) in enumerate(obj.items()):  # type: ignore
-                self.prop_table.insertRow(i)
-                self.prop_table.setItem(i, 0, QtWidgets.QTableWidgetItem(str(k)))  # type: ignore
-
-                type_name = type(v).__name__  # type: ignore
-                color = COLOR_MAP.get(type_name, "#000000")
-                item = QtWidgets.QTableWidgetItem(f"{type_name}")
-                item.setForeground(QtGui.QBrush(QtGui.QColor(color)))
+        self._populate_properties(node.value)
+        self.path_edit.setText(JsonPointer.format(node.path))
 
-                self.prop_table.setItem(i, 1, item)  # type: ignore
+    def undo(self) -> None:
+        if self.manager.undo() is not None:
+            self._on_select()
 
-                if str(v).__len__() > 100:  # type: ignore
-                    self.prop_table.setItem(i, 2, QtWidgets.QTableWidgetItem(str(v)[:100] + "..."))  # type: ignore
-                else:
-                    self.prop_table.setItem(i, 2, QtWidgets.QTableWidgetItem(str(v)))  # type: ignore
-
-                data = QtWidgets.QTableWidgetItem()
-                data.setData(QtCore.Qt.ItemDataRole.UserRole, str(v))  # type: ignore
-                self.prop_table.setItem(i, 3, data)  # type:
-
-        elif isinstance(obj, (list, tuple, set)):
-            for i, v in enumerate(obj):  # type: ignore
-                self.prop_table.insertRow(i)
-                self.prop_table.setItem(i, 0, QtWidgets.QTableWidgetItem(str(i)))
-                self.prop_table.setItem(i, 1, QtWidgets.QTableWidgetItem(type(v).__name__))  # type: ignore
-                self.prop_table.setItem(i, 2, QtWidgets.QTableWidgetItem(str(v)))  # type: ignore
-
-                data = QtWidgets.QTableWidgetItem()
-                data.setData(QtCore.Qt.ItemDataRole.UserRole, str(v))  # type: ignore
-                self.prop_table.setItem(i, 3, data)
-
-        else:
-            self.prop_table.insertRow(0)
-            self.prop_table.setItem(0, 0, QtWidgets.QTableWidgetItem("value"))
-            self.prop_table.setItem(0, 1, QtWidgets.QTableWidgetItem(type(obj).__name__))
-            self.prop_table.setItem(0, 2, QtWidgets.QTableWidgetItem(str(obj)))
+    def redo(self) -> None:
+        if self.manager.redo() is not None:
+            self._on_select()
 
-            data = QtWidgets.QTableWidgetItem()
-            data.setData(QtCore.Qt.ItemDataRole.UserRole, str(obj))  # type: ignore
-            self.prop_table.setItem(0, 3, data)
-
-    def _on_prop_double_click(self, item: QtWidgets.QTableWidgetItem) -> None:
-        row: int = item.row()
-
-        key_item: QtWidgets.QTableWidgetItem | None = self.prop_table.item(row, 0)
-        type_item: QtWidgets.QTableWidgetItem | None = self.prop_table.item(row, 1)
-        val_item: QtWidgets.QTableWidgetItem | None = self.prop_table.item(row, 2)
-        data_item: QtWidgets.QTableWidgetItem | None = self.prop_table.item(row, 3)
-
-        if not key_item or not type_item or not val_item or not data_item:
-            return
+    def _populate_properties(self, obj: Any) -> None:
+        self.prop_model.set_object(obj)
 
-        cur_type: str = type_item.text()
-        cur_val = data_item.data(QtCore.Qt.ItemDataRole.UserRole)
-        dlg = EditValueDialog(self, cur_type, cur_val)
+    def _on_prop_double_click(self, index: QModelIndex) -> None:
+        row: int = index.row()
+        cur_type: str = self.prop_model.type_at(row)
+        dlg = EditValueDialog(self, cur_type, self.prop_model.value_at(row))
 
         if dlg.exec() == QtWidgets.QDialog.DialogCode.Accepted:
-            new_type, new_val = dlg.result_value
-            type_item.setText(new_type)
-            val_item.setText(str(new_val))
-
-            parent_obj = self._current_obj_from_item(self.tree.selectedItems()[0])
-            key_raw: str = key_item.text()
-            key: int | str = int(key_raw) if isinstance(parent_obj, list) else key_raw
-
-            if isinstance(parent_obj, dict):
-                parent_obj[key] = new_val
-
-            elif isinstance(parent_obj, list):
-                parent_obj[key] = new_val  # type: ignore[index]
+            _new_type, new_val = dlg.result_value
+            node: TreeNode | None = self._selected_node()
+            if node is None:
+                return
+            path = node.path if self.prop_model.is_scalar else node.path + (self.prop_model.key_at(row),)
+            self.manager.set_value(path, new_val)
+            self.prop_model.refresh_row(row, new_val, None if self.prop_model.is_scalar else node.value)
 
     def open_file(self) -> None:
         path, _ = QtWidgets.QFileDialog.getOpenFileName(
-            self, "Open File", "", "JSON files (*.json *.gz);;All files (*)"
+            self, "Open File", "", Compression.file_filter()
         )
         if not path:
             return
 
-        self.manager.load(path)
+        self._load_in_background(path, self._after_open, incremental=True)
 
+    def _after_open(self, _worker: LoadWorker) -> None:
+        self._current_path = self.manager.path
         self.setWindowTitle(f"Json Inspector <{self.manager.path}>")
         self.setWindowIcon(self.application_icon)
-        self._cache.clear()
+        self.tree_model.clear_cache()
         self._current_match = -1
         self.search_edit.clear()
-        self.match_label.setText("0/0")
-        self.prop_table.clearContents()
-        self.prop_table.setRowCount(0)
+        self._search_controller.clear()
+        self.path_edit.clear()
+        self.prop_model.clear()
         self.populate_tree()
         self.update_footer()
 
-    def reload_popup(self) -> None:
-        msg_box = QtWidgets.QMessageBox(self)
-        msg_box.setIcon(QtWidgets.QMessageBox.Icon.Information)
-        msg_box.setWindowTitle("File Reloaded")
-        msg_box.setText("The file on disk has been edited. The contents have been reloaded.")
-        msg_box.setStandardButtons(QtWidgets.QMessageBox.StandardButton.Ok)
-        msg_box.exec()
+    def _load_in_background(
+        self,
+        path: str | None,
+        on_loaded: Callable[[LoadWorker], None],
+        incremental: bool = False,
+        attempts: int = 3,
+        compare: bool = False,
+    ) -> None:
+        worker: LoadWorker | None = self.manager.load_async(path, incremental, attempts, compare)
+        if worker is None:
+            return
+
+        dlg = QtWidgets.QProgressDialog("Reading file…", "Cancel", 0, self.LOAD_PROGRESS_STEPS, self)
+        dlg.setWindowTitle("Loading")
+        # While the outline is streaming in the user should be able to look at it.
+        dlg.setWindowModality(
+            QtCore.Qt.WindowModality.NonModal if worker.incremental else QtCore.Qt.WindowModality.WindowModal
+        )
+        dlg.setMinimumDuration(250)
+        dlg.setAutoClose(False)
+        dlg.setAutoReset(False)
+        dlg.setValue(0)
+        dlg.canceled.connect(worker.cancel)  # type: ignore
+
+        def _on_progress(done: int, total: int) -> None:
+            if done >= total:
+                dlg.setLabelText("Parsing…")
+                dlg.setRange(0, 0)
+            elif total:
+                dlg.setValue(int(done * self.LOAD_PROGRESS_STEPS / total))
+
+        def _on_finished(_data: Any) -> None:
+            dlg.close()
+            on_loaded(worker)
+
+        def _on_failed(error: Exception) -> None:
+            dlg.close()
+            if isinstance(error, json.JSONDecodeError):
+                self.decoding_failed_popup(error)
+            else:
+                QtWidgets.QMessageBox.critical(self, "Loading Failed", f"Failed to read JSON file: {error}")
+
+        queued = QtCore.Qt.ConnectionType.QueuedConnection
+        worker.signals.progress.connect(_on_progress, queued)  # type: ignore
+        worker.signals.outline.connect(self.populate_outline, queued)  # type: ignore
+        worker.signals.finished.connect(_on_finished, queued)  # type: ignore
+        worker.signals.failed.connect(_on_failed, queued)  # type: ignore
+        worker.signals.cancelled.connect(dlg.close, queued)  # type: ignore
 
     def decoding_failed_popup(self, error: json.JSONDecodeError) -> None:
         msg_box = QtWidgets.QMessageBox(self)
@@ -547,78 +564,150 @@ class Gui(QtWidgets.QMainWindow):
         msg_box.setStandardButtons(QtWidgets.QMessageBox.StandardButton.Ok)
         msg_box.exec()
 
-    def reload(self) -> None:
-        self.manager.load(auto_clear=False)
+    def reload(self, notify: bool = False) -> None:
+        if not self._on_gui_thread():
+            self._gui_call.emit(lambda: self.reload(notify))
+            return
+        # Reloads from the monitor follow a change that has settled, a file that doesn't decode then won't a
+        # second later either.
+        self._load_in_background(
+            None, lambda worker: self._after_reload(worker, notify), attempts=1 if notify else 3, compare=True
+        )
+
+    def _after_reload(self, worker: LoadWorker, notify: bool = False) -> None:
         self._current_path = self.manager.path
         self.setWindowTitle(f"Json Inspector <{self._current_path}>")
-        self._cache.clear()
-        self.populate_tree()
+        if worker.diff is None:
+            self.tree_model.clear_cache()
+            self.populate_tree()
+        else:
+            # Rows that didn't change stay, and with them what is expanded, selected and scrolled to.
+            self.tree_model.apply_diff(self.manager.data, worker.diff)
+            self.tree_model.set_stats(self.manager.stats)
+            self.tree.viewport().update()  # type: ignore
+            self._on_select()
         self.update_footer()
+        if notify:
+            # Not a dialog, a file that is rewritten every few seconds would keep the window blocked.
+            self.footer.showMessage(self._reloaded_text(worker.diff), self.RELOAD_MESSAGE_MS)
+
+    @staticmethod
+    def _reloaded_text(diff: DocumentDiff | None) -> str:
+        if diff is None:
+            return "The file on disk has been edited, the contents have been reloaded."
+        if diff.is_empty:
+            return "The file on disk has been rewritten, nothing changed."
+        return (
+            f"The file on disk has been edited: {len(diff.changed):,} changed, {len(diff.added):,} added, "
+            f"{len(diff.removed):,} removed."
+        )
+
+    def file_deleted(self) -> None:
+        if not self._on_gui_thread():
+            self._gui_call.emit(self.file_deleted)
+            return
+        self.manager.clear()
+        self.clear()
 
     def clear(self) -> None:
-        self._cache.clear()
+        self.tree_model.clear_cache()
         self._current_path = ""
         self.setWindowTitle("Json Inspector")
-        self.tree.clear()
-        self.prop_table.clearContents()
-        self.prop_table.setRowCount(0)
+        self.tree_model.clear()
+        self.prop_model.clear()
         self.search_edit.clear()
-        self.match_label.setText("0/0")
+        self._search_controller.clear()
+        self.path_edit.clear()
         self.update_footer()
 
     def _save_file(self) -> None:
         if not self._current_path:
             self._save_as_file()
             return
-        self.manager.save(self._current_path)
-        self.setWindowTitle(f"Json Inspector <{self.manager.path}>")
+        self._save_in_background(self._current_path)
 
     def _save_as_file(self) -> None:
         path, _ = QtWidgets.QFileDialog.getSaveFileName(
-            self, "Save JSON", self.manager.path, "JSON files (*.json *.gz);;All files (*)"
+            self, "Save JSON", self.manager.path, Compression.file_filter()
         )
         if not path:
             return
-        self.manager.save_as(path)
-        self.setWindowTitle(f"Json Inspector <{self.manager.path}>")
+        self._save_in_background(path)
 
-    def _load_children_sync(self, item: QtWidgets.QTreeWidgetItem, path: Tuple[str, ...]) -> None:
-        if item.data(0, QtCore.Qt.ItemDataRole.UserRole):
+    def _save_in_background(self, path: str) -> None:
+        if self.manager.data is None:
             return
-
-        raw_items = Helper.prepare_items(self._get_obj_by_path(path))
-        self._cache[path] = raw_items
-        self._add_children(item, raw_items)
-        item.setData(0, QtCore.Qt.ItemDataRole.UserRole, True)
-
-    def item_for_path(self, path: Tuple[str | int, ...]) -> QtWidgets.QTreeWidgetItem | None:
-        item: QtWidgets.QTreeWidgetItem | None = self.tree.topLevelItem(0)
-        assert item is not None, "Root item should not be None"
-        accumulated: List[str] = []
+        worker: SaveWorker = self.manager.save_async(path)
+
+        # Not modal, the document can be browsed and edited while it is written, the save has its own copy.
+        dlg = QtWidgets.QProgressDialog("Writing file…", "Cancel", 0, self.LOAD_PROGRESS_STEPS, self)
+        dlg.setWindowTitle("Saving")
+        dlg.setWindowModality(QtCore.Qt.WindowModality.NonModal)
+        dlg.setMinimumDuration(250)
+        dlg.setAutoClose(False)
+        dlg.setAutoReset(False)
+        dlg.setValue(0)
+        dlg.canceled.connect(worker.cancel)  # type: ignore
+
+        def _on_progress(done: int, total: int) -> None:
+            if total:
+                dlg.setValue(int(done * self.LOAD_PROGRESS_STEPS / total))
+
+        def _on_finished() -> None:
+            dlg.close()
+            self.setWindowTitle(f"Json Inspector <{self.manager.path}>")
+            self.footer.showMessage(f"Saved {path}", self.RELOAD_MESSAGE_MS)
+
+        def _on_failed(error: Exception) -> None:
+            dlg.close()
+            QtWidgets.QMessageBox.critical(
+                self, "Saving Failed", f"Failed to write JSON file: {error}\n\nThe file on disk was left unchanged."
+            )
+
+        queued = QtCore.Qt.ConnectionType.QueuedConnection
+        worker.signals.progress.connect(_on_progress, queued)  # type: ignore
+        worker.signals.finished.connect(_on_finished, queued)  # type: ignore
+        worker.signals.failed.connect(_on_failed, queued)  # type: ignore
+        worker.signals.cancelled.connect(dlg.close, queued)  # type: ignore
+
+    def _go_to_path(self) -> None:
+        if self.manager.data is None:
+            return
+        text: str = self.path_edit.text()
+        try:
+            path: Tuple[str | int, ...] = JsonPointer.resolve(self.manager.data, JsonPointer.parse(text))
+        except ValueError as e:
+            QtWidgets.QMessageBox.warning(self, "Invalid Path", f"“{text}” is not a valid path.\n\nDetails: {e}")
+            return
+        except KeyError as e:
+            QtWidgets.QMessageBox.warning(self, "Path Not Found", f"“{text}” does not exist, {e} was not found.")
+            return
+        self.select_path(path)
+
+    def select_path(self, path: Tuple[str | int, ...]) -> bool:
+        index: QModelIndex | None = self.index_for_path(path=path)
+        if index is None:
+            return False
+
+        parent: QModelIndex = index.parent()
+        while parent.isValid():
+            self.tree.expand(parent)
+            parent = parent.parent()
+
+        self.tree.setCurrentIndex(index)
+        self.tree.scrollTo(index)
+        return True
+
+    def index_for_path(self, path: Tuple[str | int, ...]) -> QModelIndex | None:
+        index: QModelIndex = self.tree_model.root_index()
+        if not index.isValid():
+            return None
         for key in path:
-            self.tree.expandItem(item)
-
-            self._load_children_sync(item, tuple(accumulated))
-
-            found = None
-            for idx in range(item.childCount()):
-                ch: QtWidgets.QTreeWidgetItem | None = item.child(idx)
-                if ch is not None and ch.text(0) == str(key):
-                    found: QtWidgets.QTreeWidgetItem | None = ch
-                    break
-
-            if not found:
-                self._on_item_expanded(item)
-                for idx in range(item.childCount()):
-                    ch = item.child(idx)
-                    if ch is not None and ch.text(0) == str(key):
-                        found = ch
-                        break
-
-            if not found:
+            node: TreeNode = self.tree_model.node(index)
+            self.tree_model.prepare_children(node)
+            row: int = self.tree_model.row_for_key(node, key)
+            if row < 0 or not self.tree_model.ensure_row(node, row):
                 return None
+            index = self.tree_model.index_for_node(node.child(row))
 
-            item = found
-            accumulated.append(key)  # type: ignore[assignment]
-
-        return item
+        return index
@@ -1,9 +1,8 @@
-import gzip
 import os
 import sys
 import json
 import time
-from typing import Any, List, Tuple, Union
+from typing import Any, Callable, Iterator, List, Tuple, Union
 import platform
 import subprocess
 from pathlib import Path
@@ -11,49 +10,124 @@ from typing import ClassVar
 
 import psutil
 
+from compression import Compression
+from document_writer import DocumentWriter, ParallelEncoder
+from json_backend import JsonBackends
+from event_parser import JsonEvent, JsonEventParser
+from preview import Preview
+
+ProgressCallback = Callable[[int, int], None]
+CancelCheck = Callable[[], bool]
+
+
+class LoadCancelled(Exception):
+    pass
+
 
 class Helper:
+    READ_CHUNK_SIZE: ClassVar[int] = 1024 * 1024
+
     @staticmethod
-    def load_json(path: str) -> Any:
-        for attempt in range(3):
+    def load_json(
+        path: str,
+        progress: ProgressCallback | None = None,
+        is_cancelled: CancelCheck | None = None,
+        attempts: int = 3,
+    ) -> Any:
+        for attempt in range(attempts):
             try:
-                if path.endswith(".gz"):
-                    with gzip.open(path, "rt", encoding="utf-8") as f:
-                        return json.load(f)
-                else:
-                    with open(path, "r", encoding="utf-8") as f:
-                        return json.load(f)
+                return JsonBackends.loads(Helper.read_bytes(path, progress, is_cancelled))
             except (OSError, json.JSONDecodeError) as e:
-                time.sleep(1)
-                if attempt < 2:
+                if attempt < attempts - 1:
                     print(f"Attempt {attempt + 1} failed: {e}. Retrying...")
+                    time.sleep(1)
                     continue
                 else:
                     if isinstance(e, json.JSONDecodeError):
                         raise e
                     else:
-                        raise OSError(f"Failed to read JSON file {path} after 3 attempts: {e}")
+                        raise OSError(f"Failed to read JSON file {path} after {attempts} attempts: {e}")
 
     @staticmethod
-    def save_json(data: Any, path: str, indents: int = 4) -> None:
-        if path.endswith(".gz"):
-            with gzip.open(path, "wt", encoding="utf-8") as f:
-                json.dump(data, f, indent=indents)
-        else:
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=indents)
+    def read_bytes(
+        path: str,
+        progress: ProgressCallback | None = None,
+        is_cancelled: CancelCheck | None = None,
+    ) -> bytes | bytearray:
+        # Progress is reported against the on-disk size, so for compressed files it follows the compressed offset.
+        total: int = os.path.getsize(path)
+        buffer = bytearray(total)
+        offset = 0
+        with open(path, "rb", buffering=0) as raw, memoryview(buffer) as view:
+            while offset < total:
+                if is_cancelled is not None and is_cancelled():
+                    raise LoadCancelled(path)
+                read: int | None = raw.readinto(view[offset : offset + Helper.READ_CHUNK_SIZE])
+                if not read:
+                    break
+                offset += read
+                if progress is not None:
+                    progress(offset, total)
+        if offset < total:
+            del buffer[offset:]
+
+        return Compression.decompress(buffer)
+
+    @staticmethod
+    def iter_events(
+        path: str,
+        max_depth: int | None = None,
+        progress: ProgressCallback | None = None,
+        is_cancelled: CancelCheck | None = None,
+    ) -> Iterator[Tuple[JsonEvent, Any]]:
+        total: int = os.path.getsize(path)
+        with open(path, "rb") as raw:
+            stream = Compression.open(raw)
+
+            def _read(size: int) -> bytes:
+                if is_cancelled is not None and is_cancelled():
+                    raise LoadCancelled(path)
+                chunk: bytes = stream.read(size)
+                if progress is not None:
+                    progress(raw.tell(), total)
+                return chunk
+
+            yield from JsonEventParser(_read, max_depth, Helper.READ_CHUNK_SIZE)
+
+    @staticmethod
+    def save_json(data: Any, path: str, indents: int | None = 4, encoder: ParallelEncoder | None = None) -> None:
+        DocumentWriter(data, indents, encoder).write(path)
+
+    @staticmethod
+    def type_name(value: Any) -> str:
+        # Lazy containers subclass dict and list, everywhere in the UI they should look like the plain types.
+        if isinstance(value, dict):
+            return "dict"
+        if isinstance(value, list):
+            return "list"
+        return type(value).__name__
 
     @staticmethod
     def prepare_items(obj: Any) -> List[Tuple[Union[str, int], str, str, bool]]:
-        items: List[Tuple[Union[str, int], str, str, bool]] = []
         if isinstance(obj, dict):
-            for k, v in obj.items():  # type: ignore
-                displayed = repr(v) if not isinstance(v, str) else v  # type: ignore
-                items.append((k, type(v).__name__, displayed, isinstance(v, (dict, list, tuple, set))))  # type: ignore
-        elif isinstance(obj, (list, tuple, set)):
-            for i, v in enumerate(obj):  # type: ignore
-                items.append((i, type(v).__name__, repr(v), isinstance(v, (dict, list, tuple, set))))  # type: ignore
-        return items
+            return [Helper.prepare_item(k, v) for k, v in obj.items()]  # type: ignore
+        if isinstance(obj, (list, tuple, set)):
+            return [Helper.prepare_item(i, v) for i, v in enumerate(obj)]  # type: ignore
+        return []
+
+    @staticmethod
+    def prepare_item(key: Union[str, int], value: Any) -> Tuple[Union[str, int], str, str, bool]:
+        is_cont = isinstance(value, (dict, list, tuple, set))
+        # Containers are never shown as text, rendering them would walk (or lazily load) the whole subtree.
+        return (key, Helper.type_name(value), "" if is_cont else Preview.text(value), is_cont)
+
+    @staticmethod
+    def human_size(size: float) -> str:
+        for unit in ("B", "KB", "MB", "GB"):
+            if size < 1024:
+                return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+            size /= 1024.0
+        return f"{size:.1f} TB"
 
     @staticmethod
     def base_path() -> Path:
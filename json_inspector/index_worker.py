@@ -0,0 +1,30 @@
+import threading
+from typing import Any
+from PyQt6 import QtCore
+
+from signals import IndexSignals
+from helper import LoadCancelled
+from search_index import SearchIndex
+
+
+class IndexWorker(QtCore.QRunnable):
+    def __init__(self, data: Any):
+        super().__init__()
+        self.signals = IndexSignals()
+        self.data: Any = data
+        self._cancel_event = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancel_event.set()
+
+    def run(self) -> None:
+        try:
+            index = SearchIndex.build(self.data, self._cancel_event.is_set)
+        except LoadCancelled:
+            return
+        except RuntimeError:
+            # Clearing the document empties it in place, iteration can trip over that once we've been cancelled.
+            if self._cancel_event.is_set():
+                return
+            raise
+        self.signals.finished.emit(index)
@@ -0,0 +1,79 @@
+import sys
+from collections import OrderedDict
+from typing import Iterator, List, Tuple, Union
+
+PreparedItem = Tuple[Union[str, int], str, str, bool]
+Path = Tuple[Union[str, int], ...]
+
+
+class ItemCache:
+    # Prepared child lists by path, least recently used first, evicted once their size passes the budget.
+    DEFAULT_BUDGET = 64 * 1024 * 1024
+
+    def __init__(self, budget: int = DEFAULT_BUDGET) -> None:
+        self.budget: int = budget
+        self.size: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: "OrderedDict[Path, Tuple[List[PreparedItem], int]]" = OrderedDict()
+
+    @staticmethod
+    def size_of(items: List[PreparedItem]) -> int:
+        # The list, its tuples and their key and preview strings. Type names are shared constants and booleans
+        # singletons, they cost nothing extra. Keys and short strings can be shared with the document, so this
+        # errs on the high side.
+        getsizeof = sys.getsizeof
+        size: int = getsizeof(items)
+        for item in items:
+            size += getsizeof(item) + getsizeof(item[0]) + getsizeof(item[2])
+        return size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, path: object) -> bool:
+        return path in self._entries
+
+    def __iter__(self) -> Iterator[Path]:
+        return iter(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups: int = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, path: Path) -> List[PreparedItem] | None:
+        entry = self._entries.get(path)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(path)
+        return entry[0]
+
+    def put(self, path: Path, items: List[PreparedItem]) -> None:
+        self.discard(path)
+        size: int = self.size_of(items)
+        if size > self.budget:
+            return  # would only push out everything else
+        self._entries[path] = (items, size)
+        self.size += size
+        self._evict()
+
+    def discard(self, path: Path) -> None:
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            self.size -= entry[1]
+
+    def set_budget(self, budget: int) -> None:
+        self.budget = budget
+        self._evict()
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size = self.hits = self.misses = 0
+
+    def _evict(self) -> None:
+        while self.size > self.budget and self._entries:
+            _, (_, size) = self._entries.popitem(last=False)
+            self.size -= size
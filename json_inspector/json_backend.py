@@ -0,0 +1,167 @@
+import json
+from abc import ABC, abstractmethod
+from typing import Any, ClassVar, List, Type
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import ujson  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    ujson = None
+
+
+class JsonBackend(ABC):
+    # Used as classes, never instantiated.
+    name: ClassVar[str] = ""
+
+    @classmethod
+    def available(cls) -> bool:
+        return False
+
+    @classmethod
+    def supports_indent(cls, indent: int | None) -> bool:
+        return True
+
+    @classmethod
+    def encodes_natively(cls, indent: int | None) -> bool:
+        # Whether dumps() with this indent runs in C, pure Python encoding is worth spreading over processes.
+        return True
+
+    @classmethod
+    @abstractmethod
+    def loads(cls, data: bytes | bytearray | memoryview) -> Any: ...
+
+    @classmethod
+    @abstractmethod
+    def dumps(cls, data: Any, indent: int | None = None) -> bytes: ...
+
+
+class StdlibBackend(JsonBackend):
+    name = "json"
+
+    @classmethod
+    def available(cls) -> bool:
+        return True
+
+    @classmethod
+    def encodes_natively(cls, indent: int | None) -> bool:
+        # The C accelerator only handles compact output, indented output goes through json.encoder in Python.
+        return indent is None
+
+    @classmethod
+    def loads(cls, data: bytes | bytearray | memoryview) -> Any:
+        return json.loads(bytes(data) if isinstance(data, memoryview) else data)
+
+    @classmethod
+    def dumps(cls, data: Any, indent: int | None = None) -> bytes:
+        if indent is None:
+            return json.dumps(data, separators=(",", ":")).encode("utf-8")
+        return json.dumps(data, indent=indent).encode("utf-8")
+
+
+class UjsonBackend(JsonBackend):
+    name = "ujson"
+
+    @classmethod
+    def available(cls) -> bool:
+        return ujson is not None
+
+    @classmethod
+    def loads(cls, data: bytes | bytearray | memoryview) -> Any:
+        return ujson.loads(bytes(data))  # type: ignore
+
+    @classmethod
+    def dumps(cls, data: Any, indent: int | None = None) -> bytes:
+        return ujson.dumps(data, indent=indent or 0, escape_forward_slashes=False).encode("utf-8")  # type: ignore
+
+
+class OrjsonBackend(JsonBackend):
+    name = "orjson"
+
+    @classmethod
+    def available(cls) -> bool:
+        return orjson is not None
+
+    @classmethod
+    def supports_indent(cls, indent: int | None) -> bool:
+        # orjson only writes compact or 2-space output. Other indents, the default of 4 included, go to the next
+        # backend: ujson indents natively, widening orjson's output afterwards is slower than that.
+        return indent in (None, 2)
+
+    @classmethod
+    def loads(cls, data: bytes | bytearray | memoryview) -> Any:
+        return orjson.loads(data)  # type: ignore
+
+    @classmethod
+    def dumps(cls, data: Any, indent: int | None = None) -> bytes:
+        option: int = orjson.OPT_NON_STR_KEYS  # type: ignore
+        if indent == 2:
+            option |= orjson.OPT_INDENT_2  # type: ignore
+        return orjson.dumps(data, option=option)  # type: ignore
+
+
+class JsonBackends:
+    AUTO: ClassVar[str] = "auto"
+
+    # Ordered fastest first, "auto" picks the first one that is installed.
+    _registry: ClassVar[List[Type[JsonBackend]]] = [OrjsonBackend, UjsonBackend, StdlibBackend]
+    _preferred: ClassVar[str] = AUTO
+
+    @classmethod
+    def register(cls, backend: Type[JsonBackend], first: bool = False) -> None:
+        if backend in cls._registry:
+            cls._registry.remove(backend)
+        if first:
+            cls._registry.insert(0, backend)
+        else:
+            cls._registry.insert(len(cls._registry) - 1, backend)
+
+    @classmethod
+    def names(cls) -> List[str]:
+        return [backend.name for backend in cls._registry if backend.available()]
+
+    @classmethod
+    def prefer(cls, name: str) -> None:
+        cls._preferred = name or cls.AUTO
+
+    @classmethod
+    def preferred(cls) -> str:
+        return cls._preferred
+
+    @classmethod
+    def get(cls, name: str | None = None, indent: int | None = None) -> Type[JsonBackend]:
+        name = name or cls._preferred
+        for backend in cls._registry:
+            if backend.name == name and backend.available() and backend.supports_indent(indent):
+                return backend
+
+        for backend in cls._registry:
+            if backend.available() and backend.supports_indent(indent):
+                return backend
+
+        return StdlibBackend
+
+    @classmethod
+    def loads(cls, data: bytes | bytearray | memoryview, name: str | None = None) -> Any:
+        backend = cls.get(name)
+        try:
+            return backend.loads(data)
+        except (ValueError, OverflowError):
+            if backend is StdlibBackend:
+                raise
+            # Fast codecs reject a few things stdlib accepts (huge ints, NaN), stdlib also gives us a
+            # proper JSONDecodeError with line/column for documents that are actually broken.
+            return StdlibBackend.loads(data)
+
+    @classmethod
+    def dumps(cls, data: Any, indent: int | None = None, name: str | None = None) -> bytes:
+        backend = cls.get(name, indent)
+        try:
+            return backend.dumps(data, indent)
+        except (TypeError, ValueError, OverflowError):
+            if backend is StdlibBackend:
+                raise
+            return StdlibBackend.dumps(data, indent)
@@ -0,0 +1,66 @@
+import re
+from typing import Any, List, Tuple, Union
+
+Path = Tuple[Union[str, int], ...]
+
+
+class JsonPointer:
+    # Dotted paths: a.b[3].c, a.b.3.c and ["key with.dots"], optionally starting with $ or root.
+    _DOTTED = re.compile(r"""\[(\d+)\]|\[("(?:[^"\\]|\\.)*"|'[^']*')\]|([^.\[\]]+)|(\.)""")
+    _ROOTS = ("$", "root")
+
+    @classmethod
+    def parse(cls, text: str) -> List[str]:
+        # RFC 6901 when the text starts with a slash, a dotted path otherwise. Raises ValueError for bad syntax.
+        text = text.strip()
+        if not text:
+            return []
+        if text.startswith("/"):
+            return [segment.replace("~1", "/").replace("~0", "~") for segment in text[1:].split("/")]
+
+        segments: List[str] = []
+        pos: int = 0
+        for match in cls._DOTTED.finditer(text):
+            if match.start() != pos:
+                raise ValueError(f"Unexpected “{text[pos:match.start()]}” at position {pos}")
+            pos = match.end()
+            index, quoted, name, _ = match.groups()
+            if index is not None:
+                segments.append(index)
+            elif quoted is not None:
+                segments.append(quoted[1:-1].replace('\\"', '"').replace("\\\\", "\\"))
+            elif name is not None:
+                segments.append(name)
+        if pos != len(text):
+            raise ValueError(f"Unexpected “{text[pos:]}” at position {pos}")
+        if segments and segments[0] in cls._ROOTS:
+            segments.pop(0)
+        return segments
+
+    @staticmethod
+    def resolve(data: Any, segments: List[str]) -> Path:
+        # Walks only the containers along the path and returns it with list indices as ints.
+        # Raises KeyError naming the first segment that doesn't exist.
+        path: List[Union[str, int]] = []
+        obj: Any = data
+        for segment in segments:
+            if isinstance(obj, dict):
+                if segment in obj:
+                    key: Union[str, int] = segment
+                elif segment.lstrip("-").isdigit() and int(segment) in obj:
+                    key = int(segment)
+                else:
+                    raise KeyError(segment)
+            elif isinstance(obj, (list, tuple)):
+                if not segment.isdigit() or int(segment) >= len(obj):  # type: ignore[arg-type]
+                    raise KeyError(segment)
+                key = int(segment)
+            else:
+                raise KeyError(segment)
+            obj = obj[key]  # type: ignore[index]
+            path.append(key)
+        return tuple(path)
+
+    @staticmethod
+    def format(path: Path) -> str:
+        return "".join("/" + str(key).replace("~", "~0").replace("/", "~1") for key in path)
@@ -0,0 +1,425 @@
+import json
+import mmap
+import os
+import re
+import tempfile
+import threading
+from array import array
+from bisect import bisect_left
+from typing import IO, Any, Callable, Dict, Iterator, List, Tuple, Union
+
+from compression import Compression
+from json_backend import JsonBackends
+from helper import LoadCancelled
+
+
+class LazyDocument:
+    # Everything up to the next bracket, strings included, so the Python loop only runs once per bracket.
+    RUN = re.compile(rb'(?:[^"\[\]{}]++|"[^"\\]*+(?:\\.[^"\\]*+)*+")*+')
+    SEPARATORS = re.compile(rb"[ \t\n\r,:]*+")
+    STRING = re.compile(rb'"[^"\\]*+(?:\\.[^"\\]*+)*+"')
+    SCALAR = re.compile(rb'"[^"\\]*+(?:\\.[^"\\]*+)*+"|[^ \t\n\r,:\]}]++')
+    PROGRESS_STEP = 4 * 1024 * 1024
+
+    def __init__(self, path: str, progress: Any = None, is_cancelled: Any = None) -> None:
+        self.path: str = path
+        self._file: IO[bytes] = self._open_source(path, progress, is_cancelled)
+        size: int = os.fstat(self._file.fileno()).st_size
+        # mmap refuses empty files, an empty buffer makes the decoder report the usual "Expecting value".
+        self._buf: Union[mmap.mmap, bytes] = (
+            mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        )
+        self.lock = threading.Lock()
+        self._starts: array[int] = array("q")
+        self._ends: array[int] = array("q")
+        self._build_index(progress, is_cancelled)
+
+        start: int = self.SEPARATORS.match(self._buf, 0).end()  # type: ignore
+        self.root: Any = self.value_at(start)
+
+    @staticmethod
+    def _open_source(path: str, progress: Any, is_cancelled: Any) -> IO[bytes]:
+        raw: IO[bytes] = open(path, "rb")
+        if Compression.detect(raw.read(Compression.MAGIC_SIZE)) is None:
+            raw.seek(0)
+            return raw
+
+        # Decompress once into an anonymous temp file, it is removed by the OS when the document is released.
+        raw.seek(0)
+        total: int = os.path.getsize(path)
+        target: IO[bytes] = tempfile.TemporaryFile()
+        with raw, Compression.open(raw) as stream:
+            while True:
+                if is_cancelled is not None and is_cancelled():
+                    target.close()
+                    raise LoadCancelled(path)
+                chunk: bytes = stream.read(1024 * 1024)
+                if not chunk:
+                    break
+                target.write(chunk)
+                if progress is not None:
+                    progress(raw.tell(), total)
+        target.flush()
+        return target
+
+    def _build_index(self, progress: Any, is_cancelled: Any) -> None:
+        buf = self._buf
+        match = self.RUN.match
+        starts, ends = self._starts, self._ends
+        stack: List[int] = []
+        size: int = len(buf)
+        pos: int = 0
+        next_report: int = self.PROGRESS_STEP
+        while True:
+            pos = match(buf, pos).end()  # type: ignore
+            if pos >= size:
+                break
+            if buf[pos] in b"[{":
+                stack.append(len(starts))
+                starts.append(pos)
+                ends.append(-1)
+            else:
+                # "]" and "}" are two past "[" and "{".
+                if not stack or buf[starts[stack[-1]]] + 2 != buf[pos]:
+                    raise json.JSONDecodeError("Unexpected closing bracket", "", pos)
+                ends[stack.pop()] = pos
+            pos += 1
+            if pos >= next_report:
+                next_report = pos + self.PROGRESS_STEP
+                if is_cancelled is not None and is_cancelled():
+                    raise LoadCancelled(self.path)
+                if progress is not None:
+                    progress(pos, size)
+        if stack:
+            raise json.JSONDecodeError("Unterminated container", "", starts[stack[-1]])
+
+    @property
+    def container_count(self) -> int:
+        return len(self._starts)
+
+    def end_of(self, start: int) -> int:
+        i: int = bisect_left(self._starts, start)
+        if i == len(self._starts) or self._starts[i] != start or self._ends[i] < 0:
+            raise json.JSONDecodeError("Unterminated container", "", start)
+        return self._ends[i] + 1
+
+    def value_at(self, start: int) -> Any:
+        if start >= len(self._buf):
+            raise json.JSONDecodeError("Expecting value", "", start)
+        c: int = self._buf[start]
+        if c == 0x7B:
+            return LazyDict(self, start)
+        if c == 0x5B:
+            return LazyList(self, start)
+        m = self.SCALAR.match(self._buf, start)
+        if m is None:
+            raise json.JSONDecodeError("Expecting value", "", start)
+        return json.loads(m.group())
+
+    def children(self, start: int) -> Iterator[Tuple[Union[str, int, None], int]]:
+        return self.children_of(self._buf, start, self.end_of)
+
+    @classmethod
+    def children_of(
+        cls, buf: Any, start: int, end_of: Callable[[int], int]
+    ) -> Iterator[Tuple[Union[str, int, None], int]]:
+        # Keys and value offsets of the container at start, end_of gives the end of a nested container.
+        is_map: bool = buf[start] == 0x7B
+        end: int = end_of(start) - 1
+        pos: int = start + 1
+        index: int = 0
+        while True:
+            pos = cls.SEPARATORS.match(buf, pos).end()  # type: ignore
+            if pos >= end:
+                return
+            key: Union[str, int, None] = index
+            if is_map:
+                m = cls.STRING.match(buf, pos)
+                if m is None:
+                    raise json.JSONDecodeError("Expecting property name enclosed in double quotes", "", pos)
+                key = json.loads(m.group())
+                pos = cls.SEPARATORS.match(buf, m.end()).end()  # type: ignore
+            yield key, pos
+            pos = cls.value_end(buf, pos, end_of)
+            index += 1
+
+    @classmethod
+    def value_end(cls, buf: Any, start: int, end_of: Callable[[int], int]) -> int:
+        if buf[start] in b"[{":
+            return end_of(start)
+        m = cls.SCALAR.match(buf, start)
+        if m is None:
+            raise json.JSONDecodeError("Expecting value", "", start)
+        return m.end()
+
+    @classmethod
+    def scan_end(cls, buf: Any, start: int) -> int:
+        # end_of without an index, by counting brackets from start.
+        match = cls.RUN.match
+        size: int = len(buf)
+        depth: int = 0
+        pos: int = start
+        while True:
+            pos = match(buf, pos).end()  # type: ignore
+            if pos >= size:
+                raise json.JSONDecodeError("Unterminated container", "", start)
+            depth += 1 if buf[pos] in b"[{" else -1
+            pos += 1
+            if not depth:
+                return pos
+
+    def decode(self, start: int) -> Any:
+        return JsonBackends.loads(self._buf[start : self.end_of(start)])
+
+    @staticmethod
+    def materialize(value: Any) -> Any:
+        # Plain objects for code that reads list/dict storage directly (encoders, deep comparisons).
+        if isinstance(value, (LazyDict, LazyList)) and not value.is_loaded:
+            return value.document.decode(value.offset)
+        if isinstance(value, dict):
+            return {k: LazyDocument.materialize(v) for k, v in value.items()}  # type: ignore
+        if isinstance(value, list):
+            return [LazyDocument.materialize(v) for v in value]  # type: ignore
+        return value
+
+
+class LazyDict(Dict[Any, Any]):
+    __slots__ = ("_doc", "_start", "_loaded")
+
+    def __init__(self, doc: LazyDocument, start: int) -> None:
+        super().__init__()
+        self._doc: LazyDocument = doc
+        self._start: int = start
+        self._loaded: bool = False
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded
+
+    @property
+    def document(self) -> LazyDocument:
+        return self._doc
+
+    @property
+    def offset(self) -> int:
+        return self._start
+
+    def load(self) -> None:
+        if self._loaded:
+            return
+        doc = self._doc
+        with doc.lock:
+            if self._loaded:
+                return
+            for key, start in doc.children(self._start):
+                super().__setitem__(key, doc.value_at(start))
+            self._loaded = True
+
+    def __getitem__(self, key: Any) -> Any:
+        self.load()
+        return super().__getitem__(key)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self.load()
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key: Any) -> None:
+        self.load()
+        super().__delitem__(key)
+
+    def __contains__(self, key: object) -> bool:
+        self.load()
+        return super().__contains__(key)
+
+    def __iter__(self) -> Iterator[Any]:
+        self.load()
+        return super().__iter__()
+
+    def __len__(self) -> int:
+        self.load()
+        return super().__len__()
+
+    def __eq__(self, other: object) -> bool:
+        self.load()
+        if isinstance(other, (LazyDict, LazyList)):
+            other.load()
+        return super().__eq__(other)
+
+    def __ne__(self, other: object) -> bool:
+        return not self.__eq__(other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        self.load()
+        return super().__repr__()
+
+    def __reversed__(self) -> Iterator[Any]:
+        self.load()
+        return super().__reversed__()
+
+    def keys(self):  # type: ignore[override]
+        self.load()
+        return super().keys()
+
+    def values(self):  # type: ignore[override]
+        self.load()
+        return super().values()
+
+    def items(self):  # type: ignore[override]
+        self.load()
+        return super().items()
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        self.load()
+        return super().get(key, default)
+
+    def pop(self, *args: Any) -> Any:
+        self.load()
+        return super().pop(*args)
+
+    def popitem(self) -> Any:
+        self.load()
+        return super().popitem()
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        self.load()
+        return super().setdefault(key, default)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        self.load()
+        super().update(*args, **kwargs)
+
+    def clear(self) -> None:
+        self._loaded = True
+        super().clear()
+
+    def copy(self) -> Dict[Any, Any]:
+        self.load()
+        return dict(super().items())
+
+    def clone(self) -> "LazyDict":
+        # A loaded copy sharing the children, still tied to the document so the data counts as lazy.
+        self.load()
+        clone = LazyDict(self._doc, self._start)
+        clone._loaded = True
+        clone.update(super().items())
+        return clone
+
+
+class LazyList(List[Any]):
+    __slots__ = ("_doc", "_start", "_loaded")
+
+    def __init__(self, doc: LazyDocument, start: int) -> None:
+        super().__init__()
+        self._doc: LazyDocument = doc
+        self._start: int = start
+        self._loaded: bool = False
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded
+
+    @property
+    def document(self) -> LazyDocument:
+        return self._doc
+
+    @property
+    def offset(self) -> int:
+        return self._start
+
+    def load(self) -> None:
+        if self._loaded:
+            return
+        doc = self._doc
+        with doc.lock:
+            if self._loaded:
+                return
+            super().extend([doc.value_at(start) for _, start in doc.children(self._start)])
+            self._loaded = True
+
+    def __getitem__(self, index: Any) -> Any:
+        self.load()
+        return super().__getitem__(index)
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        self.load()
+        super().__setitem__(index, value)
+
+    def __delitem__(self, index: Any) -> None:
+        self.load()
+        super().__delitem__(index)
+
+    def __contains__(self, value: object) -> bool:
+        self.load()
+        return super().__contains__(value)
+
+    def __iter__(self) -> Iterator[Any]:
+        self.load()
+        return super().__iter__()
+
+    def __reversed__(self) -> Iterator[Any]:
+        self.load()
+        return super().__reversed__()
+
+    def __len__(self) -> int:
+        self.load()
+        return super().__len__()
+
+    def __eq__(self, other: object) -> bool:
+        self.load()
+        if isinstance(other, (LazyDict, LazyList)):
+            other.load()
+        return super().__eq__(other)
+
+    def __ne__(self, other: object) -> bool:
+        return not self.__eq__(other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        self.load()
+        return super().__repr__()
+
+    def index(self, *args: Any) -> int:
+        self.load()
+        return super().index(*args)
+
+    def count(self, value: Any) -> int:
+        self.load()
+        return super().count(value)
+
+    def append(self, value: Any) -> None:
+        self.load()
+        super().append(value)
+
+    def extend(self, values: Any) -> None:
+        self.load()
+        super().extend(values)
+
+    def insert(self, index: Any, value: Any) -> None:
+        self.load()
+        super().insert(index, value)
+
+    def pop(self, *args: Any) -> Any:
+        self.load()
+        return super().pop(*args)
+
+    def remove(self, value: Any) -> None:
+        self.load()
+        super().remove(value)
+
+    def clear(self) -> None:
+        self._loaded = True
+        super().clear()
+
+    def copy(self) -> List[Any]:
+        self.load()
+        return list(super().__iter__())
+
+    def clone(self) -> "LazyList":
+        self.load()
+        clone = LazyList(self._doc, self._start)
+        clone._loaded = True
+        clone.extend(super().__iter__())
+        return clone
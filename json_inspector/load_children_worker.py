@@ -1,4 +1,4 @@
-from PyQt6 import QtCore, QtWidgets
+from PyQt6 import QtCore
 
 from signals import WorkerSignals
 from helper import Helper
@@ -6,14 +6,14 @@ from typing import Any, Tuple, Union
 
 
 class LoadChildrenWorker(QtCore.QRunnable):
-    def __init__(self, parent_item: QtWidgets.QTreeWidgetItem, obj: Any, path: Tuple[Union[str, int], ...]):
+    def __init__(self, node: Any, obj: Any, path: Tuple[Union[str, int], ...]):
         super().__init__()
         self.signals = WorkerSignals()
-        self.parent_item: QtWidgets.QTreeWidgetItem = parent_item
+        self.node: Any = node
         self.obj = obj
         self.path = path
 
     def run(self) -> None:
         items = Helper.prepare_items(self.obj)
 
-        self.signals.loaded.emit(self.parent_item, items, self.path)
+        self.signals.loaded.emit(self.node, items, self.path)
@@ -0,0 +1,132 @@
+import threading
+import time
+from typing import Any, List, Tuple, Union
+from PyQt6 import QtCore
+
+from document_diff import DocumentDiff
+from signals import LoadSignals
+from helper import Helper, LoadCancelled
+from json_backend import JsonBackends, StdlibBackend
+from event_parser import JsonEvent, JsonEventBuilder
+from lazy_document import LazyDocument
+from snapshot_cache import SnapshotCache, SnapshotUnavailable
+from splice_writer import FileStamp, SpliceWriter
+
+
+class LoadWorker(QtCore.QRunnable):
+    # Incremental loads parse the root event by event so the outline can be shown early, every child of the
+    # root is handed to the C scanner in one piece. Going deeper costs more in per-event overhead than it gains.
+    INCREMENTAL_MIN_SIZE = 32 * 1024 * 1024
+    OUTLINE_DEPTH = 1
+    OUTLINE_INTERVAL = 0.05
+    OUTLINE_MAX_ENTRIES = 1000
+    OUTLINE_EAGER_KEYS = 100
+    OUTLINE_YIELD = 0.005
+
+    def __init__(
+        self,
+        path: str,
+        incremental: bool = False,
+        lazy: bool = False,
+        attempts: int = 3,
+        previous: Any = None,
+        snapshots: SnapshotCache | None = None,
+    ):
+        super().__init__()
+        self.signals = LoadSignals()
+        self.path: str = path
+        self.attempts: int = attempts
+        # The document this load replaces, compared against the new one on this thread when given.
+        self._previous: Any = previous
+        self.diff: DocumentDiff | None = None
+        # Size and mtime of the file as it was before reading it, a later save can only splice into that file.
+        self.stamp: FileStamp | None = None
+        self.incremental: bool = incremental and not lazy
+        self.lazy: bool = lazy
+        # Parsed documents are read back from here when the file hasn't changed, and written to it otherwise.
+        self.snapshots: SnapshotCache | None = None if lazy else snapshots
+        self._snapshot_missed: bool = False
+        self._cancel_event = threading.Event()
+
+    @staticmethod
+    def incremental_pays_off() -> bool:
+        # Only the stdlib scanner can tell where a child of the root ends, the other backends can't decode a prefix.
+        # Finding the ends separately costs more than they save, so with one of them the file is decoded as a whole.
+        return JsonBackends.get() is StdlibBackend
+
+    def cancel(self) -> None:
+        self._cancel_event.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def run(self) -> None:
+        try:
+            self.stamp = SpliceWriter.stamp(self.path)
+            if self.lazy:
+                data = LazyDocument(self.path, self.signals.progress.emit, self.is_cancelled).root
+            elif self.snapshots is not None:
+                try:
+                    data = self.snapshots.load(self.path, self.stamp, self.signals.progress.emit, self.is_cancelled)
+                except SnapshotUnavailable:
+                    self._snapshot_missed = True
+                    data = self._parse()
+            else:
+                data = self._parse()
+            if self._previous is not None:
+                self.diff = DocumentDiff.compare(self._previous, data, self.is_cancelled)
+                self._previous = None
+        except LoadCancelled:
+            self.signals.cancelled.emit()
+            return
+        except Exception as e:
+            # Whatever stops the load has to be reported, the gui waits for one of the signals to close its dialog.
+            self.signals.failed.emit(e)
+            return
+
+        if self.is_cancelled():
+            self.signals.cancelled.emit()
+            return
+
+        self.signals.finished.emit(data)
+        # Edits never change the emitted version in place, so it can still be written out after handing it over.
+        if self._snapshot_missed and self.snapshots is not None:
+            self.snapshots.store(self.path, self.stamp, data, self.is_cancelled)
+
+    def _parse(self) -> Any:
+        if self.incremental:
+            return self._load_incremental()
+        return Helper.load_json(self.path, self.signals.progress.emit, self.is_cancelled, self.attempts)
+
+    def _load_incremental(self) -> Any:
+        builder = JsonEventBuilder()
+        next_outline: float = time.monotonic()
+        events = Helper.iter_events(self.path, self.OUTLINE_DEPTH, self.signals.progress.emit, self.is_cancelled)
+        for event, value in events:
+            builder.feed(event, value)
+            if builder.depth != 1:
+                continue
+            # The key is known before its value is decoded, so it can be shown while that value is still parsing.
+            # Roots with few keys usually have big values, there every key is shown right away and the GIL is
+            # released for a moment so the GUI gets to draw it before the decoder holds on to the GIL again.
+            pending: str | None = value if event is JsonEvent.MAP_KEY else None
+            eager: bool = pending is not None and len(builder.root) < self.OUTLINE_EAGER_KEYS
+            if eager or time.monotonic() >= next_outline:
+                self._emit_outline(builder.root, pending)
+                next_outline = time.monotonic() + self.OUTLINE_INTERVAL
+                if eager:
+                    time.sleep(self.OUTLINE_YIELD)
+        return builder.root
+
+    def _emit_outline(self, root: Any, pending: str | None) -> None:
+        entries: List[Tuple[Union[str, int], str, int | None]] = []
+        items = root.items() if isinstance(root, dict) else enumerate(root)  # type: ignore
+        for key, value in items:  # type: ignore
+            if len(entries) >= self.OUTLINE_MAX_ENTRIES:
+                break
+            size: int | None = len(value) if isinstance(value, (dict, list)) else None  # type: ignore
+            entries.append((key, type(value).__name__, size))  # type: ignore
+        more: int = len(root) - len(entries)  # type: ignore
+        if pending is not None and len(entries) < self.OUTLINE_MAX_ENTRIES:
+            entries.append((pending, "…", None))
+        self.signals.outline.emit(Helper.type_name(root), entries, more)
@@ -1,8 +1,27 @@
 import json
-from typing import Any, Dict, List, Optional, Tuple, Type, Union
+import os
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type, Union
 from gui import Helper
 import gc
+from PyQt6 import QtCore
 from gui import Gui
+from load_worker import LoadWorker
+from save_worker import SaveWorker
+from json_backend import JsonBackends
+from lazy_document import LazyDocument, LazyDict, LazyList
+from preview import Preview
+from index_worker import IndexWorker
+from document_stats import DocumentStats
+from stats_worker import StatsWorker
+from ngram_index import NgramIndex
+from parallel_search import ParallelSearch, SharedDocument
+from document_writer import ParallelEncoder
+from splice_writer import FileStamp, SpliceUnavailable, SpliceWriter
+from edit_journal import Edit, EditJournal
+from snapshot_cache import SnapshotCache, SnapshotUnavailable
+from compression import Compression
+from search_index import SearchIndex
 
 from monitor import FileEvent
 from settings import Settings
@@ -10,13 +29,47 @@ from monitor import JsonFileMonitor
 
 
 class JsonManager:
+    # Every edited path is looked up in the file on its own, past this many a full save is quicker.
+    SPLICE_MAX_EDITS = 256
+
     def __init__(self, path: str | None = None) -> None:
         self._path: str | None = path
         self.data: Dict[str | int | float, Any] | None = None
         self.object_loaded_cache: int = 0
+        self._load_worker: LoadWorker | None = None
+        self._save_worker: SaveWorker | None = None
+        self.search_index: SearchIndex | None = None
+        self._index_worker: IndexWorker | None = None
+        # Indexing gets its own thread so it never holds up the child loading workers.
+        self._index_pool = QtCore.QThreadPool()
+        self._index_pool.setMaxThreadCount(1)
+        self._pending_edits: List[Tuple[Tuple[Union[str, int], ...], Any, Any]] = []
+        self._edit_listeners: List[Callable[[Tuple[Union[str, int], ...], Any, Any, Any], None]] = []
+        # Edits copy the containers along their path, a version of the data is never changed once workers or
+        # the history may hold on to it.
+        self.journal: EditJournal = EditJournal()
+        self.stats: DocumentStats | None = None
+        self._stats_worker: StatsWorker | None = None
+        self._stats_listeners: List[Callable[[], None]] = []
+        self.parallel_search: ParallelSearch = ParallelSearch()
+        self.parallel_encoder: ParallelEncoder = ParallelEncoder()
+        # The file the data was read from as it was then, and the paths edited since, with the edit that last
+        # touched them. Saves of a few edits splice them into a copy of that file.
+        self._source: Tuple[str, FileStamp, LazyDocument | None] | None = None
+        self._dirty: Dict[Tuple[Union[str, int], ...], int] = {}
+        self._edit_count: int = 0
+        # Exported on the first parallel search and kept until the data changes, the generation tells an export
+        # that finished after a change not to keep its result.
+        self._shared_document: SharedDocument | None = None
+        self._shared_generation: int = 0
+        self._shared_lock = threading.Lock()
         self.gui: Gui = Gui(self)
         self.settings: Type[Settings] = Settings
         self.settings.setup()
+        self.snapshots: SnapshotCache = SnapshotCache(
+            self.settings.snapshot_dir(), self.settings.snapshot_cache_mb() * 1024 * 1024
+        )
+        JsonBackends.prefer(self.settings.json_backend())
 
         self.gui.load()
         if self._path:
@@ -54,12 +107,11 @@ class JsonManager:
             del self._monitor
 
     def handle_file_change(self, event: FileEvent) -> None:
+        # Called on the monitor's thread once the file has settled, the Gui queues the work to its own thread.
         if event.value == FileEvent.MODIFIED.value:
-            self.gui.reload_popup()
-            self.gui.reload()
+            self.gui.reload(notify=True)
         elif event == FileEvent.DELETED:
-            self.clear()
-            self.gui.clear()
+            self.gui.file_deleted()
 
     def load(self, path: Optional[str] = None, auto_clear: bool = True, activate_monitor: bool = True) -> None:
         if auto_clear and self.data is not None:
@@ -69,11 +121,18 @@ class JsonManager:
             self._path = path
         elif self._path is None:
             self.gui.open_file()
+            return
 
         assert self._path is not None, "Path must be set before loading data."
 
         try:
-            self.data = Helper.load_json(self._path)
+            stamp: FileStamp = SpliceWriter.stamp(self._path)
+            snapshots: SnapshotCache | None = self._snapshot_cache()
+            try:
+                data: Any = snapshots.load(self._path, stamp) if snapshots is not None else Helper.load_json(self._path)
+            except SnapshotUnavailable:
+                data = Helper.load_json(self._path)
+                snapshots.store(self._path, stamp, data)  # type: ignore[union-attr]
         except (OSError, json.JSONDecodeError) as e:
             if isinstance(e, json.JSONDecodeError):
                 self.gui.decoding_failed_popup(e)
@@ -83,25 +142,329 @@ class JsonManager:
             else:
                 raise OSError(f"Failed to read JSON file {self._path}: {e}")
         gc.collect()
+        self._replace_data(self._path, data, stamp)
 
         if activate_monitor and self.settings.monitoring_enabled():
             self.start_monitoring()
 
+    def load_async(
+        self, path: Optional[str] = None, incremental: bool = False, attempts: int = 3, compare: bool = False
+    ) -> LoadWorker | None:
+        target: str | None = path if path is not None else self._path
+        if target is None:
+            return None
+
+        if self._load_worker is not None:
+            self._load_worker.cancel()
+
+        incremental = (
+            incremental
+            and self.settings.incremental_load_enabled()
+            and LoadWorker.incremental_pays_off()
+            and os.path.exists(target)
+            and os.path.getsize(target) >= LoadWorker.INCREMENTAL_MIN_SIZE
+        )
+        lazy: bool = self.settings.lazy_mode_enabled()
+        # Comparing against a lazy document would read all of it back into memory.
+        previous: Any = self.data if compare and target == self._path and not lazy and not self.is_lazy() else None
+        worker = LoadWorker(target, incremental, lazy, attempts, previous, self._snapshot_cache())
+        self._load_worker = worker
+        worker.signals.finished.connect(  # type: ignore
+            lambda data, wrk=worker: self._on_load_finished(wrk, data),  # type: ignore
+            QtCore.Qt.ConnectionType.QueuedConnection,  # type: ignore
+        )
+        worker.signals.failed.connect(  # type: ignore
+            lambda _e, wrk=worker: self._on_load_ended(wrk),  # type: ignore
+            QtCore.Qt.ConnectionType.QueuedConnection,  # type: ignore
+        )
+        worker.signals.cancelled.connect(  # type: ignore
+            lambda wrk=worker: self._on_load_ended(wrk),  # type: ignore
+            QtCore.Qt.ConnectionType.QueuedConnection,  # type: ignore
+        )
+        QtCore.QThreadPool.globalInstance().start(worker)  # type: ignore
+        return worker
+
+    def is_loading(self) -> bool:
+        return self._load_worker is not None
+
+    def _on_load_ended(self, worker: LoadWorker) -> None:
+        if worker is self._load_worker:
+            self._load_worker = None
+
+    def _on_load_finished(self, worker: LoadWorker, data: Any) -> None:
+        if worker is not self._load_worker:
+            return  # superseded by a newer load
+        self._load_worker = None
+        self.swap_data(worker.path, data, worker.stamp)
+
+    def swap_data(self, path: str, data: Any, stamp: FileStamp | None = None) -> None:
+        if path != self._path:
+            self.stop_monitoring()
+        self._replace_data(path, data, stamp)
+
+        if self.settings.monitoring_enabled() and not self.is_monitoring():
+            self.start_monitoring()
+
+    def _replace_data(self, path: str, data: Any, stamp: FileStamp | None) -> None:
+        # Shared by both ways of loading, whatever was derived from the previous data is built again for this.
+        self._path = path
+        self.data = data
+        self.object_loaded_cache = 0
+        Preview.clear_cache()
+        self._drop_shared_document()
+        self.journal.clear()
+        self._set_source(path, stamp)
+        self._start_indexing()
+
+    def _stop_indexing(self) -> None:
+        if self._index_worker is not None:
+            self._index_worker.cancel()
+        self._index_worker = None
+        self.search_index = None
+        self._pending_edits = []
+        self._stop_stats()
+
+    def _start_indexing(self) -> None:
+        self._stop_indexing()
+        # Indexing would read all of a lazy document back into memory.
+        if self.data is None or self.is_lazy():
+            return
+        # Statistics are queued first, they take a fraction of the time the search index does.
+        self._start_stats()
+
+        worker = IndexWorker(self.data)
+        self._index_worker = worker
+        worker.signals.finished.connect(  # type: ignore
+            lambda index, wrk=worker: self._on_index_finished(wrk, index),  # type: ignore
+            QtCore.Qt.ConnectionType.QueuedConnection,  # type: ignore
+        )
+        self._index_pool.start(worker)  # type: ignore
+
+    def _on_index_finished(self, worker: IndexWorker, index: SearchIndex) -> None:
+        if worker is not self._index_worker:
+            return
+        self._index_worker = None
+        # Edits made while the worker was walking the data may or may not have been seen, replaying is safe.
+        for path, old, new in self._pending_edits:
+            index.update(path, old, new)
+        self._pending_edits = []
+        self.search_index = index
+
+    def _stop_stats(self) -> None:
+        if self._stats_worker is not None:
+            self._stats_worker.cancel()
+        self._stats_worker = None
+        self.stats = None
+
+    def _start_stats(self) -> None:
+        self._stop_stats()
+        worker = StatsWorker(self.data)
+        self._stats_worker = worker
+        worker.signals.finished.connect(  # type: ignore
+            lambda stats, wrk=worker: self._on_stats_finished(wrk, stats),  # type: ignore
+            QtCore.Qt.ConnectionType.QueuedConnection,  # type: ignore
+        )
+        self._index_pool.start(worker)  # type: ignore
+
+    def _on_stats_finished(self, worker: StatsWorker, stats: DocumentStats) -> None:
+        if worker is not self._stats_worker:
+            return
+        self._stats_worker = None
+        self.stats = stats
+        self._notify_stats()
+
+    def add_stats_listener(self, listener: Callable[[], None]) -> None:
+        self._stats_listeners.append(listener)
+
+    def _notify_stats(self) -> None:
+        for listener in self._stats_listeners:
+            listener()
+
+    def is_indexing(self) -> bool:
+        return self._index_worker is not None
+
+    def add_edit_listener(self, listener: Callable[[Tuple[Union[str, int], ...], Any, Any, Any], None]) -> None:
+        # Called with the path, the old and new value and the new document.
+        self._edit_listeners.append(listener)
+
+    def set_value(self, path: Tuple[Union[str, int], ...], value: Any) -> None:
+        edit: Edit = EditJournal.assign(self.data, path, value)
+        self.journal.record(edit)
+        self._apply_edit(path, edit.old, edit.new, edit.after)
+
+    def undo(self) -> Tuple[Union[str, int], ...] | None:
+        edit: Edit | None = self.journal.undo()
+        if edit is None:
+            return None
+        self._apply_edit(edit.path, edit.new, edit.old, edit.before)
+        return edit.path
+
+    def redo(self) -> Tuple[Union[str, int], ...] | None:
+        edit: Edit | None = self.journal.redo()
+        if edit is None:
+            return None
+        self._apply_edit(edit.path, edit.old, edit.new, edit.after)
+        return edit.path
+
+    def _apply_edit(self, path: Tuple[Union[str, int], ...], old: Any, value: Any, root: Any) -> None:
+        self.data = root
+        self.object_loaded_cache = 0
+        Preview.clear_cache()
+        self._drop_shared_document()
+        self._edit_count += 1
+        self._dirty[path] = self._edit_count
+
+        if not path:
+            self._start_indexing()
+        elif self.search_index is not None:
+            self.search_index.update(path, old, value)
+        elif self._index_worker is not None:
+            self._pending_edits.append((path, old, value))
+
+        if path and self.stats is not None:
+            self.stats.update(path, old, value, root)
+            self._notify_stats()
+        elif path and self._stats_worker is not None:
+            # Unlike the index, counts can't take an edit twice, so a walk that may have seen it starts over.
+            self._start_stats()
+
+        for listener in self._edit_listeners:
+            listener(path, old, value, root)
+
     def save(self, path: str) -> None:
         if self.data is None:
             raise ValueError("No data to save. Load or set data before saving.")
-        Helper.save_json(self.data, path)
-        gc.collect()
+        saved: Dict[Tuple[Union[str, int], ...], int] = dict(self._dirty)
+        if not self._splice(path):
+            # Encoders read list/dict storage directly, lazy containers have to be turned into plain ones first.
+            data = LazyDocument.materialize(self.data) if self.is_lazy() else self.data
+            Helper.save_json(data, path, self.settings.save_indent(), self._save_encoder())
+        self._after_save(path, saved)
+
+    def _splice(self, path: str) -> bool:
+        splice: SpliceWriter | None = self._splice_writer(path)
+        if splice is None:
+            return False
+        try:
+            splice.write(path)
+        except SpliceUnavailable:
+            return False
+        return True
 
     def save_as(self, new_path: str) -> None:
         self.save(new_path)
 
+    def save_async(self, path: str) -> SaveWorker:
+        if self.data is None:
+            raise ValueError("No data to save. Load or set data before saving.")
+        if self._save_worker is not None:
+            self._save_worker.cancel()
+
+        saved: Dict[Tuple[Union[str, int], ...], int] = dict(self._dirty)
+        worker = SaveWorker(
+            self.data,
+            path,
+            self.settings.save_indent(),
+            self.is_lazy(),
+            self._save_encoder(),
+            self._splice_writer(path),
+        )
+        self._save_worker = worker
+        worker.signals.finished.connect(  # type: ignore
+            lambda wrk=worker: self._on_save_ended(wrk, saved),  # type: ignore
+            QtCore.Qt.ConnectionType.QueuedConnection,  # type: ignore
+        )
+        worker.signals.failed.connect(  # type: ignore
+            lambda _e, wrk=worker: self._on_save_ended(wrk),  # type: ignore
+            QtCore.Qt.ConnectionType.QueuedConnection,  # type: ignore
+        )
+        worker.signals.cancelled.connect(  # type: ignore
+            lambda wrk=worker: self._on_save_ended(wrk),  # type: ignore
+            QtCore.Qt.ConnectionType.QueuedConnection,  # type: ignore
+        )
+        QtCore.QThreadPool.globalInstance().start(worker)  # type: ignore
+        return worker
+
+    def _snapshot_cache(self) -> SnapshotCache | None:
+        return self.snapshots if self.settings.snapshot_cache_enabled() else None
+
+    def _save_encoder(self) -> ParallelEncoder | None:
+        return self.parallel_encoder if self.settings.parallel_save_enabled() else None
+
+    def _splice_writer(self, path: str) -> SpliceWriter | None:
+        # Only a plain file that is still the one the data was read from, and only while the edits are a small
+        # part of it, a save that has to re-encode most of the document anyway may as well write all of it.
+        if self._source is None or not self._dirty or not self.settings.splice_save_enabled():
+            return None
+        source, stamp, document = self._source
+        if () in self._dirty or len(self._dirty) > self.SPLICE_MAX_EDITS or Compression.for_path(path) is not None:
+            return None
+        try:
+            if SpliceWriter.stamp(source) != stamp:
+                return None
+            with open(source, "rb") as f:
+                if Compression.detect(f.read(Compression.MAGIC_SIZE)) is not None:
+                    return None
+        except OSError:
+            return None
+        edits: Dict[Tuple[Union[str, int], ...], Any] = {}
+        for edited in self._dirty:
+            value: Any = self.get_data_from_path(edited)  # type: ignore[arg-type]
+            edits[edited] = LazyDocument.materialize(value) if self.is_lazy() else value
+        return SpliceWriter(source, stamp, edits, self.settings.save_indent(), document)
+
+    def _set_source(self, path: str | None, stamp: FileStamp | None) -> None:
+        self._dirty = {}
+        if path is None or stamp is None:
+            self._source = None
+            return
+        document: LazyDocument | None = self.data.document if self.is_lazy() else None  # type: ignore[union-attr]
+        self._source = (path, stamp, document)
+
+    def is_dirty(self) -> bool:
+        return bool(self._dirty)
+
+    def is_saving(self) -> bool:
+        return self._save_worker is not None
+
+    def _on_save_ended(
+        self, worker: SaveWorker, saved: Dict[Tuple[Union[str, int], ...], int] | None = None
+    ) -> None:
+        if worker is self._save_worker:
+            self._save_worker = None
+        if saved is not None:
+            self._after_save(worker.path, saved)
+
+    def _after_save(self, path: str, saved: Dict[Tuple[Union[str, int], ...], int]) -> None:
+        # Never used once the file changed, removed now rather than on the next open.
+        self.snapshots.discard(path)
+        if self._path is None or os.path.realpath(path) != os.path.realpath(self._path):
+            return
+        # The file on disk is now what was saved, edits made while it was being written are still to be saved.
+        try:
+            stamp: FileStamp | None = SpliceWriter.stamp(path)
+        except OSError:
+            stamp = None
+        pending = {edited: count for edited, count in self._dirty.items() if saved.get(edited) != count}
+        self._source = (path, stamp, None) if stamp is not None else None
+        self._dirty = pending
+        # The save replaced the watched file with a new one, watching starts over on it so our own write isn't
+        # reported as a change.
+        if self.is_monitoring():
+            self.stop_monitoring()
+            self.start_monitoring()
+
     def clear(self) -> None:
         self.stop_monitoring()
-        self.data.clear() if self.data else None
+        self._stop_indexing()
+        self._drop_shared_document()
+        # Not emptied in place, workers may still be reading this version.
         self.data = None
         self._path = None
+        self.journal.clear()
+        self._set_source(None, None)
         self.object_loaded_cache = 0
+        Preview.clear_cache()
         gc.collect()
 
     def is_monitoring(self) -> bool:
@@ -112,6 +475,15 @@ class JsonManager:
             raise RuntimeError("Manager does not have a monitor.")
         return self._monitor
 
+    def is_lazy(self) -> bool:
+        return isinstance(self.data, (LazyDict, LazyList))
+
+    def get_container_count(self) -> int | None:
+        # Objects and arrays of a lazy document, known from its index without reading the file.
+        if isinstance(self.data, (LazyDict, LazyList)):
+            return self.data.document.container_count
+        return None
+
     def get_total_count(self, cache: bool = True) -> int:
         if cache:
             if self.object_loaded_cache == 0:
@@ -132,47 +504,115 @@ class JsonManager:
     def get_data_from_path(self, path: Tuple[str, ...]) -> Any:
         if self.data is None:
             return None
-        current: Dict[str | int | float, Any] = self.data
+        current: Any = self.data
         for key in path:
-            if key in current:
-                current = current[key]
-            elif isinstance(current, (list, tuple)) and isinstance(key, int) and 0 <= key < len(current):
-                current = current[key]
+            if isinstance(current, dict) and key in current:
+                current = current[key]  # type: ignore[index]
+            elif (
+                isinstance(current, (list, tuple))
+                and isinstance(key, int)
+                and 0 <= key < len(current)  # type: ignore[arg-type]
+            ):
+                current = current[key]  # type: ignore[index]
             else:
                 return None
-        return current
+        return current  # type: ignore[return-value]
 
     def find_paths_in_data(
-        self, term: str, obj: Any = None, path: Tuple[str, ...] = ()
+        self, term: str, obj: Any = None, path: Tuple[str, ...] = (), mode: str = NgramIndex.EXACT
     ) -> List[Tuple[Tuple[Union[str, int], ...], str]]:
+        return list(self.iter_paths_in_data(term, obj, path, mode))  # type: ignore[arg-type]
+
+    def iter_paths_in_data(
+        self,
+        term: str,
+        obj: Any = None,
+        path: Tuple[Union[str, int], ...] = (),
+        mode: str = NgramIndex.EXACT,
+        heartbeat: int = 0,
+    ) -> Iterator[Tuple[Tuple[Union[str, int], ...], str] | float]:
+        # Yields matches in document order. With a heartbeat set, every that many nodes the estimated fraction of
+        # the document visited so far is yielded as well, so a caller can report progress and stop early.
         if obj is None:
             obj = self.data
-        results: List[Tuple[Tuple[Union[str, int], ...], str]] = []
-
-        if isinstance(obj, dict):
-            for k, v in obj.items():  # type: ignore
-                key_str = str(k).lower()  # type: ignore
-                is_cont = isinstance(v, (dict, list, tuple, set))
-                val_str = (repr(v) if not isinstance(v, str) else v).lower()  # type: ignore
-                p = path + (k,)  # type: ignore
-
-                if term == key_str or (not is_cont and term == val_str):
-                    results.append((p, val_str if term == val_str else key_str))  # type: ignore
-
-                if is_cont:
-                    results += self.find_paths_in_data(term, v, p)  # type: ignore
-
-        elif isinstance(obj, (list, tuple, set)):
-            for i, v in enumerate(obj):  # type: ignore
-                key_str: str = str(i).lower()
+        if not isinstance(obj, (dict, list, tuple, set)):
+            return
+        match: Callable[[str], bool] = NgramIndex.matcher(mode, term)
+        # Each frame is [path, children, child count, children started].
+        stack: List[List[Any]] = [[path, self._iter_children(obj), len(obj), 0]]  # type: ignore
+        visited: int = 0
+
+        while stack:
+            frame: List[Any] = stack[-1]
+            parent_path: Tuple[Union[str, int], ...] = frame[0]
+            for k, v in frame[1]:
+                frame[3] += 1
+                visited += 1
+                key_str: str = str(k).lower()
                 is_cont: bool = isinstance(v, (dict, list, tuple, set))
-                val_str: str = repr(v).lower()  # type: ignore
-                p = path + (i,)
-
-                if term == key_str or (not is_cont and term == val_str):
-                    results.append((p, val_str if term == val_str else key_str))
+                val_str: str = "" if is_cont else (repr(v) if not isinstance(v, str) else v).lower()  # type: ignore
+                p = parent_path + (k,)
+                val_match: bool = not is_cont and match(val_str)
 
-                if isinstance(v, (dict, list, tuple, set)):
-                    results += self.find_paths_in_data(term, v, p)  # type: ignore
+                if val_match or match(key_str):
+                    yield (p, val_str if val_match else key_str)
+                if heartbeat and visited % heartbeat == 0:
+                    yield self._scan_progress(stack)
 
-        return results
+                if is_cont:
+                    stack.append([p, self._iter_children(v), len(v), 0])  # type: ignore
+                    break
+            else:
+                stack.pop()
+
+    @staticmethod
+    def _iter_children(obj: Any) -> Iterator[Tuple[Any, Any]]:
+        return iter(obj.items()) if isinstance(obj, dict) else enumerate(obj)  # type: ignore
+
+    @staticmethod
+    def _scan_progress(stack: List[List[Any]]) -> float:
+        # Every level splits its parent's share evenly between its children, nothing has to be counted up front.
+        done: float = 0.0
+        share: float = 1.0
+        for _, _, count, started in stack:
+            count = count or 1
+            done += share * max(started - 1, 0) / count
+            share /= count
+        return done
+
+    def use_parallel_search(self) -> bool:
+        # Only documents that never get an index. Otherwise the export, a walk as slow as a serial scan, is paid
+        # on the first search and thrown away by the next edit, while the index is usually ready soon after.
+        return self.settings.parallel_search_enabled() and self.parallel_search.available and self.is_lazy()
+
+    def iter_paths_parallel(
+        self, term: str, mode: str = NgramIndex.EXACT, is_cancelled: Callable[[], bool] | None = None
+    ) -> Iterator[Tuple[Tuple[Union[str, int], ...], str] | float]:
+        # Like iter_paths_in_data with a heartbeat, but spread over the parallel search processes.
+        with self._shared_lock:
+            document, generation = self._shared_document, self._shared_generation
+        keep: bool = True
+        if document is None:
+            document = SharedDocument.export(self.data, is_cancelled)
+            with self._shared_lock:
+                keep = generation == self._shared_generation
+                if keep:
+                    self._shared_document = document
+        try:
+            yield from self.parallel_search.search(document, term, mode, is_cancelled)
+        finally:
+            if not keep:
+                document.retire()
+
+    def _drop_shared_document(self) -> None:
+        with self._shared_lock:
+            document, self._shared_document = self._shared_document, None
+            self._shared_generation += 1
+        if document is not None:
+            document.retire()
+
+    def shutdown(self) -> None:
+        self._stop_indexing()
+        self._drop_shared_document()
+        self.parallel_search.shutdown()
+        self.parallel_encoder.shutdown()
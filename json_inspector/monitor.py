@@ -1,5 +1,6 @@
-from typing import TYPE_CHECKING, Callable, List
+from typing import TYPE_CHECKING, Callable, List, Tuple
 import os
+import threading
 from enum import Enum, auto
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEvent, FileSystemEventHandler
@@ -20,6 +21,8 @@ class JsonFileMonitor:
     NO_OBSERVER_ERRORS = -1
     OBSERVER_INOTIFY_INSTANCE_LIMIT_ERROR = 24
     OBSERVER_INOTIFY_NO_SPACE_ERROR = 28
+    # Seconds the file's size and mtime have to stay the same before a change is passed on.
+    SETTLE_INTERVAL = 0.5
 
     def __init__(self, manager: "JsonManager") -> None:
         self.manager: "JsonManager" = manager
@@ -37,6 +40,13 @@ class JsonFileMonitor:
 
         self.event_handler = JsonFileEventHandler(self)
 
+        # Writers often save in many chunks and every chunk is an event of its own. Events only restart the settle
+        # timer, once the file stops changing a single MODIFIED (or DELETED, if it is still gone) is dispatched.
+        self._lock = threading.Lock()
+        self._settle_timer: threading.Timer | None = None
+        self._pending_stat: Tuple[int, int] | None = None
+        self._dispatched_stat: Tuple[int, int] | None = self._stat()
+
     def start(self) -> None:
         self._observer.schedule(self.event_handler, str(Path(self._path).resolve()), recursive=False)
         self._observer.daemon = True
@@ -66,7 +76,45 @@ class JsonFileMonitor:
             except Exception:
                 pass
 
+    def file_changed(self) -> None:
+        with self._lock:
+            self._pending_stat = self._stat()
+            self._schedule_settle()
+
+    def _stat(self) -> Tuple[int, int] | None:
+        try:
+            stat: os.stat_result = os.stat(self._path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def _schedule_settle(self) -> None:
+        if self._settle_timer is not None:
+            self._settle_timer.cancel()
+        self._settle_timer = threading.Timer(self.SETTLE_INTERVAL, self._on_settle_timeout)
+        self._settle_timer.daemon = True
+        self._settle_timer.start()
+
+    def _on_settle_timeout(self) -> None:
+        with self._lock:
+            if threading.current_thread() is not self._settle_timer:
+                return  # a later event restarted the timer while this one was waiting for the lock
+            stat: Tuple[int, int] | None = self._stat()
+            if stat != self._pending_stat:
+                self._pending_stat = stat
+                self._schedule_settle()
+                return
+            self._settle_timer = None
+            if stat == self._dispatched_stat:
+                return  # events without a change in size or mtime
+            self._dispatched_stat = stat
+        self.dispatch(FileEvent.MODIFIED if stat is not None else FileEvent.DELETED)
+
     def stop_monitoring(self) -> None:
+        with self._lock:
+            if self._settle_timer is not None:
+                self._settle_timer.cancel()
+                self._settle_timer = None
         self._observer.stop()
         try:
             self._observer.join()
@@ -85,9 +133,9 @@ class JsonFileEventHandler(FileSystemEventHandler):
 
     def on_modified(self, event: FileSystemEvent) -> None:
         if os.path.abspath(event.src_path) == self._target:
-            self._monitor.manager.load(auto_clear=False)
-            self._monitor.dispatch(FileEvent.MODIFIED)
+            self._monitor.file_changed()
 
     def on_deleted(self, event: FileSystemEvent) -> None:
+        # A delete can be the first half of a save that writes a new file, the settle check tells them apart.
         if os.path.abspath(event.src_path) == self._target:
-            self._monitor.dispatch(FileEvent.DELETED)
+            self._monitor.file_changed()
@@ -0,0 +1,143 @@
+import re
+from array import array
+from typing import Any, Callable, Dict, Iterable, List, Sequence
+
+from helper import LoadCancelled
+
+# Private, their layout may change between Python versions. Without them regex searches check every term.
+_parser: Any
+_constants: Any
+try:
+    from re import _constants, _parser  # type: ignore
+except ImportError:  # pragma: no cover - depends on the Python version
+    _parser = _constants = None
+
+
+class NgramIndex:
+    EXACT = "exact"
+    SUBSTRING = "substring"
+    PREFIX = "prefix"
+    REGEX = "regex"
+    MODES = (EXACT, SUBSTRING, PREFIX, REGEX)
+
+    N = 3
+    # Prepended to every term so a prefix query has n-grams of its own, even with only two characters.
+    START = "\x02"
+    # Longer terms are not split into n-grams, they are always checked directly.
+    MAX_INDEXED_LENGTH = 256
+    # Intersecting more than a few of the smallest postings rarely removes candidates the final check wouldn't.
+    MAX_INTERSECT = 3
+    CANCEL_CHECK_INTERVAL = 65536
+
+    def __init__(self) -> None:
+        self._terms: List[str] = []
+        self._grams: Dict[str, "array[int]"] = {}
+        self._unindexed: array[int] = array("i")
+
+    @property
+    def term_count(self) -> int:
+        return len(self._terms)
+
+    @classmethod
+    def build(cls, terms: Iterable[str], is_cancelled: Callable[[], bool] | None = None) -> "NgramIndex":
+        index = cls()
+        for term in terms:
+            index.add(term)
+            if len(index._terms) % cls.CANCEL_CHECK_INTERVAL == 0 and is_cancelled is not None and is_cancelled():
+                raise LoadCancelled()
+        return index
+
+    def add(self, term: str) -> None:
+        # Terms are only ever appended, edits leave the old ones behind without nodes, so postings stay sorted.
+        term_id: int = len(self._terms)
+        self._terms.append(term)
+        if len(term) > self.MAX_INDEXED_LENGTH:
+            self._unindexed.append(term_id)
+            return
+        grams = self._grams
+        for gram in self._split(self.START + term):
+            try:
+                grams[gram].append(term_id)
+            except KeyError:
+                grams[gram] = array("i", (term_id,))
+
+    @classmethod
+    def _split(cls, text: str) -> set[str]:
+        n: int = cls.N
+        return {text[i : i + n] for i in range(len(text) - n + 1)}
+
+    @staticmethod
+    def matcher(mode: str, query: str) -> Callable[[str], bool]:
+        # Matches normalized (lowercased) terms, raises re.error for an invalid pattern.
+        if mode == NgramIndex.REGEX:
+            return re.compile(query, re.IGNORECASE).search  # type: ignore[return-value]
+        query = query.lower()
+        if mode == NgramIndex.SUBSTRING:
+            return lambda term: query in term
+        if mode == NgramIndex.PREFIX:
+            return lambda term: term.startswith(query)
+        return lambda term: term == query
+
+    def find_terms(self, query: str, mode: str) -> List[str]:
+        match: Callable[[str], bool] = self.matcher(mode, query)
+        terms: List[str] = self._terms
+        candidates: Sequence[int] | None = self._candidates(self._literals(query, mode))
+        if candidates is None:
+            return [term for term in terms if match(term)]
+        return [terms[i] for i in candidates if match(terms[i])]
+
+    @classmethod
+    def _literals(cls, query: str, mode: str) -> List[str]:
+        if mode == cls.REGEX:
+            return cls.required_literals(query)
+        query = query.lower()
+        return [cls.START + query] if mode in (cls.PREFIX, cls.EXACT) else [query]
+
+    def _candidates(self, literals: List[str]) -> Sequence[int] | None:
+        # None means nothing could be narrowed down and every term has to be checked.
+        grams: set[str] = set()
+        for literal in literals:
+            grams.update(self._split(literal))
+        if not grams:
+            return None
+
+        empty: array[int] = array("i")
+        postings: List[array[int]] = sorted((self._grams.get(gram, empty) for gram in grams), key=len)
+        result: set[int] = set(postings[0])
+        for posting in postings[1 : self.MAX_INTERSECT]:
+            if not result:
+                break
+            result.intersection_update(posting)
+        result.update(self._unindexed)
+        return sorted(result)
+
+    @classmethod
+    def required_literals(cls, pattern: str) -> List[str]:
+        # Literal runs every match has to contain, collected from the parsed pattern. Anything that is optional
+        # or has alternatives ends a run and is skipped, so the result only ever narrows too little. Nothing is
+        # narrowed when the parser is missing or its output isn't what it used to be.
+        if _parser is None:
+            return []
+        literals: List[str] = []
+
+        def walk(items: Any) -> None:
+            run: List[str] = []
+            for op, av in items:
+                if op is _constants.LITERAL:
+                    run.append(chr(av).lower())
+                    continue
+                if run:
+                    literals.append("".join(run))
+                    run = []
+                if op is _constants.SUBPATTERN:
+                    walk(av[-1])
+                elif op in (_constants.MAX_REPEAT, _constants.MIN_REPEAT) and av[0] >= 1:
+                    walk(av[2])
+            if run:
+                literals.append("".join(run))
+
+        try:
+            walk(_parser.parse(pattern, re.IGNORECASE))
+        except (re.error, AttributeError, TypeError, ValueError, IndexError):
+            return []
+        return literals
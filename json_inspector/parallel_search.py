@@ -0,0 +1,239 @@
+import marshal
+import multiprocessing
+import os
+import sys
+import threading
+from array import array
+from collections import deque
+from multiprocessing.pool import AsyncResult, Pool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Deque, Dict, Iterator, List, Tuple, Union
+
+from helper import LoadCancelled
+from lazy_document import LazyDict, LazyDocument, LazyList
+from ngram_index import NgramIndex
+
+Path = Tuple[Union[str, int], ...]
+Match = Tuple[Path, str]
+
+
+class SharedDocument:
+    # The document as preorder node records (depth, key, normalized value) in one shared memory block, cut into
+    # partitions of about this many nodes. A partition can start anywhere since it carries the path of its first
+    # node's parent, so one huge array is spread as well as many small top-level keys.
+    PARTITION_NODES = 131072
+    CANCEL_CHECK_INTERVAL = 65536
+
+    def __init__(self, shm: SharedMemory | None, partitions: List[Tuple[int, int]], node_count: int) -> None:
+        self._shm: SharedMemory | None = shm
+        self.partitions: List[Tuple[int, int]] = partitions
+        self.node_count: int = node_count
+        self._lock = threading.Lock()
+        self._users: int = 0
+        self._retired: bool = False
+
+    @property
+    def name(self) -> str:
+        return self._shm.name if self._shm is not None else ""
+
+    @classmethod
+    def export(cls, data: Any, is_cancelled: Callable[[], bool] | None = None) -> "SharedDocument":
+        blobs: List[bytes] = []
+        depths: array[int] = array("i")
+        keys: List[Any] = []
+        values: List[str | None] = []
+        prefix: Path = ()
+        parent_path: List[Any] = []
+        node_count: int = 0
+
+        def flush() -> None:
+            nonlocal depths, keys, values
+            blobs.append(marshal.dumps((prefix, depths.tobytes(), keys, values)))
+            depths, keys, values = array("i"), [], []
+
+        stack: List[Iterator[Tuple[Any, Any]]] = []
+        if isinstance(data, (dict, list, tuple, set)):
+            stack.append(cls._children(data))
+        while stack:
+            for key, value in stack[-1]:
+                if not keys:
+                    prefix = tuple(parent_path)
+                depths.append(len(stack) - 1)
+                keys.append(key)
+                node_count += 1
+                if node_count % cls.CANCEL_CHECK_INTERVAL == 0 and is_cancelled is not None and is_cancelled():
+                    raise LoadCancelled()
+
+                if isinstance(value, (dict, list, tuple, set)):
+                    values.append(None)
+                    if len(keys) >= cls.PARTITION_NODES:
+                        flush()
+                    stack.append(cls._children(value))
+                    parent_path.append(key)
+                    break
+                values.append((value if isinstance(value, str) else repr(value)).lower())
+                if len(keys) >= cls.PARTITION_NODES:
+                    flush()
+            else:
+                stack.pop()
+                if stack:
+                    parent_path.pop()
+        if keys:
+            flush()
+
+        if not blobs:
+            return cls(None, [], 0)
+        shm = SharedMemory(create=True, size=sum(map(len, blobs)))
+        partitions: List[Tuple[int, int]] = []
+        offset: int = 0
+        for blob in blobs:
+            shm.buf[offset : offset + len(blob)] = blob  # type: ignore[index]
+            partitions.append((offset, len(blob)))
+            offset += len(blob)
+        return cls(shm, partitions, node_count)
+
+    @staticmethod
+    def _children(data: Any) -> Iterator[Tuple[Any, Any]]:
+        # Lazy containers that haven't been loaded are read child by child from the file's index, exporting
+        # shouldn't bring the document into memory. Nested containers come out unloaded and are walked the same way.
+        if isinstance(data, (LazyDict, LazyList)) and not data.is_loaded:
+            doc: LazyDocument = data.document
+            return ((key, doc.value_at(start)) for key, start in doc.children(data.offset))
+        return iter(data.items()) if isinstance(data, dict) else enumerate(data)  # type: ignore
+
+    def __enter__(self) -> "SharedDocument":
+        with self._lock:
+            self._users += 1
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        with self._lock:
+            self._users -= 1
+            if self._retired and not self._users:
+                self._release()
+
+    def retire(self) -> None:
+        # The block goes away once the last search using it is done.
+        with self._lock:
+            self._retired = True
+            if not self._users:
+                self._release()
+
+    def _release(self) -> None:
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+
+# Shared memory attached in a pool process, only one document is searched at a time.
+_attached: Dict[str, SharedMemory] = {}
+
+
+def _attach(name: str) -> SharedMemory:
+    shm: SharedMemory | None = _attached.get(name)
+    if shm is None:
+        for old in _attached.values():
+            old.close()
+        _attached.clear()
+        shm = _attached[name] = _open(name)
+    return shm
+
+
+def _open(name: str) -> SharedMemory:
+    # The GUI process created the block and unlinks it, the resource tracker must not count it for this one too.
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name, track=False)
+    # Before 3.13 spawned processes share the parent's tracker, registering again is a no-op there.
+    return SharedMemory(name)
+
+
+def _search_partition(name: str, offset: int, size: int, term: str, mode: str) -> List[Match]:
+    buf: memoryview = _attach(name).buf  # type: ignore[assignment]
+    view: memoryview = buf[offset : offset + size]
+    try:
+        prefix, depth_bytes, keys, values = marshal.loads(view)
+    finally:
+        view.release()
+    depths: array[int] = array("i")
+    depths.frombytes(depth_bytes)
+
+    match: Callable[[str], bool] = NgramIndex.matcher(mode, term)
+    path: List[Any] = list(prefix)
+    results: List[Match] = []
+    for depth, key, value in zip(depths, keys, values):
+        del path[depth:]
+        path.append(key)
+        key_str: str = str(key).lower()
+        if value is not None and match(value):
+            results.append((tuple(path), value))
+        elif match(key_str):
+            results.append((tuple(path), key_str))
+    return results
+
+
+class ParallelSearch:
+    # Partitions queued per process, any more would only be wasted work once a search is cancelled.
+    IN_FLIGHT_PER_PROCESS = 2
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, processes: int | None = None) -> None:
+        self.processes: int = processes or os.cpu_count() or 1
+        self._pool: Pool | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        return self.processes > 1
+
+    def _get_pool(self) -> Pool:
+        with self._lock:
+            if self._pool is None:
+                # Forking a process with running Qt threads isn't safe, the pool is started once and kept.
+                self._pool = multiprocessing.get_context("spawn").Pool(self.processes)
+            return self._pool
+
+    def search(
+        self,
+        document: SharedDocument,
+        term: str,
+        mode: str = NgramIndex.EXACT,
+        is_cancelled: Callable[[], bool] | None = None,
+    ) -> Iterator[Match | float]:
+        # Same output as JsonManager.iter_paths_in_data: matches in document order, each partition followed by
+        # the fraction of the document searched so far.
+        if not document.partitions:
+            return
+        cancelled: Callable[[], bool] = is_cancelled or (lambda: False)
+        pool: Pool = self._get_pool()
+        with document:
+            tasks = iter(document.partitions)
+            pending: Deque[AsyncResult[List[Match]]] = deque()
+
+            def submit() -> None:
+                task = next(tasks, None)
+                if task is not None and not cancelled():
+                    pending.append(pool.apply_async(_search_partition, (document.name, *task, term, mode)))
+
+            for _ in range(self.processes * self.IN_FLIGHT_PER_PROCESS):
+                submit()
+            done: int = 0
+            while pending:
+                result: AsyncResult[List[Match]] = pending.popleft()
+                while not result.ready() and not cancelled():
+                    result.wait(self.POLL_INTERVAL)
+                if cancelled():
+                    return
+                submit()
+                # Results that were ready before a cancel are dropped as well.
+                for item in [*result.get(), (done + 1) / len(document.partitions)]:
+                    if cancelled():
+                        return
+                    yield item
+                done += 1
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.terminate()
+                self._pool = None
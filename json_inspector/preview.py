@@ -0,0 +1,113 @@
+import json
+import threading
+from collections import OrderedDict
+from itertools import islice
+from typing import Any, ClassVar, List, Tuple
+
+
+class Preview:
+    MAX_CHARS: ClassVar[int] = 100
+    MAX_ITEMS: ClassVar[int] = 50
+    ELLIPSIS: ClassVar[str] = "…"
+    CACHE_SIZE: ClassVar[int] = 4096
+
+    # Keyed by id() of the container, the entry keeps the container alive so the id can't be reused while cached.
+    _cache: ClassVar["OrderedDict[Tuple[int, int, int], Tuple[Any, str]]"] = OrderedDict()
+    _lock: ClassVar[threading.Lock] = threading.Lock()
+
+    @classmethod
+    def text(cls, value: Any, max_chars: int | None = None, max_items: int | None = None) -> str:
+        # Scalars read like str() does today, containers get a JSON-like summary that stops once the budget is spent.
+        max_chars = cls.MAX_CHARS if max_chars is None else max_chars
+        max_items = cls.MAX_ITEMS if max_items is None else max_items
+        if not isinstance(value, (dict, list, tuple, set)):
+            text = value if isinstance(value, str) else str(value)
+            return text if len(text) <= max_chars else text[:max_chars] + cls.ELLIPSIS
+
+        key = (id(value), max_chars, max_items)  # type: ignore
+        with cls._lock:
+            hit = cls._cache.get(key)
+            if hit is not None and hit[0] is value:
+                cls._cache.move_to_end(key)
+                return hit[1]
+
+        parts: List[str] = []
+        cls._render(value, parts, [max_chars], max_items)
+        text = "".join(parts)
+
+        with cls._lock:
+            cls._cache[key] = (value, text)
+            cls._cache.move_to_end(key)
+            while len(cls._cache) > cls.CACHE_SIZE:
+                cls._cache.popitem(last=False)
+        return text
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        # Edits change containers in place, so every summary that includes them (all ancestors) goes stale.
+        with cls._lock:
+            cls._cache.clear()
+
+    @classmethod
+    def pretty(cls, value: Any, max_chars: int) -> str:
+        # Indented JSON for the editor, the encoder is lazy so we only pay for what is shown.
+        parts: List[str] = []
+        size: int = 0
+        try:
+            for chunk in json.JSONEncoder(indent=2, ensure_ascii=False).iterencode(value):
+                parts.append(chunk)
+                size += len(chunk)
+                if size >= max_chars:
+                    return "".join(parts)[:max_chars] + f"\n{cls.ELLIPSIS} (truncated)"
+        except (TypeError, ValueError):
+            return cls.text(value, max_chars)
+        return "".join(parts)
+
+    @classmethod
+    def _render(cls, value: Any, parts: List[str], budget: List[int], max_items: int) -> None:
+        if isinstance(value, dict):
+            opening, closing = "{", "}"
+            items: Any = value.items()  # type: ignore
+        elif isinstance(value, (list, tuple, set)):
+            opening, closing = "[", "]"
+            items = value  # type: ignore
+        else:
+            cls._emit(cls._scalar(value, budget[0]), parts, budget)
+            return
+
+        total: int = len(value)  # type: ignore
+        if budget[0] <= 0:
+            cls._emit(f"{opening}{cls.ELLIPSIS}{closing}", parts, budget)
+            return
+        cls._emit(opening, parts, budget)
+        shown: int = 0
+        for item in islice(items, max_items):  # type: ignore
+            if budget[0] <= 0:
+                break
+            if shown:
+                cls._emit(", ", parts, budget)
+            if opening == "{":
+                cls._emit(json.dumps(str(item[0]), ensure_ascii=False) + ": ", parts, budget)  # type: ignore
+                item = item[1]  # type: ignore
+            cls._render(item, parts, budget, max_items)
+            shown += 1
+        if shown < total:
+            cls._emit(f"{', ' if shown else ''}{cls.ELLIPSIS} {total - shown:,} more", parts, budget)
+        cls._emit(closing, parts, budget)
+
+    @classmethod
+    def _scalar(cls, value: Any, budget: int) -> str:
+        if isinstance(value, str):
+            if len(value) > budget:
+                return json.dumps(value[: max(budget, 0)], ensure_ascii=False)[:-1] + cls.ELLIPSIS + '"'
+            return json.dumps(value, ensure_ascii=False)
+        if value is None:
+            return "null"
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        return repr(value)
+
+    @staticmethod
+    def _emit(text: str, parts: List[str], budget: List[int]) -> None:
+        parts.append(text)
+        budget[0] -= len(text)
@@ -0,0 +1,121 @@
+from typing import Any, Dict, List, Union
+from PyQt6 import QtCore, QtGui
+
+from helper import Helper
+from preview import Preview
+
+
+class PropertyTableModel(QtCore.QAbstractTableModel):
+    HEADERS = ("Key", "Type", "Value")
+    PREVIEW_LENGTH = 100
+
+    def __init__(self, colors: Dict[str, str], parent: QtCore.QObject | None = None) -> None:
+        super().__init__(parent)
+        self._colors: Dict[str, str] = colors
+        self._brushes: Dict[str, QtGui.QBrush] = {}
+        self._obj: Any = None
+        self._rows: int = 0
+        # Only dicts (and sets, which can't be indexed) need their keys copied, lists are indexed directly.
+        self._keys: List[Any] | None = None
+        self._scalar: bool = False
+
+    def set_object(self, obj: Any) -> None:
+        self.beginResetModel()
+        self._obj = obj
+        self._keys = None
+        self._scalar = False
+        if isinstance(obj, dict):
+            self._keys = list(obj.keys())  # type: ignore
+            self._rows = len(self._keys)
+        elif isinstance(obj, (list, tuple)):
+            self._rows = len(obj)  # type: ignore
+        elif isinstance(obj, set):
+            self._keys = list(obj)  # type: ignore
+            self._rows = len(self._keys)
+        else:
+            self._scalar = True
+            self._rows = 1
+        self.endResetModel()
+
+    def clear(self) -> None:
+        self.beginResetModel()
+        self._obj = None
+        self._keys = None
+        self._scalar = False
+        self._rows = 0
+        self.endResetModel()
+
+    @property
+    def obj(self) -> Any:
+        return self._obj
+
+    def key_at(self, row: int) -> Union[str, int]:
+        if self._scalar:
+            return "value"
+        if isinstance(self._obj, dict):
+            return self._keys[row]  # type: ignore
+        return row
+
+    def value_at(self, row: int) -> Any:
+        if self._scalar:
+            return self._obj
+        if isinstance(self._obj, dict):
+            return self._obj[self._keys[row]]  # type: ignore
+        if isinstance(self._obj, set):
+            return self._keys[row]  # type: ignore
+        return self._obj[row]
+
+    def type_at(self, row: int) -> str:
+        return Helper.type_name(self.value_at(row))
+
+    @property
+    def is_scalar(self) -> bool:
+        return self._scalar
+
+    def refresh_row(self, row: int, value: Any, container: Any = None) -> None:
+        # A scalar shown on its own is held by value, a container is replaced by the copy the edit made of it.
+        if self._scalar:
+            self._obj = value
+        elif container is not None:
+            self._obj = container
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.HEADERS) - 1))
+
+    def preview(self, row: int) -> str:
+        return Preview.text(self.value_at(row), self.PREVIEW_LENGTH)
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._rows
+
+    def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(
+        self, section: int, orientation: QtCore.Qt.Orientation, role: int = QtCore.Qt.ItemDataRole.DisplayRole
+    ) -> Any:
+        if role != QtCore.Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == QtCore.Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return str(section + 1)
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid() or index.row() >= self._rows:
+            return None
+        row, column = index.row(), index.column()
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return str(self.key_at(row))
+            if column == 1:
+                return self.type_at(row)
+            return self.preview(row)
+        if role == QtCore.Qt.ItemDataRole.ForegroundRole and column == 1:
+            return self._brush(self.type_at(row))
+        return None
+
+    def _brush(self, typ: str) -> QtGui.QBrush | None:
+        if typ not in self._colors:
+            return None
+        brush: QtGui.QBrush | None = self._brushes.get(typ)
+        if brush is None:
+            brush = self._brushes[typ] = QtGui.QBrush(QtGui.QColor(self._colors[typ]))
+        return brush
@@ -0,0 +1,61 @@
+import threading
+from typing import Any
+from PyQt6 import QtCore
+
+from signals import SaveSignals
+from document_writer import DocumentWriter, ParallelEncoder, SaveCancelled
+from lazy_document import LazyDocument
+from splice_writer import SpliceUnavailable, SpliceWriter
+
+
+class SaveWorker(QtCore.QRunnable):
+    def __init__(
+        self,
+        data: Any,
+        path: str,
+        indent: int | None = 4,
+        lazy: bool = False,
+        encoder: ParallelEncoder | None = None,
+        splice: SpliceWriter | None = None,
+    ):
+        super().__init__()
+        self.signals = SaveSignals()
+        self.data: Any = data
+        self.path: str = path
+        self.indent: int | None = indent
+        self.lazy: bool = lazy
+        self.encoder: ParallelEncoder | None = encoder
+        self.splice: SpliceWriter | None = splice
+        self._cancel_event = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancel_event.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def run(self) -> None:
+        try:
+            if not self._splice():
+                # Edits never change a version of the document in place, so this one can be encoded as it is.
+                data: Any = LazyDocument.materialize(self.data) if self.lazy else self.data
+                self.data = None
+                writer = DocumentWriter(data, self.indent, self.encoder)
+                writer.write(self.path, self.signals.progress.emit, self.is_cancelled)
+        except SaveCancelled:
+            self.signals.cancelled.emit()
+            return
+        except Exception as e:
+            # The file is only replaced once it is written in full, whatever went wrong it is still as it was.
+            self.signals.failed.emit(e)
+            return
+        self.signals.finished.emit()
+
+    def _splice(self) -> bool:
+        if self.splice is None:
+            return False
+        try:
+            self.splice.write(self.path, self.signals.progress.emit, self.is_cancelled)
+        except SpliceUnavailable:
+            return False  # the file changed on disk or lacks an edited path, the whole document is written instead
+        return True
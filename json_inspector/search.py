@@ -1,6 +1,9 @@
-from typing import List, Tuple, Union, TYPE_CHECKING
+import re
+from typing import List, Sequence, Tuple, Union, TYPE_CHECKING
 from PyQt6 import QtWidgets, QtCore
 from search_worker import SearchWorker
+from search_index import NodePaths
+from ngram_index import NgramIndex
 
 if TYPE_CHECKING:
     from manager import JsonManager
@@ -12,27 +15,69 @@ class Search(QtCore.QObject):
         self._manager: "JsonManager" = manager
         self._gui = manager.gui
         self._threadpool: QtCore.QThreadPool = threadpool
-        self._matches: List[Tuple[Union[str, int], ...]] = []
+        self._matches: Sequence[Tuple[Union[str, int], ...]] = []
         self._current_index: int = -1
+        self._worker: SearchWorker | None = None
+        self._progress: QtWidgets.QProgressDialog | None = None
 
-    def perform_search(self, term: str) -> None:
-        term = term.strip().lower()
+    def perform_search(self, term: str, mode: str = NgramIndex.EXACT) -> None:
+        # Patterns are case insensitive already, lowering one would change escapes like \D.
+        term = term.strip() if mode == NgramIndex.REGEX else term.strip().lower()
+        self.cancel()
         if not term:
             return self.clear()
 
-        dlg = QtWidgets.QProgressDialog("Searching…", None, 0, 0, self._gui)
+        if mode == NgramIndex.REGEX:
+            try:
+                re.compile(term)
+            except re.error as e:
+                QtWidgets.QMessageBox.warning(
+                    self._gui, "Invalid Pattern", f"“{term}” is not a valid regular expression.\n\nDetails: {e}"
+                )
+                return
+
+        # Until the index has been built after loading we fall back to scanning the document.
+        index = self._manager.search_index
+        if index is not None:
+            self._show_matches(NodePaths(index, index.find_nodes(term, mode)))
+            return
+
+        # Matches are shown as they come in, the dialog doesn't block so they can be browsed during the scan.
+        self._show_matches([])
+        dlg = QtWidgets.QProgressDialog("Searching…", "Cancel", 0, SearchWorker.PROGRESS_MAX, self._gui)
         dlg.setWindowTitle("Please wait")
-        dlg.setWindowModality(QtCore.Qt.WindowModality.ApplicationModal)
-        dlg.setCancelButton(None)
-        dlg.setMinimumDuration(0)
-        dlg.show()
+        dlg.setWindowModality(QtCore.Qt.WindowModality.NonModal)
+        dlg.setMinimumDuration(500)
+        dlg.setAutoClose(False)
+        dlg.setAutoReset(False)
+        dlg.canceled.connect(self.cancel)  # type: ignore
+        self._progress = dlg
 
-        worker = SearchWorker(self._manager, term)
-        worker.signals.finished.connect(lambda matches: self._on_search_finished(matches, dlg))  # type: ignore
+        worker = SearchWorker(self._manager, term, mode, self._manager.use_parallel_search())
+        worker.signals.found.connect(lambda paths: self._on_found(worker, paths))  # type: ignore
+        worker.signals.progress.connect(lambda value: self._on_progress(worker, value))  # type: ignore
+        worker.signals.finished.connect(lambda: self._on_search_finished(worker))  # type: ignore
+        self._worker = worker
         self._threadpool.start(worker)  #    type: ignore
 
+    def is_searching(self) -> bool:
+        return self._worker is not None
+
+    def cancel(self) -> None:
+        # Stops a running scan, the matches found so far stay.
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        if self._progress is not None:
+            self._progress.canceled.disconnect(self.cancel)  # type: ignore
+            self._progress.close()
+            self._progress.deleteLater()
+            self._progress = None
+        self._update_label()
+
     def clear(self) -> None:
-        self._matches.clear()
+        self.cancel()
+        self._matches = []
         self._current_index = -1
         self._gui.match_label.setText("0/0")
         self._gui.tree.clearSelection()
@@ -43,31 +88,38 @@ class Search(QtCore.QObject):
         self._current_index = (self._current_index + (delta or 1)) % len(self._matches)
         self._goto_current()
 
-    def _on_search_finished(
-        self,
-        matches: List[Tuple[Tuple[Union[str, int], ...], str]],
-        dlg: QtWidgets.QProgressDialog,
-    ) -> None:
-        dlg.close()
-        self._matches = [path for path, _ in matches]
+    def _on_found(self, worker: SearchWorker, paths: List[Tuple[Union[str, int], ...]]) -> None:
+        if worker is not self._worker:
+            return
+        self._matches.extend(paths)  # type: ignore[attr-defined]
+        if self._current_index < 0:
+            self.step(0)
+        else:
+            self._update_label()
+
+    def _on_progress(self, worker: SearchWorker, value: int) -> None:
+        if worker is self._worker and self._progress is not None:
+            self._progress.setValue(value)
+
+    def _on_search_finished(self, worker: SearchWorker) -> None:
+        if worker is not self._worker:
+            return
+        self._worker = None
+        self.cancel()
+
+    def _show_matches(self, matches: Sequence[Tuple[Union[str, int], ...]]) -> None:
+        self._matches = matches
         total = len(self._matches)
         self._current_index = -1
         self._gui.match_label.setText(f"0/{total}")
         if total:
             self.step(0)
 
-    def _goto_current(self) -> None:
-        idx = self._current_index
-        path = self._matches[idx]
-        item: QtWidgets.QTreeWidgetItem | None = self._gui.item_for_path(path=path)
-        if not item:
-            return
-
-        parent: QtWidgets.QTreeWidgetItem | None = item.parent()
-        while parent:
-            self._gui.tree.expandItem(parent)
-            parent = parent.parent()
+    def _update_label(self) -> None:
+        # A trailing ellipsis means more matches may still be found.
+        more: str = "…" if self._worker is not None else ""
+        self._gui.match_label.setText(f"{self._current_index + 1}/{len(self._matches)}{more}")
 
-        self._gui.tree.setCurrentItem(item)
-        self._gui.tree.scrollToItem(item)
-        self._gui.match_label.setText(f"{idx + 1}/{len(self._matches)}")
+    def _goto_current(self) -> None:
+        if self._gui.select_path(self._matches[self._current_index]):
+            self._update_label()
@@ -0,0 +1,252 @@
+from array import array
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Set, Tuple, Union
+
+from helper import LoadCancelled
+from ngram_index import NgramIndex
+
+Path = Tuple[Union[str, int], ...]
+Match = Tuple[Path, str]
+# A posting is a single node id until a second node shares the term, that saves an array per unique value.
+Posting = Union[int, "array[int]"]
+
+
+class SearchIndex:
+    CANCEL_CHECK_INTERVAL = 65536
+    ROOT = 0
+
+    def __init__(self) -> None:
+        # Nodes are numbered in preorder, so a node's subtree is the id range [id, ends[id]).
+        self._parents: array[int] = array("i")
+        self._ends: array[int] = array("i")
+        self._keys: List[Any] = []
+        self._dead: bytearray = bytearray()
+        # Postings are keyed by the hash of their term, at 64 bits a false hit is not a practical concern.
+        self._key_terms: Dict[int, Posting] = {}
+        self._value_terms: Dict[int, Posting] = {}
+        # Children of nodes whose value was replaced by an edit, their original preorder range is dead.
+        self._replaced: Dict[int, Dict[Any, int]] = {}
+        # Children by key of the original nodes edits were looked up through, built on the first lookup.
+        self._child_maps: Dict[int, Dict[Any, int]] = {}
+        # Nodes numbered at build time, the ones added by edits come after and are out of preorder.
+        self._built: int = 0
+        # The distinct terms, for matching anything other than a whole term.
+        self.ngrams: NgramIndex = NgramIndex()
+
+    @staticmethod
+    def normalize_key(key: Any) -> str:
+        return str(key).lower()
+
+    @staticmethod
+    def normalize_value(value: Any) -> str:
+        return (value if isinstance(value, str) else repr(value)).lower()
+
+    @property
+    def node_count(self) -> int:
+        return len(self._parents)
+
+    @classmethod
+    def build(cls, data: Any, is_cancelled: Callable[[], bool] | None = None) -> "SearchIndex":
+        index = cls()
+        index._add_node(-1, None)
+        terms: Dict[str, None] = {}
+        index._index_children(cls.ROOT, data, is_cancelled, terms=terms)
+        index._built = index.node_count
+        index.ngrams = NgramIndex.build(terms, is_cancelled)
+        return index
+
+    def _add_node(self, parent: int, key: Any) -> int:
+        node: int = len(self._parents)
+        self._parents.append(parent)
+        self._ends.append(node + 1)
+        self._keys.append(key)
+        self._dead.append(0)
+        return node
+
+    def _index_children(
+        self,
+        root: int,
+        data: Any,
+        is_cancelled: Callable[[], bool] | None = None,
+        extra: bool = False,
+        terms: Dict[str, None] | None = None,
+    ) -> None:
+        # Iterative so deep documents can't hit the recursion limit. With extra set the children are also
+        # recorded in _replaced, they live outside the preorder ranges of the original build. The distinct
+        # normalized terms are collected in terms.
+        parents, ends, keys, dead = self._parents, self._ends, self._keys, self._dead
+        key_terms, value_terms = self._key_terms, self._value_terms
+        key_hashes: Dict[Any, int] = {}
+        if terms is None:
+            terms = {}
+        stack: List[Tuple[int, Iterator[Tuple[Any, Any]]]] = []
+        if isinstance(data, (dict, list, tuple, set)):
+            stack.append((root, self._children(data)))
+            if extra:
+                self._replaced[root] = {}
+        next_check: int = len(parents) + self.CANCEL_CHECK_INTERVAL
+
+        while stack:
+            parent, children = stack[-1]
+            for key, value in children:
+                node: int = len(parents)
+                parents.append(parent)
+                ends.append(node + 1)
+                keys.append(key)
+                dead.append(0)
+                if extra:
+                    self._replaced[parent][key] = node
+
+                h: int | None = key_hashes.get(key)
+                if h is None:
+                    term: str = str(key).lower()
+                    terms[term] = None
+                    h = key_hashes[key] = hash(term)
+                self._post(key_terms, h, node)
+
+                if isinstance(value, (dict, list, tuple, set)):
+                    stack.append((node, self._children(value)))
+                    if extra:
+                        self._replaced[node] = {}
+                    break
+                term = (value if isinstance(value, str) else repr(value)).lower()
+                terms[term] = None
+                self._post(value_terms, hash(term), node)
+            else:
+                if not extra:
+                    ends[parent] = len(parents)
+                stack.pop()
+
+            if len(parents) >= next_check:
+                next_check = len(parents) + self.CANCEL_CHECK_INTERVAL
+                if is_cancelled is not None and is_cancelled():
+                    raise LoadCancelled()
+
+    @staticmethod
+    def _children(data: Any) -> Iterator[Tuple[Any, Any]]:
+        return iter(data.items()) if isinstance(data, dict) else enumerate(data)  # type: ignore
+
+    @staticmethod
+    def _post(terms: Dict[int, Posting], h: int, node: int, unique: bool = False) -> None:
+        # Ids handed out while building are always new, only edits can post a node that is already there.
+        posting: Posting | None = terms.get(h)
+        if posting is None:
+            terms[h] = node
+        elif isinstance(posting, int):
+            if posting != node:
+                terms[h] = array("i", (posting, node))
+        elif not unique or node not in posting:
+            posting.append(node)
+
+    @staticmethod
+    def _unpost(terms: Dict[int, Posting], h: int, node: int) -> None:
+        posting: Posting | None = terms.get(h)
+        if posting is None:
+            return
+        if isinstance(posting, int):
+            if posting == node:
+                del terms[h]
+        elif node in posting:
+            posting.remove(node)
+
+    @staticmethod
+    def _ids(posting: Posting | None) -> "array[int] | Tuple[int, ...]":
+        if posting is None:
+            return ()
+        return (posting,) if isinstance(posting, int) else posting
+
+    def path(self, node: int) -> Path:
+        keys: List[Any] = []
+        while node > self.ROOT:
+            keys.append(self._keys[node])
+            node = self._parents[node]
+        return tuple(reversed(keys))
+
+    def find_nodes(self, term: str, mode: str = NgramIndex.EXACT) -> List[int]:
+        # Any other mode than exact first finds the matching distinct terms, raises re.error for a bad pattern.
+        matched: List[str] = [term.lower()] if mode == NgramIndex.EXACT else self.ngrams.find_terms(term, mode)
+        dead = self._dead
+        nodes: Set[int] = set()
+        for h in map(hash, matched):
+            nodes.update(n for n in self._ids(self._key_terms.get(h)) if not dead[n])
+            nodes.update(n for n in self._ids(self._value_terms.get(h)) if not dead[n])
+        return sorted(nodes, key=self._order) if self.node_count > self._built else sorted(nodes)
+
+    def _order(self, node: int) -> Tuple[int, ...]:
+        # Document order. Nodes added by an edit are numbered in preorder among themselves, so a node sorts by
+        # its nearest original ancestor followed by the added ones below it.
+        chain: List[int] = [node]
+        while node >= self._built and node > self.ROOT:
+            node = self._parents[node]
+            chain.append(node)
+        return tuple(reversed(chain))
+
+    def find(self, term: str, mode: str = NgramIndex.EXACT) -> List[Match]:
+        return [(self.path(node), term) for node in self.find_nodes(term, mode)]
+
+    def find_node(self, path: Path) -> int | None:
+        node: int | None = self.ROOT
+        for key in path:
+            node = self._child(node, key)  # type: ignore[arg-type]
+            if node is None:
+                return None
+        return node
+
+    def _child(self, node: int, key: Any) -> int | None:
+        if node in self._replaced:
+            return self._replaced[node].get(key)
+        children: Dict[Any, int] | None = self._child_maps.get(node)
+        if children is None:
+            # A scan of the siblings once, every later edit below this node looks its key up directly.
+            children = self._child_maps[node] = {}
+            child: int = node + 1
+            end: int = self._ends[node]
+            while child < end:
+                children[self._keys[child]] = child
+                child = self._ends[child]
+        return children.get(key)
+
+    def update(self, path: Path, old: Any, new: Any) -> None:
+        node: int | None = self.find_node(path)
+        if node is None:
+            return
+        was_container: bool = isinstance(old, (dict, list, tuple, set))
+        if was_container:
+            self._kill_descendants(node)
+        else:
+            self._unpost(self._value_terms, hash(self.normalize_value(old)), node)
+
+        terms: Dict[str, None] = {}
+        if isinstance(new, (dict, list, tuple, set)):
+            self._index_children(node, new, extra=True, terms=terms)
+        else:
+            if was_container:
+                self._replaced[node] = {}
+            term: str = self.normalize_value(new)
+            terms[term] = None
+            self._post(self._value_terms, hash(term), node, unique=True)
+        for term in terms:
+            self.ngrams.add(term)
+
+    def _kill_descendants(self, node: int) -> None:
+        if node in self._replaced:
+            stack: List[int] = list(self._replaced.pop(node).values())
+            while stack:
+                child: int = stack.pop()
+                self._dead[child] = 1
+                stack.extend(self._replaced.pop(child, {}).values())
+        else:
+            end: int = self._ends[node]
+            self._dead[node + 1 : end] = b"\x01" * (end - node - 1)
+
+
+class NodePaths(Sequence[Path]):
+    # Search results as node ids, a path is only built for the match that is being shown.
+    def __init__(self, index: SearchIndex, nodes: List[int]) -> None:
+        self._index: SearchIndex = index
+        self._nodes: List[int] = nodes
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __getitem__(self, i: int) -> Path:  # type: ignore[override]
+        return self._index.path(self._nodes[i])
@@ -1,6 +1,10 @@
-from typing import TYPE_CHECKING
+import threading
+import time
+from typing import TYPE_CHECKING, List, Tuple, Union
 from PyQt6 import QtCore
 
+from helper import LoadCancelled
+from ngram_index import NgramIndex
 from signals import SearchSignals
 
 if TYPE_CHECKING:
@@ -8,12 +12,61 @@ if TYPE_CHECKING:
 
 
 class SearchWorker(QtCore.QRunnable):
-    def __init__(self, manager: "JsonManager", term: str):
+    # Nodes between cancel checks and progress updates.
+    HEARTBEAT = 4096
+    # Matches are sent in batches at most this often, the first one is sent right away.
+    BATCH_INTERVAL = 0.1
+    PROGRESS_MAX = 1000
+
+    def __init__(self, manager: "JsonManager", term: str, mode: str = NgramIndex.EXACT, parallel: bool = False):
         super().__init__()
         self.signals = SearchSignals()
         self.manager: "JsonManager" = manager
         self.term: str = term
+        self.mode: str = mode
+        self.parallel: bool = parallel
+        self._cancel_event = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancel_event.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
 
     def run(self) -> None:
-        matches = self.manager.find_paths_in_data(self.term)
-        self.signals.finished.emit(matches)
+        batch: List[Tuple[Union[str, int], ...]] = []
+        sent_any: bool = False
+        last_sent: float = time.monotonic()
+        if self.parallel:
+            items = self.manager.iter_paths_parallel(self.term, self.mode, self._cancel_event.is_set)
+        else:
+            items = self.manager.iter_paths_in_data(self.term, mode=self.mode, heartbeat=self.HEARTBEAT)
+        try:
+            for item in items:
+                if self._cancel_event.is_set():
+                    return
+                if not isinstance(item, tuple):
+                    # Heartbeat, the fraction of the document searched so far.
+                    self.signals.progress.emit(int(item * self.PROGRESS_MAX))
+                    if batch and time.monotonic() - last_sent >= self.BATCH_INTERVAL:
+                        self.signals.found.emit(batch)
+                        batch, last_sent = [], time.monotonic()
+                    continue
+
+                batch.append(item[0])
+                if not sent_any:
+                    sent_any = True
+                    self.signals.found.emit(batch)
+                    batch, last_sent = [], time.monotonic()
+        except LoadCancelled:
+            return
+        except RuntimeError:
+            # The document may be replaced or edited while we walk it, that only matters if we're still wanted.
+            if self._cancel_event.is_set():
+                return
+            raise
+
+        if batch:
+            self.signals.found.emit(batch)
+        self.signals.progress.emit(self.PROGRESS_MAX)
+        self.signals.finished.emit()
@@ -1,10 +1,24 @@
+import os
 from typing import Any, Self, Type
-from PyQt6.QtCore import QSettings
+from PyQt6.QtCore import QSettings, QStandardPaths
 from vars import APPLICATION_NAME, APPLICATION_ORGANIZATION
 
 
 class Settings:
     MONITORING_KEY = "monitoring_enabled"
+    JSON_BACKEND_KEY = "json_backend"
+    INCREMENTAL_LOAD_KEY = "incremental_load"
+    LAZY_MODE_KEY = "lazy_mode"
+    PARALLEL_SEARCH_KEY = "parallel_search"
+    PARALLEL_SAVE_KEY = "parallel_save"
+    SPLICE_SAVE_KEY = "splice_save"
+    CHILD_CACHE_MB_KEY = "child_cache_mb"
+    DEFAULT_CHILD_CACHE_MB = 64
+    SNAPSHOT_CACHE_KEY = "snapshot_cache"
+    SNAPSHOT_CACHE_MB_KEY = "snapshot_cache_mb"
+    DEFAULT_SNAPSHOT_CACHE_MB = 1024
+    SAVE_INDENT_KEY = "save_indent"
+    DEFAULT_SAVE_INDENT = 4
 
     _settings: QSettings | None = None
 
@@ -57,8 +71,103 @@ class Settings:
 
     @classmethod
     def monitoring_enabled(cls) -> bool:
-        return bool(cls.get(cls.MONITORING_KEY, True).upper() == "TRUE")
+        return str(cls.get(cls.MONITORING_KEY, True)).upper() == "TRUE"
 
     @classmethod
     def set_monitoring_enabled(cls, enabled: bool):
         cls.set(cls.MONITORING_KEY, enabled)
+
+    @classmethod
+    def json_backend(cls) -> str:
+        return str(cls.get(cls.JSON_BACKEND_KEY, "auto"))
+
+    @classmethod
+    def set_json_backend(cls, name: str):
+        cls.set(cls.JSON_BACKEND_KEY, name)
+
+    @classmethod
+    def incremental_load_enabled(cls) -> bool:
+        return str(cls.get(cls.INCREMENTAL_LOAD_KEY, True)).upper() == "TRUE"
+
+    @classmethod
+    def set_incremental_load_enabled(cls, enabled: bool):
+        cls.set(cls.INCREMENTAL_LOAD_KEY, enabled)
+
+    @classmethod
+    def lazy_mode_enabled(cls) -> bool:
+        return str(cls.get(cls.LAZY_MODE_KEY, False)).upper() == "TRUE"
+
+    @classmethod
+    def set_lazy_mode_enabled(cls, enabled: bool):
+        cls.set(cls.LAZY_MODE_KEY, enabled)
+
+    @classmethod
+    def parallel_search_enabled(cls) -> bool:
+        return str(cls.get(cls.PARALLEL_SEARCH_KEY, True)).upper() == "TRUE"
+
+    @classmethod
+    def set_parallel_search_enabled(cls, enabled: bool):
+        cls.set(cls.PARALLEL_SEARCH_KEY, enabled)
+
+    @classmethod
+    def parallel_save_enabled(cls) -> bool:
+        return str(cls.get(cls.PARALLEL_SAVE_KEY, True)).upper() == "TRUE"
+
+    @classmethod
+    def set_parallel_save_enabled(cls, enabled: bool):
+        cls.set(cls.PARALLEL_SAVE_KEY, enabled)
+
+    @classmethod
+    def splice_save_enabled(cls) -> bool:
+        return str(cls.get(cls.SPLICE_SAVE_KEY, True)).upper() == "TRUE"
+
+    @classmethod
+    def set_splice_save_enabled(cls, enabled: bool):
+        cls.set(cls.SPLICE_SAVE_KEY, enabled)
+
+    @classmethod
+    def child_cache_mb(cls) -> int:
+        try:
+            return max(1, int(cls.get(cls.CHILD_CACHE_MB_KEY, cls.DEFAULT_CHILD_CACHE_MB)))
+        except (TypeError, ValueError):
+            return cls.DEFAULT_CHILD_CACHE_MB
+
+    @classmethod
+    def set_child_cache_mb(cls, size: int):
+        cls.set(cls.CHILD_CACHE_MB_KEY, size)
+
+    @classmethod
+    def snapshot_cache_enabled(cls) -> bool:
+        return str(cls.get(cls.SNAPSHOT_CACHE_KEY, True)).upper() == "TRUE"
+
+    @classmethod
+    def set_snapshot_cache_enabled(cls, enabled: bool):
+        cls.set(cls.SNAPSHOT_CACHE_KEY, enabled)
+
+    @classmethod
+    def snapshot_cache_mb(cls) -> int:
+        try:
+            return max(1, int(cls.get(cls.SNAPSHOT_CACHE_MB_KEY, cls.DEFAULT_SNAPSHOT_CACHE_MB)))
+        except (TypeError, ValueError):
+            return cls.DEFAULT_SNAPSHOT_CACHE_MB
+
+    @classmethod
+    def set_snapshot_cache_mb(cls, size: int):
+        cls.set(cls.SNAPSHOT_CACHE_MB_KEY, size)
+
+    @classmethod
+    def snapshot_dir(cls) -> str:
+        cache: str = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.CacheLocation)
+        return os.path.join(cache, "snapshots")
+
+    @classmethod
+    def save_indent(cls) -> int | None:
+        # Spaces per level, 0 for compact output.
+        try:
+            return int(cls.get(cls.SAVE_INDENT_KEY, cls.DEFAULT_SAVE_INDENT)) or None
+        except (TypeError, ValueError):
+            return cls.DEFAULT_SAVE_INDENT
+
+    @classmethod
+    def set_save_indent(cls, indent: int):
+        cls.set(cls.SAVE_INDENT_KEY, indent)
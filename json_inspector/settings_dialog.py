@@ -1,7 +1,18 @@
 from typing import TYPE_CHECKING, Type
-from PyQt6.QtWidgets import QCheckBox, QDialog, QHBoxLayout, QPushButton, QVBoxLayout, QWidget
+from PyQt6.QtWidgets import (
+    QCheckBox,
+    QComboBox,
+    QDialog,
+    QHBoxLayout,
+    QLabel,
+    QPushButton,
+    QSpinBox,
+    QVBoxLayout,
+    QWidget,
+)
 
 from helper import OSHelper
+from json_backend import JsonBackends
 from settings import Settings
 
 if TYPE_CHECKING:
@@ -20,6 +31,15 @@ class SettingsDialog(QDialog):
         layout = QVBoxLayout(self)
         row_one = QHBoxLayout()
         row_two = QHBoxLayout()
+        row_three = QHBoxLayout()
+        row_four = QHBoxLayout()
+        row_five = QHBoxLayout()
+        row_six = QHBoxLayout()
+        row_seven = QHBoxLayout()
+        row_eight = QHBoxLayout()
+        row_nine = QHBoxLayout()
+        row_ten = QHBoxLayout()
+        row_eleven = QHBoxLayout()
 
         self.json_file_association_checkbox = QCheckBox("Associate .json files with this app", self)
         self.json_file_association_checkbox.setChecked(OSHelper.is_association_registered())
@@ -33,8 +53,91 @@ class SettingsDialog(QDialog):
 
         row_two.addWidget(self.monitoring_checkbox)
 
+        self.json_backend_combo = QComboBox(self)
+        self.json_backend_combo.addItems([JsonBackends.AUTO] + JsonBackends.names())  # type: ignore
+        self.json_backend_combo.setCurrentText(self.settings.json_backend())
+        self.json_backend_combo.currentTextChanged.connect(self._on_json_backend_change)  # type: ignore
+
+        row_three.addWidget(QLabel("JSON backend:", self))
+        row_three.addWidget(self.json_backend_combo)
+
+        self.incremental_load_checkbox = QCheckBox("Show structure while loading large files with the json backend", self)
+        self.incremental_load_checkbox.setChecked(self.settings.incremental_load_enabled())
+        self.incremental_load_checkbox.toggled.connect(self.settings.set_incremental_load_enabled)  # type: ignore
+
+        row_four.addWidget(self.incremental_load_checkbox)
+
+        self.lazy_mode_checkbox = QCheckBox("Low memory mode (read files on demand, applies on next open)", self)
+        self.lazy_mode_checkbox.setChecked(self.settings.lazy_mode_enabled())
+        self.lazy_mode_checkbox.toggled.connect(self.settings.set_lazy_mode_enabled)  # type: ignore
+
+        row_five.addWidget(self.lazy_mode_checkbox)
+
+        self.parallel_search_checkbox = QCheckBox("Use all processor cores when searching in low memory mode", self)
+        self.parallel_search_checkbox.setChecked(self.settings.parallel_search_enabled())
+        self.parallel_search_checkbox.setEnabled(self.manager.parallel_search.available)
+        self.parallel_search_checkbox.toggled.connect(self.settings.set_parallel_search_enabled)  # type: ignore
+
+        row_six.addWidget(self.parallel_search_checkbox)
+
+        self.parallel_save_checkbox = QCheckBox("Use all processor cores when saving indented files", self)
+        self.parallel_save_checkbox.setChecked(self.settings.parallel_save_enabled())
+        self.parallel_save_checkbox.setEnabled(self.manager.parallel_encoder.available)
+        self.parallel_save_checkbox.toggled.connect(self.settings.set_parallel_save_enabled)  # type: ignore
+
+        row_nine.addWidget(self.parallel_save_checkbox)
+
+        self.splice_save_checkbox = QCheckBox("Only rewrite edited values when saving uncompressed files", self)
+        self.splice_save_checkbox.setChecked(self.settings.splice_save_enabled())
+        self.splice_save_checkbox.toggled.connect(self.settings.set_splice_save_enabled)  # type: ignore
+
+        row_ten.addWidget(self.splice_save_checkbox)
+
+        self.snapshot_cache_checkbox = QCheckBox("Keep parsed files for faster reopening, up to", self)
+        self.snapshot_cache_checkbox.setChecked(self.settings.snapshot_cache_enabled())
+        self.snapshot_cache_checkbox.toggled.connect(self.settings.set_snapshot_cache_enabled)  # type: ignore
+
+        self.snapshot_cache_spin = QSpinBox(self)
+        self.snapshot_cache_spin.setRange(1, 1024 * 1024)
+        self.snapshot_cache_spin.setSuffix(" MB")
+        self.snapshot_cache_spin.setValue(self.settings.snapshot_cache_mb())
+        self.snapshot_cache_spin.valueChanged.connect(self._on_snapshot_cache_change)  # type: ignore
+
+        row_eleven.addWidget(self.snapshot_cache_checkbox)
+        row_eleven.addWidget(self.snapshot_cache_spin)
+
+        self.child_cache_spin = QSpinBox(self)
+        self.child_cache_spin.setRange(1, 4096)
+        self.child_cache_spin.setSuffix(" MB")
+        self.child_cache_spin.setValue(self.settings.child_cache_mb())
+        self.child_cache_spin.valueChanged.connect(self._on_child_cache_change)  # type: ignore
+
+        row_seven.addWidget(QLabel("Tree row cache:", self))
+        row_seven.addWidget(self.child_cache_spin)
+
+        self.save_format_combo = QComboBox(self)
+        for label, indent in (("Indented (4 spaces)", 4), ("Indented (2 spaces)", 2), ("Compact", 0)):
+            self.save_format_combo.addItem(label, indent)
+        current: int = self.save_format_combo.findData(self.settings.save_indent() or 0)
+        self.save_format_combo.setCurrentIndex(max(0, current))
+        self.save_format_combo.currentIndexChanged.connect(  # type: ignore
+            lambda _index: self.settings.set_save_indent(self.save_format_combo.currentData())  # type: ignore
+        )
+
+        row_eight.addWidget(QLabel("Save format:", self))
+        row_eight.addWidget(self.save_format_combo)
+
         layout.addLayout(row_one)
         layout.addLayout(row_two)
+        layout.addLayout(row_three)
+        layout.addLayout(row_four)
+        layout.addLayout(row_five)
+        layout.addLayout(row_six)
+        layout.addLayout(row_seven)
+        layout.addLayout(row_eight)
+        layout.addLayout(row_nine)
+        layout.addLayout(row_ten)
+        layout.addLayout(row_eleven)
 
         btn_close = QPushButton("Close", self)
         btn_close.clicked.connect(self.accept)  # type: ignore
@@ -47,6 +150,18 @@ class SettingsDialog(QDialog):
         else:
             self.manager.stop_monitoring()
 
+    def _on_json_backend_change(self, name: str) -> None:
+        self.settings.set_json_backend(name)
+        JsonBackends.prefer(name)
+
+    def _on_child_cache_change(self, size: int) -> None:
+        self.settings.set_child_cache_mb(size)
+        self.manager.gui.tree_model.cache.set_budget(size * 1024 * 1024)
+
+    def _on_snapshot_cache_change(self, size: int) -> None:
+        self.settings.set_snapshot_cache_mb(size)
+        self.manager.snapshots.set_budget(size * 1024 * 1024)
+
     def _on_association_toggle(self, checked: bool) -> None:
         if checked:
             OSHelper.register_association()
@@ -10,4 +10,29 @@ class WorkerSignals(QtCore.QObject):
 
 
 class SearchSignals(QtCore.QObject):
-    finished = QtCore.pyqtSignal(list)
+    found = QtCore.pyqtSignal(list)
+    progress = QtCore.pyqtSignal(int)
+    finished = QtCore.pyqtSignal()
+
+
+class LoadSignals(QtCore.QObject):
+    progress = QtCore.pyqtSignal(object, object)
+    outline = QtCore.pyqtSignal(str, list, int)
+    finished = QtCore.pyqtSignal(object)
+    failed = QtCore.pyqtSignal(object)
+    cancelled = QtCore.pyqtSignal()
+
+
+class IndexSignals(QtCore.QObject):
+    finished = QtCore.pyqtSignal(object)
+
+
+class StatsSignals(QtCore.QObject):
+    finished = QtCore.pyqtSignal(object)
+
+
+class SaveSignals(QtCore.QObject):
+    progress = QtCore.pyqtSignal(object, object)
+    finished = QtCore.pyqtSignal()
+    failed = QtCore.pyqtSignal(object)
+    cancelled = QtCore.pyqtSignal()
@@ -0,0 +1,185 @@
+import gc
+import hashlib
+import marshal
+import os
+import struct
+import sys
+import tempfile
+from typing import Any, Callable, List, Tuple
+
+from helper import LoadCancelled
+from splice_writer import FileStamp, SpliceWriter
+
+
+class SnapshotUnavailable(Exception):
+    pass
+
+
+class SnapshotCache:
+    # Parsed documents in marshal format, one file per source path. Marshal writes builtin containers and scalars
+    # with no per-object bookkeeping and reads them back faster than any JSON parser, and keys that orjson
+    # shared while parsing are written once. A snapshot is only used when the source still has the size and
+    # mtime it had when it was parsed and its content hash still matches, files are evicted least recently used
+    # first once the directory passes the budget.
+    DEFAULT_BUDGET = 1024 * 1024 * 1024
+    SUFFIX = ".snapshot"
+    MAGIC = b"JISNAP1\n"
+    # Marshal's format may change between Python versions, snapshots of another one are ignored.
+    FORMAT = f"{sys.implementation.cache_tag}-{marshal.version}"
+    HASH_CHUNK = 8 * 1024 * 1024
+    _HEADER_SIZE = struct.Struct("<I")
+
+    def __init__(self, directory: str, budget: int = DEFAULT_BUDGET) -> None:
+        self.directory: str = directory
+        self.budget: int = budget
+
+    def set_budget(self, budget: int) -> None:
+        self.budget = budget
+        self._evict()
+
+    def file_for(self, path: str) -> str:
+        key: str = hashlib.sha256(os.path.realpath(path).encode("utf-8", "surrogateescape")).hexdigest()
+        return os.path.join(self.directory, key[:32] + self.SUFFIX)
+
+    @classmethod
+    def digest(
+        cls,
+        path: str,
+        progress: Callable[[int, int], None] | None = None,
+        is_cancelled: Callable[[], bool] | None = None,
+    ) -> bytes:
+        # Of the bytes on disk, compressed files are not decompressed to check them.
+        sha = hashlib.sha256()
+        with open(path, "rb", buffering=0) as f:
+            total: int = os.fstat(f.fileno()).st_size
+            done: int = 0
+            while chunk := f.read(cls.HASH_CHUNK):
+                if is_cancelled is not None and is_cancelled():
+                    raise LoadCancelled(path)
+                sha.update(chunk)
+                done += len(chunk)
+                if progress is not None:
+                    progress(done, total)
+        return sha.digest()
+
+    def load(
+        self,
+        path: str,
+        stamp: FileStamp,
+        progress: Callable[[int, int], None] | None = None,
+        is_cancelled: Callable[[], bool] | None = None,
+    ) -> Any:
+        # stamp is the source's, taken before it was read. Raises SnapshotUnavailable when there is no snapshot
+        # of exactly this content, a stale one is removed.
+        snapshot: str = self.file_for(path)
+        try:
+            with open(snapshot, "rb") as f:
+                header: Tuple[str, str, int, int, bytes, int] = self._read_header(f)
+                if header[:4] != (self.FORMAT, os.path.realpath(path), *stamp):
+                    raise SnapshotUnavailable(path)
+                if header[4] != self.digest(path, progress, is_cancelled):
+                    raise SnapshotUnavailable(path)
+                body: bytes = f.read()
+            if len(body) != header[5]:
+                raise SnapshotUnavailable(path)
+            data: Any = self._unmarshal(body)
+            os.utime(snapshot)
+        except FileNotFoundError as e:
+            raise SnapshotUnavailable(path) from e
+        except SnapshotUnavailable:
+            self._remove(snapshot)
+            raise
+        except (OSError, ValueError, EOFError, TypeError, struct.error) as e:
+            self._remove(snapshot)
+            raise SnapshotUnavailable(path) from e
+        if SpliceWriter.stamp(path) != stamp:
+            # Written to while it was hashed.
+            raise SnapshotUnavailable(path)
+        return data
+
+    def store(self, path: str, stamp: FileStamp, data: Any, is_cancelled: Callable[[], bool] | None = None) -> bool:
+        # Best effort, a snapshot that can't be written is simply not there next time. The source is hashed
+        # again after parsing, so it has to still match stamp afterwards or the hash may not be of what was parsed.
+        try:
+            if SpliceWriter.stamp(path) != stamp:
+                return False
+            body: bytes = marshal.dumps(data)
+            if len(body) > self.budget:
+                return False
+            digest: bytes = self.digest(path, is_cancelled=is_cancelled)
+            if SpliceWriter.stamp(path) != stamp:
+                return False
+            header: bytes = marshal.dumps((self.FORMAT, os.path.realpath(path), *stamp, digest, len(body)))
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(self.MAGIC + self._HEADER_SIZE.pack(len(header)) + header)
+                    f.write(body)
+                os.replace(tmp, self.file_for(path))
+            except BaseException:
+                self._remove(tmp)
+                raise
+        except (OSError, ValueError, LoadCancelled):
+            return False
+        self._evict()
+        return True
+
+    def discard(self, path: str) -> None:
+        self._remove(self.file_for(path))
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _read_header(self, f: Any) -> Tuple[str, str, int, int, bytes, int]:
+        start: bytes = f.read(len(self.MAGIC) + self._HEADER_SIZE.size)
+        if not start.startswith(self.MAGIC):
+            raise ValueError("not a snapshot")
+        (length,) = self._HEADER_SIZE.unpack(start[len(self.MAGIC) :])
+        header: Any = marshal.loads(f.read(length))
+        if not isinstance(header, tuple) or len(header) != 6:  # type: ignore[arg-type]
+            raise ValueError("not a snapshot")
+        return header  # type: ignore[return-value]
+
+    @staticmethod
+    def _unmarshal(body: bytes) -> Any:
+        # Millions of new containers would set off a collection over and over while none of them can be garbage.
+        enabled: bool = gc.isenabled()
+        gc.disable()
+        try:
+            return marshal.loads(body)
+        finally:
+            if enabled:
+                gc.enable()
+
+    def _entries(self) -> List[Tuple[str, int, float]]:
+        # Path, size and last use of every snapshot, loading one touches its mtime.
+        entries: List[Tuple[str, int, float]] = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith(self.SUFFIX):
+                        try:
+                            stat: os.stat_result = entry.stat()
+                        except OSError:
+                            continue
+                        entries.append((entry.path, stat.st_size, stat.st_mtime))
+        except OSError:
+            pass
+        return entries
+
+    def _evict(self) -> None:
+        entries: List[Tuple[str, int, float]] = sorted(self._entries(), key=lambda entry: entry[2])
+        total: int = sum(size for _, size, _ in entries)
+        for snapshot, size, _ in entries:
+            if total <= self.budget:
+                break
+            self._remove(snapshot)
+            total -= size
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
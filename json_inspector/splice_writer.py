@@ -0,0 +1,151 @@
+import json
+import mmap
+import os
+from typing import IO, Any, Callable, Dict, List, Tuple, Union
+
+from document_writer import DocumentWriter, SaveCancelled
+from json_backend import JsonBackends
+from lazy_document import LazyDocument
+
+Path = Tuple[Union[str, int], ...]
+# Size and mtime of a file, as os.stat reports them.
+FileStamp = Tuple[int, int]
+
+
+class SpliceUnavailable(Exception):
+    pass
+
+
+class SpliceWriter:
+    # Saves edits by copying the original file around them: every edited value's bytes are replaced by its new
+    # encoding and everything in between is copied as is, formatting included. The copies are done by the kernel
+    # where it can (copy_file_range, a clone on file systems with reflinks), only the fragments go through Python.
+    COPY_CHUNK = 8 * 1024 * 1024
+
+    def __init__(
+        self,
+        source: str,
+        stamp: FileStamp,
+        edits: Dict[Path, Any],
+        indent: int | None = 4,
+        document: LazyDocument | None = None,
+    ) -> None:
+        self.source: str = source
+        self._stamp: FileStamp = stamp
+        # Edits inside another edited value are part of that one's encoding.
+        paths: List[Path] = sorted(edits, key=len)
+        kept: Dict[Path, Any] = {}
+        for path in paths:
+            if not any(path[: len(other)] == other for other in kept):
+                kept[path] = edits[path]
+        self._edits: Dict[Path, Any] = kept
+        self._indent: int | None = indent or None
+        # The lazy document's offset index, when it was built from this very file, saves scanning for brackets.
+        self._document: LazyDocument | None = document
+
+    @staticmethod
+    def stamp(path: str) -> FileStamp:
+        stat: os.stat_result = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
+
+    def write(
+        self,
+        path: str,
+        progress: Callable[[int, int], None] | None = None,
+        is_cancelled: Callable[[], bool] | None = None,
+    ) -> None:
+        with open(self.source, "rb") as src:
+            stat: os.stat_result = os.fstat(src.fileno())
+            if (stat.st_size, stat.st_mtime_ns) != self._stamp or not stat.st_size:
+                raise SpliceUnavailable(f"{self.source} changed since it was loaded")
+            with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                try:
+                    spans: List[Tuple[int, int, bytes]] = self.spans(buf)
+                except json.JSONDecodeError as e:
+                    raise SpliceUnavailable(str(e)) from e
+
+                def _fill(out: IO[bytes]) -> None:
+                    pos: int = 0
+                    for start, end, fragment in spans:
+                        self._copy(src.fileno(), buf, out, pos, start, progress, is_cancelled)
+                        out.write(fragment)
+                        pos = end
+                    self._copy(src.fileno(), buf, out, pos, len(buf), progress, is_cancelled)
+
+                DocumentWriter.write_atomically(path, _fill)
+
+    def spans(self, buf: Any) -> List[Tuple[int, int, bytes]]:
+        # Start, end and new bytes of every edited value, in file order.
+        end_of: Callable[[int], int] = (
+            self._document.end_of if self._document is not None else lambda start: LazyDocument.scan_end(buf, start)
+        )
+        root: int = LazyDocument.SEPARATORS.match(buf, 0).end()  # type: ignore
+        indent: int | None = self._file_indent(buf, root)
+        spans: List[Tuple[int, int, bytes]] = []
+        for path, value in self._edits.items():
+            start: int = self._locate(buf, root, path, end_of)
+            end: int = LazyDocument.value_end(buf, start, end_of)
+            fragment: bytes = JsonBackends.dumps(value, indent)
+            if b"\n" in fragment:
+                fragment = fragment.replace(b"\n", b"\n" + self._line_indent(buf, start))
+            spans.append((start, end, fragment))
+        spans.sort()
+        return spans
+
+    @staticmethod
+    def _locate(buf: Any, root: int, path: Path, end_of: Callable[[int], int]) -> int:
+        pos: int = root
+        for key in path:
+            if pos >= len(buf) or buf[pos] not in b"[{":
+                raise SpliceUnavailable(f"{path} is not in the file")
+            for child, start in LazyDocument.children_of(buf, pos, end_of):
+                if child == key:
+                    pos = start
+                    break
+            else:
+                raise SpliceUnavailable(f"{path} is not in the file")
+        return pos
+
+    def _file_indent(self, buf: Any, root: int) -> int | None:
+        # The step the file is indented with, read from the first entry of the root. One line files stay compact.
+        if root >= len(buf) or buf[root] not in b"[{":
+            return self._indent
+        first: int = LazyDocument.SEPARATORS.match(buf, root + 1).end()  # type: ignore
+        between: bytes = bytes(buf[root + 1 : first])
+        if b"\n" not in between:
+            return None if first < len(buf) and buf[first] not in b"]}" else self._indent
+        step: bytes = between[between.rindex(b"\n") + 1 :]
+        return len(step) if step and not step.strip(b" ") else self._indent
+
+    @staticmethod
+    def _line_indent(buf: Any, start: int) -> bytes:
+        line: int = buf.rfind(b"\n", 0, start) + 1
+        text: bytes = bytes(buf[line:start])
+        return text[: len(text) - len(text.lstrip(b" \t"))]
+
+    def _copy(
+        self,
+        src: int,
+        buf: Any,
+        out: IO[bytes],
+        start: int,
+        end: int,
+        progress: Callable[[int, int], None] | None,
+        is_cancelled: Callable[[], bool] | None,
+    ) -> None:
+        while start < end:
+            if is_cancelled is not None and is_cancelled():
+                raise SaveCancelled()
+            count: int = min(self.COPY_CHUNK, end - start)
+            out.flush()
+            try:
+                copied: int = os.copy_file_range(src, out.fileno(), count, start)  # type: ignore[attr-defined]
+            except (AttributeError, OSError):
+                copied = 0
+            if copied <= 0:
+                # Not Linux, or a pair of file systems the kernel can't copy between.
+                out.write(buf[start : start + count])
+                copied = count
+            start += copied
+            if progress is not None:
+                progress(start, len(buf))
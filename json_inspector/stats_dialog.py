@@ -0,0 +1,93 @@
+from typing import Any, Callable, List, Sequence, Tuple, Union
+from PyQt6 import QtWidgets, QtCore
+
+from document_stats import DocumentStats
+from helper import Helper
+from json_pointer import JsonPointer
+
+Path = Tuple[Union[str, int], ...]
+
+
+class _SortItem(QtWidgets.QTableWidgetItem):
+    # Shown formatted, sorted by the number behind it.
+    def __init__(self, text: str, value: int) -> None:
+        super().__init__(text)
+        self.setData(QtCore.Qt.ItemDataRole.UserRole, value)
+        self.setTextAlignment(QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter)
+
+    def __lt__(self, other: QtWidgets.QTableWidgetItem) -> bool:
+        return self.data(QtCore.Qt.ItemDataRole.UserRole) < other.data(QtCore.Qt.ItemDataRole.UserRole)
+
+
+class StatsDialog(QtWidgets.QDialog):
+    def __init__(
+        self, stats: DocumentStats, go_to: Callable[[Path], Any], parent: QtWidgets.QWidget | None = None
+    ) -> None:
+        super().__init__(parent)
+        self.setWindowTitle("Statistics")
+        self.setMinimumSize(600, 500)
+        self._go_to = go_to
+
+        layout = QtWidgets.QVBoxLayout(self)
+
+        summary = QtWidgets.QFormLayout()
+        summary.addRow("Nodes:", QtWidgets.QLabel(f"{stats.node_count:,}", self))
+        summary.addRow("Maximum depth:", QtWidgets.QLabel(f"{stats.max_depth:,}", self))
+        summary.addRow("Distinct keys:", QtWidgets.QLabel(f"{sum(1 for c in stats.key_counts.values() if c):,}", self))
+        layout.addLayout(summary)
+
+        tabs = QtWidgets.QTabWidget(self)
+        tabs.addTab(self._heaviest_table(stats), "Heaviest subtrees")
+        tabs.addTab(self._table(("Type", "Count"), stats.type_counts), "Types")
+        tabs.addTab(self._table(("Key", "Count"), stats.common_keys()), "Keys")
+        tabs.addTab(self._path_table(("Path", "Size"), stats.largest_containers()), "Largest containers")
+        tabs.addTab(self._path_table(("Path", "Length"), stats.longest_strings()), "Longest strings")
+        layout.addWidget(tabs)
+
+        btn_box = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.StandardButton.Ok, self)
+        btn_box.accepted.connect(self.accept)  # type: ignore
+        layout.addWidget(btn_box)
+
+    def _table(self, headers: Sequence[str], rows: Sequence[Tuple[Any, int]]) -> QtWidgets.QTableWidget:
+        table = QtWidgets.QTableWidget(len(rows), len(headers), self)
+        table.setHorizontalHeaderLabels(headers)  # type: ignore
+        table.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
+        table.horizontalHeader().setSectionResizeMode(0, QtWidgets.QHeaderView.ResizeMode.Stretch)  # type: ignore
+        table.verticalHeader().setVisible(False)  # type: ignore
+        for row, (label, count) in enumerate(rows):
+            table.setItem(row, 0, QtWidgets.QTableWidgetItem(str(label)))
+            count_item = QtWidgets.QTableWidgetItem(f"{count:,}")
+            count_item.setTextAlignment(QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter)
+            table.setItem(row, 1, count_item)
+        return table
+
+    def _heaviest_table(self, stats: DocumentStats) -> QtWidgets.QTableWidget:
+        rows = stats.heaviest_subtrees()
+        table = QtWidgets.QTableWidget(len(rows), 4, self)
+        table.setHorizontalHeaderLabels(("Path", "Descendants", "JSON size", "Memory"))  # type: ignore
+        table.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
+        table.horizontalHeader().setSectionResizeMode(0, QtWidgets.QHeaderView.ResizeMode.Stretch)  # type: ignore
+        table.verticalHeader().setVisible(False)  # type: ignore
+        table.setToolTip("Double click to go to the path, JSON sizes are estimated for compact output")
+        for row, (path, (descendants, json_size, memory)) in enumerate(rows):
+            path_item = QtWidgets.QTableWidgetItem(JsonPointer.format(path) or "/")
+            path_item.setData(QtCore.Qt.ItemDataRole.UserRole, path)
+            table.setItem(row, 0, path_item)
+            table.setItem(row, 1, _SortItem(f"{descendants:,}", descendants))
+            table.setItem(row, 2, _SortItem(Helper.human_size(json_size), json_size))
+            table.setItem(row, 3, _SortItem(Helper.human_size(memory), memory))
+        table.setSortingEnabled(True)
+        table.sortItems(2, QtCore.Qt.SortOrder.DescendingOrder)
+        table.cellDoubleClicked.connect(  # type: ignore
+            lambda row, _col: self._go_to(tuple(table.item(row, 0).data(QtCore.Qt.ItemDataRole.UserRole)))  # type: ignore
+        )
+        return table
+
+    def _path_table(self, headers: Sequence[str], rows: List[Tuple[int, Path]]) -> QtWidgets.QTableWidget:
+        table = self._table(headers, [(JsonPointer.format(path) or "/", size) for size, path in rows])
+        table.setToolTip("Double click to go to the path")
+        paths: List[Path] = [path for _, path in rows]
+        table.cellDoubleClicked.connect(lambda row, _column: self._go_to(paths[row]))  # type: ignore
+        return table
@@ -0,0 +1,30 @@
+import threading
+from typing import Any
+from PyQt6 import QtCore
+
+from signals import StatsSignals
+from helper import LoadCancelled
+from document_stats import DocumentStats
+
+
+class StatsWorker(QtCore.QRunnable):
+    def __init__(self, data: Any):
+        super().__init__()
+        self.signals = StatsSignals()
+        self.data: Any = data
+        self._cancel_event = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancel_event.set()
+
+    def run(self) -> None:
+        try:
+            stats = DocumentStats.build(self.data, self._cancel_event.is_set)
+        except LoadCancelled:
+            return
+        except RuntimeError:
+            # Edits and clearing change the document in place, only a problem if we're still wanted.
+            if self._cancel_event.is_set():
+                return
+            raise
+        self.signals.finished.emit(stats)
@@ -0,0 +1,655 @@
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Set, Tuple, Union
+from PyQt6 import QtCore, QtGui
+
+from document_diff import DocumentDiff
+from document_stats import DocumentStats, Subtree
+from helper import Helper
+from item_cache import ItemCache
+from load_children_worker import LoadChildrenWorker
+from preview import Preview
+
+PreparedItem = Tuple[Union[str, int], str, str, bool]
+Path = Tuple[Union[str, int], ...]
+
+_UNSET: Any = object()
+
+
+class LazyItems(Sequence[PreparedItem]):
+    # Children of a node that was jumped through, only the rows that are looked at get prepared so a jump costs
+    # the depth of the path rather than the size of every container along it.
+    def __init__(self, obj: Any) -> None:
+        self._obj: Any = obj
+        # Rows of a dict or set follow its iteration order, listing the keys is cheap next to preparing items.
+        self._keys: List[Any] | None = None if isinstance(obj, (list, tuple)) else list(obj)
+        self._items: Dict[int, PreparedItem] = {}
+        self._rows: Dict[Any, int] | None = None
+
+    def __len__(self) -> int:
+        return len(self._obj) if self._keys is None else len(self._keys)
+
+    def __getitem__(self, row: int) -> PreparedItem:  # type: ignore[override]
+        item: PreparedItem | None = self._items.get(row)
+        if item is None:
+            if self._keys is None:
+                item = Helper.prepare_item(row, self._obj[row])
+            elif isinstance(self._obj, dict):
+                key: Any = self._keys[row]
+                item = Helper.prepare_item(key, self._obj[key])  # type: ignore[index]
+            else:
+                item = Helper.prepare_item(row, self._keys[row])
+            self._items[row] = item
+        return item
+
+    def __setitem__(self, row: int, item: PreparedItem) -> None:
+        self._items[row] = item
+
+    def row_for_key(self, key: Union[str, int]) -> int:
+        if not isinstance(self._obj, dict):
+            return key if isinstance(key, int) and 0 <= key < len(self) else -1
+        if self._rows is None:
+            self._rows = {k: row for row, k in enumerate(self._keys)}  # type: ignore[arg-type]
+        return self._rows.get(key, -1)
+
+
+class TreeNode:
+    # The prepared (key, type, displayed, is_container) tuple lives in the parent's child list, a node only
+    # exists for rows the view has actually asked for. Rows are child positions, the view only shows the window
+    # first..fetched of them, behind a placeholder row when rows before it are hidden after a jump.
+    __slots__ = ("parent", "row", "children", "rows", "nodes", "first", "fetched", "gap", "loading", "label", "_value")
+
+    def __init__(self, parent: "TreeNode | None", row: int) -> None:
+        self.parent: TreeNode | None = parent
+        self.row: int = row
+        self.children: List[PreparedItem] | LazyItems | None = None
+        # Key to row for dict children, built on the first lookup.
+        self.rows: Dict[Union[str, int], int] | None = None
+        self.nodes: Dict[int, TreeNode] = {}
+        self.first: int = 0
+        self.fetched: int = 0
+        self.gap: bool = False
+        self.loading: bool = False
+        self.label: str | None = None
+        self._value: Any = _UNSET
+
+    @property
+    def item(self) -> PreparedItem:
+        if self.row < 0:
+            return (f"… {self.parent.first:,} earlier items", "", "", False)  # type: ignore[union-attr]
+        return self.parent.children[self.row]  # type: ignore
+
+    @property
+    def is_placeholder(self) -> bool:
+        return self.row < 0
+
+    @property
+    def view_row(self) -> int:
+        parent: TreeNode = self.parent  # type: ignore[assignment]
+        if self.row < 0:
+            return 0
+        return self.row - parent.first + parent.gap
+
+    @property
+    def row_count(self) -> int:
+        return self.fetched - self.first + self.gap
+
+    @property
+    def key(self) -> Union[str, int]:
+        return self.item[0]
+
+    @property
+    def type_name(self) -> str:
+        return self.item[1]
+
+    @property
+    def is_container(self) -> bool:
+        return self.item[3]
+
+    @property
+    def value(self) -> Any:
+        # Looked up in the parent's value with the typed key and kept, so reading it never walks from the root.
+        if self._value is _UNSET:
+            self._value = self.parent.value[self.key]  # type: ignore[union-attr]
+        return self._value
+
+    @value.setter
+    def value(self, value: Any) -> None:
+        self._value = value
+
+    def reset_value(self) -> None:
+        # Looked up again on the next read, the nodes below keep theirs.
+        self._value = _UNSET
+
+    def forget_value(self) -> None:
+        self.reset_value()
+        self.nodes = {}
+
+    @property
+    def path(self) -> Path:
+        keys: List[Union[str, int]] = []
+        node: TreeNode = self
+        # The top level "root" node is not part of the path.
+        while node.parent is not None and node.parent.parent is not None:
+            keys.append(node.key)
+            node = node.parent
+        return tuple(reversed(keys))
+
+    def child(self, row: int) -> "TreeNode":
+        node: TreeNode | None = self.nodes.get(row)
+        if node is None:
+            node = self.nodes[row] = TreeNode(self, row)
+        return node
+
+
+class JsonTreeModel(QtCore.QAbstractItemModel):
+    FETCH_BATCH = 500
+    # Something the user expanded goes ahead of running prefetches.
+    EXPAND_PRIORITY = 1
+    # Prefetch workers running at once, the rest wait in the queue where they can still be dropped.
+    PREFETCH_IN_FLIGHT = 2
+    HEADERS = ("Key", "Type")
+    # Backgrounds of the rows a reload changed or added, until the next reload.
+    MARK_COLORS = {"changed": "#fff4c2", "added": "#d8f5d0"}
+    # The view asks for these for every row it lays out, combining the enum members each time adds up.
+    _SELECTABLE = QtCore.Qt.ItemFlag.ItemIsEnabled | QtCore.Qt.ItemFlag.ItemIsSelectable
+    _ENABLED = QtCore.Qt.ItemFlag.ItemIsEnabled
+    _NO_FLAGS = QtCore.Qt.ItemFlag.NoItemFlags
+
+    def __init__(
+        self,
+        threadpool: QtCore.QThreadPool,
+        colors: Dict[str, str],
+        parent: QtCore.QObject | None = None,
+        cache_budget: int = ItemCache.DEFAULT_BUDGET,
+    ) -> None:
+        super().__init__(parent)
+        self._threadpool: QtCore.QThreadPool = threadpool
+        self._colors: Dict[str, str] = colors
+        self._brushes: Dict[str, QtGui.QBrush] = {}
+        self._cache: ItemCache = ItemCache(cache_budget)
+        self._active_workers: List[LoadChildrenWorker] = []
+        self._prefetch_queue: Dict[Path, TreeNode] = {}
+        self._prefetching: Dict[Path, LoadChildrenWorker] = {}
+        self._generation: int = 0
+        self._outline: bool = False
+        self._stats: DocumentStats | None = None
+        self._marks: Dict[Path, str] = {}
+        self._mark_brushes: Dict[str, QtGui.QBrush] = {
+            mark: QtGui.QBrush(QtGui.QColor(color)) for mark, color in self.MARK_COLORS.items()
+        }
+        self._invisible: TreeNode = TreeNode(None, 0)
+
+    def set_root(self, data: Any) -> None:
+        self.beginResetModel()
+        self._reset()
+        if data is not None:
+            self._invisible.children = [
+                ("root", Helper.type_name(data), "", isinstance(data, (dict, list, tuple, set)))
+            ]
+            self._invisible.fetched = 1
+            self._invisible.child(0).value = data
+        self.endResetModel()
+
+    def set_outline(self, root_type: str, entries: List[Tuple[Union[str, int], str, int | None]], more: int) -> None:
+        # Shown while a large file is still being parsed, nothing is selectable since there is no data yet.
+        self.beginResetModel()
+        self._reset()
+        self._outline = True
+        self._invisible.children = [("root", root_type, "", True)]
+        self._invisible.fetched = 1
+        root: TreeNode = self._invisible.child(0)
+        root.children = [(key, typ, "", False) for key, typ, _ in entries]
+        if more:
+            root.children.append((f"… {more:,} more", "", "", False))
+        root.fetched = len(root.children)
+        for row, (_, typ, size) in enumerate(entries):
+            if size is not None:
+                root.child(row).label = f"{typ} ({size:,})"
+        self.endResetModel()
+
+    def clear(self) -> None:
+        self.set_root(None)
+
+    @property
+    def cache(self) -> ItemCache:
+        return self._cache
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+
+    def set_stats(self, stats: DocumentStats | None) -> None:
+        # Subtree totals for the Type column, views have to repaint to show them.
+        self._stats = stats
+
+    def _reset(self) -> None:
+        # Workers that are still running deliver to nodes of the old tree, the generation lets us drop those.
+        self._generation += 1
+        self._outline = False
+        self._stats = None
+        self._marks = {}
+        self._prefetch_queue = {}
+        self._prefetching = {}
+        self._invisible = TreeNode(None, 0)
+
+    def root_index(self) -> QtCore.QModelIndex:
+        return self.index(0, 0) if self._invisible.fetched else QtCore.QModelIndex()
+
+    def node(self, index: QtCore.QModelIndex) -> TreeNode:
+        return index.internalPointer() if index.isValid() else self._invisible  # type: ignore
+
+    def index_for_node(self, node: TreeNode, column: int = 0) -> QtCore.QModelIndex:
+        if node is self._invisible:
+            return QtCore.QModelIndex()
+        return self.createIndex(node.view_row, column, node)
+
+    def index(self, row: int, column: int, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> QtCore.QModelIndex:
+        node: TreeNode = self.node(parent)
+        if row < 0 or row >= node.row_count or column < 0 or column >= len(self.HEADERS):
+            return QtCore.QModelIndex()
+        if node.gap:
+            return self.createIndex(row, column, node.child(node.first + row - 1 if row else -1))
+        return self.createIndex(row, column, node.child(node.first + row))
+
+    def parent(self, index: QtCore.QModelIndex = QtCore.QModelIndex()) -> QtCore.QModelIndex:  # type: ignore[override]
+        if not index.isValid():
+            return QtCore.QModelIndex()
+        node: TreeNode | None = self.node(index).parent
+        if node is None or node is self._invisible:
+            return QtCore.QModelIndex()
+        return self.createIndex(node.view_row, 0, node)
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        if parent.column() > 0:
+            return 0
+        return self.node(parent).row_count
+
+    def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return len(self.HEADERS)
+
+    def hasChildren(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> bool:
+        node: TreeNode = self.node(parent)
+        if node is self._invisible:
+            return node.fetched > 0
+        return node.is_container and (node.children is None or len(node.children) > 0)
+
+    def headerData(
+        self, section: int, orientation: QtCore.Qt.Orientation, role: int = QtCore.Qt.ItemDataRole.DisplayRole
+    ) -> Any:
+        if orientation == QtCore.Qt.Orientation.Horizontal and role == QtCore.Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def flags(self, index: QtCore.QModelIndex) -> QtCore.Qt.ItemFlag:
+        if not index.isValid():
+            return self._NO_FLAGS
+        if self._outline or index.internalPointer().row < 0:
+            return self._ENABLED
+        return self._SELECTABLE
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        node: TreeNode = self.node(index)
+        key, typ, displayed, is_cont = node.item
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            if index.column() == 0:
+                return str(key)
+            if node.label is not None:
+                return node.label
+            subtree = self._subtree(node) if is_cont else None
+            if subtree is not None:
+                return f"{typ} · {subtree[0]:,} · {Helper.human_size(subtree[1])}"
+            return typ
+        if role == QtCore.Qt.ItemDataRole.ToolTipRole and index.column() == 1 and is_cont:
+            subtree = self._subtree(node)
+            if subtree is not None:
+                return (
+                    f"{subtree[0]:,} descendants, about {Helper.human_size(subtree[1])} as compact JSON "
+                    f"and {Helper.human_size(subtree[2])} in memory"
+                )
+        if role == QtCore.Qt.ItemDataRole.ForegroundRole:
+            return self._brush(typ) if node.parent is not self._invisible else None
+        if role == QtCore.Qt.ItemDataRole.BackgroundRole and self._marks:
+            mark: str | None = self._marks.get(node.path)
+            return self._mark_brushes[mark] if mark is not None else None
+        if role == QtCore.Qt.ItemDataRole.UserRole:
+            return "" if is_cont else displayed
+        return None
+
+    def _subtree(self, node: TreeNode) -> Subtree | None:
+        if self._stats is None or self._outline:
+            return None
+        return self._stats.subtree(node.value)
+
+    def _brush(self, typ: str) -> QtGui.QBrush | None:
+        if typ not in self._colors:
+            return None
+        brush: QtGui.QBrush | None = self._brushes.get(typ)
+        if brush is None:
+            brush = self._brushes[typ] = QtGui.QBrush(QtGui.QColor(self._colors[typ]))
+        return brush
+
+    def canFetchMore(self, parent: QtCore.QModelIndex) -> bool:
+        node: TreeNode = self.node(parent)
+        if node is self._invisible or not node.is_container or self._outline:
+            return False
+        return node.children is None or node.fetched < len(node.children)
+
+    def fetchMore(self, parent: QtCore.QModelIndex) -> None:
+        node: TreeNode = self.node(parent)
+        if node is self._invisible or not node.is_container or self._outline:
+            return
+        if node.children is not None:
+            self._insert_batch(node, node.fetched + self.FETCH_BATCH)
+            return
+        if node.loading:
+            return
+
+        path: Path = node.path
+        node.loading = True
+        cached: List[PreparedItem] | None = self._cache.get(path)
+        if cached is not None:
+            self._on_children_loaded(node, cached, path)
+            return
+        self._prefetch_queue.pop(path, None)
+        if path in self._prefetching:
+            return  # delivered by the prefetch that is already running
+
+        worker = LoadChildrenWorker(node, node.value, path)
+        self._start(worker, self._on_children_loaded, self.EXPAND_PRIORITY)
+
+    def prepare_children(self, node: TreeNode) -> List[PreparedItem] | LazyItems:
+        # Synchronous variant of fetchMore used when jumping to a path, rows are prepared as they are shown.
+        if node.children is None:
+            path: Path = node.path
+            items: List[PreparedItem] | None = self._cache.get(path)
+            node.children = items if items is not None else LazyItems(node.value)
+            node.rows = None
+            node.loading = False
+        return node.children
+
+    def ensure_row(self, node: TreeNode, row: int) -> bool:
+        children: List[PreparedItem] | LazyItems = self.prepare_children(node)
+        if row < 0 or row >= len(children):
+            return False
+        if node.first <= row < node.fetched:
+            return True
+        # Rows close to the window are added to it, anything further replaces it. The view lays out every row it
+        # is given, so showing everything up to a far away row would cost the size of the container.
+        if node.fetched <= row < node.fetched + self.FETCH_BATCH:
+            self._insert_batch(node, node.fetched + self.FETCH_BATCH)
+        elif node.first - self.FETCH_BATCH <= row < node.first:
+            self.fetch_previous(node)
+        else:
+            self._show_window(node, max(0, row - self.FETCH_BATCH // 2))
+        return True
+
+    def fetch_previous(self, node: TreeNode) -> None:
+        # Shows the batch of rows before the window, the placeholder goes once they are all shown.
+        if not node.gap:
+            return
+        index: QtCore.QModelIndex = self.index_for_node(node)
+        first: int = max(0, node.first - self.FETCH_BATCH)
+        if first < node.first:
+            self.beginInsertRows(index, 1, node.first - first)
+            node.first = first
+            self.endInsertRows()
+        if first:
+            placeholder: QtCore.QModelIndex = self.index(0, 0, index)
+            self.dataChanged.emit(placeholder, placeholder)
+            return
+        self.beginRemoveRows(index, 0, 0)
+        node.gap = False
+        node.nodes.pop(-1, None)
+        self.endRemoveRows()
+
+    def _show_window(self, node: TreeNode, first: int) -> None:
+        assert node.children is not None
+        index: QtCore.QModelIndex = self.index_for_node(node)
+        if node.row_count:
+            self.beginRemoveRows(index, 0, node.row_count - 1)
+            node.first = node.fetched = 0
+            node.gap = False
+            node.nodes = {}
+            self.endRemoveRows()
+        last: int = min(first + self.FETCH_BATCH, len(node.children))
+        self.beginInsertRows(index, 0, last - first - (0 if first else 1))
+        node.first, node.fetched, node.gap = first, last, first > 0
+        self.endInsertRows()
+
+    def row_for_key(self, node: TreeNode, key: Union[str, int]) -> int:
+        children: List[PreparedItem] | LazyItems | None = node.children
+        if children is None:
+            return -1
+        if isinstance(children, LazyItems):
+            return children.row_for_key(key)
+        # List rows are their index, no map needed.
+        if isinstance(key, int) and 0 <= key < len(children) and children[key][0] == key:
+            return key
+        if node.rows is None:
+            node.rows = {item[0]: row for row, item in enumerate(children)}
+        return node.rows.get(key, -1)
+
+    def value_changed(self, path: Path, old: Any, new: Any, root: Any = None) -> None:
+        # With root, the edit produced a new document that copies the containers along path, the nodes on the way
+        # down look their values up again in it.
+        if not path:
+            self.set_root(new)
+            return
+        parent_path: Path = path[:-1]
+        # Rows prepared for the parent show the old value and anything under path is gone, the siblings' rows
+        # are still right. Nodes that were waiting for a dropped prefetch load again once the rows are updated.
+        stale: Callable[[Path], bool] = lambda p: p == parent_path or p[: len(path)] == path
+        for cached in [p for p in self._cache if stale(p)]:
+            self._cache.discard(cached)
+        waiting: List[TreeNode] = []
+        for running in [p for p in self._prefetching if stale(p)]:
+            node: TreeNode = self._prefetching.pop(running).node
+            if node.loading:
+                node.loading = False
+                waiting.append(node)
+        self._replace_row(path, new, root)
+        for node in waiting:
+            if node.children is None and self._is_attached(node):
+                self.fetchMore(self.index_for_node(node))
+
+    def _replace_row(self, path: Path, new: Any, root: Any) -> None:
+        parent_path: Path = path[:-1]
+        parent: TreeNode | None = self._invisible.child(0) if self._invisible.fetched else None
+        if parent is not None and root is not None:
+            parent.value = root
+        for key in parent_path:
+            if parent is None or parent.children is None:
+                return
+            row: int = self.row_for_key(parent, key)
+            parent = parent.nodes.get(row)
+            if parent is not None and root is not None:
+                parent.reset_value()
+        if parent is None or parent.children is None:
+            return
+
+        row = self.row_for_key(parent, path[-1])
+        if row < 0:
+            return
+        is_cont: bool = isinstance(new, (dict, list, tuple, set))
+        parent.children[row] = (path[-1], Helper.type_name(new), "" if is_cont else Preview.text(new), is_cont)
+
+        node: TreeNode | None = parent.nodes.get(row)
+        if node is None:
+            return
+        self._forget_rows(node)
+        node.forget_value()
+        self.dataChanged.emit(self.index_for_node(node), self.index_for_node(node, len(self.HEADERS) - 1))
+
+    def _forget_rows(self, node: TreeNode) -> None:
+        if node.row_count:
+            self.beginRemoveRows(self.index_for_node(node), 0, node.row_count - 1)
+            node.first = node.fetched = 0
+            node.gap = False
+            node.nodes = {}
+            node.children = None
+            self.endRemoveRows()
+        node.children = None
+        node.rows = None
+        node.loading = False
+
+    def apply_diff(self, data: Any, diff: DocumentDiff) -> None:
+        # Swaps in a reloaded document while keeping every row that is still there, so expanded nodes, the
+        # selection and the scroll position survive. Only the containers the diff names are looked into.
+        if not self._invisible.fetched or self._outline or () in diff.changed:
+            self.set_root(data)
+            return
+        # Child loads that are still running prepare rows of the old document, they are dropped and started again.
+        self._generation += 1
+        self._prefetch_queue = {}
+        self._prefetching = {}
+        gone: Set[Path] = diff.changed.union(diff.removed)
+        for path in [p for p in self._cache if p in diff.containers or any(p[:i] in gone for i in range(len(p)))]:
+            self._cache.discard(path)
+
+        # Unchanged subtrees of the new document are equal to the old ones but not the same objects, every node
+        # looks its value up again.
+        root: TreeNode = self._invisible.child(0)
+        loading: List[TreeNode] = []
+        stack: List[TreeNode] = [root]
+        while stack:
+            node: TreeNode = stack.pop()
+            node.reset_value()
+            if node.loading:
+                node.loading = False
+                loading.append(node)
+            stack.extend(node.nodes.values())
+        root.value = data
+
+        self._marks = dict.fromkeys(diff.containers, "changed")
+        self._marks.update(dict.fromkeys(diff.changed, "changed"))
+        self._marks.update(dict.fromkeys(diff.added, "added"))
+        self._merge(root, (), diff)
+        for node in loading:
+            if node.children is None and self._is_attached(node):
+                self.fetchMore(self.index_for_node(node))
+
+    def _merge(self, node: TreeNode, path: Path, diff: DocumentDiff) -> None:
+        keys_changed: bool | None = diff.containers.get(path)
+        if keys_changed is None or node.children is None:
+            return  # unchanged, or nothing under it was prepared
+        index: QtCore.QModelIndex = self.index_for_node(node)
+        count: int = len(node.value)
+        if keys_changed or count <= node.first:
+            # Rows moved, they are prepared again and expanded nodes under this one close.
+            shown: bool = node.row_count > 0
+            self._forget_rows(node)
+            if shown:
+                self.fetchMore(index)
+            return
+
+        # The same keys in the same order, give or take items at the end of a list.
+        old_count: int = len(node.children)
+        node.children = LazyItems(node.value)
+        node.rows = None
+        if count < node.fetched:
+            self.beginRemoveRows(index, node.row_count - (node.fetched - count), node.row_count - 1)
+            for row in range(count, node.fetched):
+                node.nodes.pop(row, None)
+            node.fetched = count
+            self.endRemoveRows()
+        elif node.fetched == old_count:
+            self._insert_batch(node, node.fetched + self.FETCH_BATCH)
+
+        last: int = len(self.HEADERS) - 1
+        for row, child in list(node.nodes.items()):
+            if row < 0:
+                continue
+            child_path: Path = (*path, child.key)
+            if child_path in diff.changed:
+                shown = child.row_count > 0
+                self._forget_rows(child)
+                if shown and child.is_container:
+                    self.fetchMore(self.index_for_node(child))
+            elif child_path in diff.containers:
+                self._merge(child, child_path, diff)
+            else:
+                continue
+            self.dataChanged.emit(self.index_for_node(child), self.index_for_node(child, last))
+
+    def _start(
+        self,
+        worker: LoadChildrenWorker,
+        slot: Callable[[TreeNode, List[PreparedItem], Path], None],
+        priority: int = 0,
+    ) -> None:
+        generation: int = self._generation
+        self._active_workers.append(worker)
+
+        def _dispatch(
+            node: TreeNode, items: List[PreparedItem], path: Path, wrk: LoadChildrenWorker = worker
+        ) -> None:
+            self._active_workers.remove(wrk)
+            if generation == self._generation:
+                slot(node, items, path)
+
+        worker.signals.loaded.connect(_dispatch, QtCore.Qt.ConnectionType.QueuedConnection)  # type: ignore
+        self._threadpool.start(worker, priority)  # type: ignore
+
+    def _on_children_loaded(self, node: TreeNode, items: List[PreparedItem], path: Path) -> None:
+        if not node.loading or not self._is_attached(node):
+            return  # prepared synchronously in the meantime, or the value was replaced by an edit or a jump
+        node.loading = False
+        self._cache.put(path, items)
+        if node.children is not None:
+            return
+        node.children = items
+        if not items:
+            # The view asked with an expander shown, let it know there is nothing underneath after all.
+            index = self.index_for_node(node)
+            self.dataChanged.emit(index, index)
+            return
+        self._insert_batch(node, self.FETCH_BATCH)
+
+    def _is_attached(self, node: TreeNode) -> bool:
+        while node.parent is not None:
+            if node.parent.nodes.get(node.row) is not node:
+                return False
+            node = node.parent
+        return node is self._invisible
+
+    def prefetch(self, nodes: Iterable[TreeNode]) -> None:
+        # Prepares the children of the rows the view shows (or is about to) so expanding them is instant. The
+        # queue is replaced each time, rows that scrolled away since are no longer worth the work.
+        queue: Dict[Path, TreeNode] = {}
+        for node in nodes:
+            if node.row < 0 or node.children is not None or node.loading or not node.is_container:
+                continue
+            path: Path = node.path
+            if path not in self._cache and path not in self._prefetching:
+                queue[path] = node
+        self._prefetch_queue = queue
+        self._pump_prefetch()
+
+    def _pump_prefetch(self) -> None:
+        while self._prefetch_queue and len(self._prefetching) < self.PREFETCH_IN_FLIGHT:
+            path: Path = next(iter(self._prefetch_queue))
+            node: TreeNode = self._prefetch_queue.pop(path)
+            if node.children is not None or path in self._cache or not self._is_attached(node):
+                continue
+            worker = self._prefetching[path] = LoadChildrenWorker(node, node.value, path)
+            self._start(worker, lambda n, items, p, wrk=worker: self._on_prefetched(wrk, n, items, p))
+
+    def _on_prefetched(self, worker: LoadChildrenWorker, node: TreeNode, items: List[PreparedItem], path: Path) -> None:
+        if self._prefetching.get(path) is not worker:
+            return  # the value was replaced by an edit while we were at it
+        del self._prefetching[path]
+        if node.loading:
+            self._on_children_loaded(node, items, path)  # expanded while we were at it
+        else:
+            self._cache.put(path, items)
+        self._pump_prefetch()
+
+    def _insert_batch(self, node: TreeNode, upto: int) -> None:
+        assert node.children is not None
+        first: int = node.fetched
+        last: int = min(upto, len(node.children))
+        if last <= first:
+            return
+        self.beginInsertRows(self.index_for_node(node), node.row_count, node.row_count + last - first - 1)
+        node.fetched = last
+        self.endInsertRows()
@@ -3,4 +3,5 @@
 
 from json_inspector.__main__ import main
 
-main()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import copy
+from typing import Any
+
+import pytest
+
+from document_diff import DocumentDiff
+
+
+@pytest.fixture
+def old() -> Any:
+    return {
+        "player": {"name": "Ann", "hp": 10, "flags": [1, 2, 3]},
+        "log": [{"n": i} for i in range(3000)],
+        "settings": {"volume": 5},
+    }
+
+
+class TestDocumentDiff:
+    def test_equal_documents(self, old: Any):
+        diff = DocumentDiff.compare(old, copy.deepcopy(old))
+        assert diff.is_empty
+        assert (diff.added, diff.removed) == ([], [])
+
+    def test_changed_values(self, old: Any):
+        new = copy.deepcopy(old)
+        new["player"]["hp"] = 9
+        new["log"][2500]["n"] = -1
+        new["settings"]["volume"] = True
+        diff = DocumentDiff.compare(old, new)
+        assert diff.changed == {("player", "hp"), ("log", 2500, "n"), ("settings", "volume")}
+        # Every container on the way down, none of them had keys added or removed.
+        assert diff.containers == {
+            (): False,
+            ("player",): False,
+            ("log",): False,
+            ("log", 2500): False,
+            ("settings",): False,
+        }
+
+    def test_added_and_removed(self, old: Any):
+        new = copy.deepcopy(old)
+        del new["settings"]
+        new["player"]["gold"] = 3
+        new["player"]["flags"].pop()
+        new["log"].append({"n": 3000})
+        diff = DocumentDiff.compare(old, new)
+        assert sorted(diff.removed, key=str) == [("player", "flags", 2), ("settings",)]
+        assert sorted(diff.added, key=str) == [("log", 3000), ("player", "gold")]
+        assert diff.containers[()] is True
+        assert diff.containers[("player",)] is True
+        # Growing or shrinking at the end keeps the rows that were there.
+        assert diff.containers[("log",)] is False
+        assert diff.containers[("player", "flags")] is False
+        assert not diff.changed
+
+    def test_reordered_keys(self):
+        # Objects compare equal whatever the order of their keys, only moved keys aren't a change.
+        assert DocumentDiff.compare({"a": 1, "b": 2}, {"b": 2, "a": 1}).is_empty
+        diff = DocumentDiff.compare({"a": 1, "b": 2}, {"b": 2, "a": 1, "c": 3})
+        assert diff.containers == {(): True}
+        assert (diff.added, diff.removed, diff.changed) == ([("c",)], [], set())
+
+    def test_type_change_replaces_the_value(self, old: Any):
+        new = copy.deepcopy(old)
+        new["player"]["flags"] = {"0": 1}
+        new["settings"] = [5]
+        diff = DocumentDiff.compare(old, new)
+        assert diff.changed == {("player", "flags"), ("settings",)}
+        assert ("player", "flags") not in diff.containers
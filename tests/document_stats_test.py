@@ -0,0 +1,96 @@
+import json
+from typing import Any
+
+import pytest
+
+from document_stats import DocumentStats
+from edit_journal import EditJournal
+from helper import LoadCancelled
+
+
+def _doc() -> Any:
+    return {
+        "users": [{"id": 1, "name": "Alice"}, {"id": 2, "name": "Bob", "bio": "x" * 40}],
+        "meta": {"version": 3, "tags": ["a", "bb", "ccc"]},
+        "id": None,
+    }
+
+
+def _same(a: DocumentStats, b: DocumentStats) -> None:
+    assert a.node_count == b.node_count
+    assert dict(a.type_counts) == dict(b.type_counts)
+    assert a.max_depth == b.max_depth
+    assert set(a.common_keys(100)) == set(b.common_keys(100))
+    assert sorted(a.largest_containers()) == sorted(b.largest_containers())
+    assert sorted(a.longest_strings()) == sorted(b.longest_strings())
+    assert a.heaviest_subtrees() == b.heaviest_subtrees()
+
+
+class TestDocumentStats:
+    def test_build(self):
+        stats = DocumentStats.build(_doc())
+        assert stats.node_count == 16
+        assert dict(stats.type_counts) == {"dict": 4, "list": 2, "int": 3, "str": 6, "NoneType": 1}
+        assert stats.max_depth == 3
+        assert stats.common_keys(2) == [("id", 3), ("name", 2)]
+        assert stats.largest_containers(2) == [(3, ()), (3, ("users", 1))]
+        assert stats.longest_strings(1) == [(40, ("users", 1, "bio"))]
+
+    def test_deep_documents(self):
+        data: Any = "leaf"
+        for _ in range(5000):
+            data = [data]
+        stats = DocumentStats.build(data)
+        assert stats.max_depth == 5000
+        assert stats.longest_strings() == [(4, (0,) * 5000)]
+
+    def test_update_matches_rebuild(self):
+        data = _doc()
+        stats = DocumentStats.build(data)
+        old, data["meta"] = data["meta"], "y" * 50
+        stats.update(("meta",), old, data["meta"])
+        _same(stats, DocumentStats.build(data))
+
+        old, data["users"][0]["name"] = data["users"][0]["name"], {"first": "A", "nested": [[["deep"]]]}
+        stats.update(("users", 0, "name"), old, data["users"][0]["name"])
+        _same(stats, DocumentStats.build(data))
+        assert stats.max_depth == 7
+
+    def test_update_with_copied_containers(self):
+        data = _doc()
+        stats = DocumentStats.build(data)
+        edit = EditJournal.assign(data, ("users", 1, "bio"), "short")
+        stats.update(edit.path, edit.old, edit.new, edit.after)
+        _same(stats, DocumentStats.build(edit.after))
+        assert stats.subtree(edit.after["users"])[0] == 7  # type: ignore[index]
+        assert stats.subtree(data["users"]) is None
+
+        stats.update(edit.path, edit.new, edit.old, edit.before)
+        _same(stats, DocumentStats.build(data))
+        assert stats.subtree(data["users"][1]) is not None
+
+    def test_subtrees(self):
+        data = _doc()
+        stats = DocumentStats.build(data)
+        for container in (data, data["users"], data["users"][1], data["meta"]["tags"]):
+            descendants, json_size, memory = stats.subtree(container)  # type: ignore[misc]
+            assert json_size == len(json.dumps(container, separators=(",", ":")))
+            assert memory > json_size
+        assert stats.subtree(data)[0] == stats.node_count - 1  # type: ignore[index]
+        assert stats.subtree(data["users"])[0] == 7  # type: ignore[index]
+        assert stats.subtree("Alice") is None
+        assert [path for path, _ in stats.heaviest_subtrees(3)] == [(), ("users",), ("users", 1)]
+
+    def test_subtrees_follow_edits(self):
+        data = _doc()
+        stats = DocumentStats.build(data)
+        old, data["users"][0]["name"] = data["users"][0]["name"], "z" * 500
+        stats.update(("users", 0, "name"), old, data["users"][0]["name"])
+        assert stats.subtree(data)[1] == len(json.dumps(data, separators=(",", ":")))  # type: ignore[index]
+        assert stats.heaviest_subtrees(2)[1][0] == ("users",)
+        assert stats.heaviest_subtrees(3)[2][0] == ("users", 0)
+
+    def test_cancel(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(DocumentStats, "CANCEL_CHECK_INTERVAL", 2)
+        with pytest.raises(LoadCancelled):
+            DocumentStats.build(_doc(), lambda: True)
@@ -0,0 +1,117 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Iterator, List, Tuple
+
+import pytest
+
+from document_writer import DocumentWriter, ParallelEncoder, SaveCancelled
+from helper import Helper
+from json_backend import JsonBackends, StdlibBackend
+
+DOC = {
+    "a": list(range(10)),
+    "b": {"x": {str(i): [i, {"q": i}] for i in range(7)}},
+    "c": [],
+    "d": {},
+    "e": [[1, 2, 3, 4, 5], [6]],
+    "f": "ü/\"x\"",
+}
+
+
+@pytest.fixture(scope="module")
+def encoder() -> Iterator[ParallelEncoder]:
+    encoder = ParallelEncoder(processes=2)
+    yield encoder
+    encoder.shutdown()
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch: pytest.MonkeyPatch):
+    # Splits DOC at every level so separators and indentation between pieces are exercised.
+    monkeypatch.setattr(DocumentWriter, "CHUNK_ENTRIES", 3)
+    monkeypatch.setattr(DocumentWriter, "SPLIT_MIN", 4)
+
+
+def _always_worthwhile(_self: ParallelEncoder, _indent: int | None) -> bool:
+    return True
+
+
+class TestDocumentWriter:
+    @pytest.mark.parametrize("indent", [4, 2, None])
+    def test_output_matches_single_encode(self, tmp_path: Path, indent: int | None):
+        path = tmp_path / "doc.json"
+        DocumentWriter(DOC, indent).write(str(path))
+        assert json.loads(path.read_bytes()) == DOC
+        assert path.read_bytes() == JsonBackends.dumps(DOC, indent)
+
+    @pytest.mark.parametrize("data", [[], {}, 5, "x", [1], None])
+    def test_scalars_and_empty_containers(self, tmp_path: Path, data: Any):
+        path = tmp_path / "doc.json"
+        DocumentWriter(data).write(str(path))
+        assert json.loads(path.read_text()) == data
+
+    def test_progress_and_compression(self, tmp_path: Path):
+        path = tmp_path / "doc.json.gz"
+        seen: List[Tuple[int, int]] = []
+        DocumentWriter(DOC).write(str(path), lambda done, total: seen.append((done, total)))
+        assert Helper.load_json(str(path)) == DOC
+        assert seen and seen[-1][0] == seen[-1][1]
+
+    def test_failure_keeps_original(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        path = tmp_path / "doc.json"
+        path.write_text('{"old": true}')
+        os.chmod(path, 0o600)
+
+        def _fail(*_args: Any) -> bytes:
+            raise TypeError("not serializable")
+
+        monkeypatch.setattr(DocumentWriter, "encode", staticmethod(_fail))
+        with pytest.raises(TypeError):
+            DocumentWriter(DOC).write(str(path))
+        assert path.read_text() == '{"old": true}'
+        assert os.listdir(tmp_path) == ["doc.json"]
+
+        monkeypatch.undo()
+        DocumentWriter(DOC).write(str(path))
+        assert json.loads(path.read_text()) == DOC
+        assert os.stat(path).st_mode & 0o777 == 0o600
+
+    def test_cancel_keeps_original(self, tmp_path: Path):
+        path = tmp_path / "doc.json"
+        path.write_text("[]")
+        with pytest.raises(SaveCancelled):
+            DocumentWriter(DOC).write(str(path), is_cancelled=lambda: True)
+        assert path.read_text() == "[]"
+        assert os.listdir(tmp_path) == ["doc.json"]
+
+
+class TestParallelEncoder:
+    def test_only_for_python_encoding(self, encoder: ParallelEncoder):
+        JsonBackends.prefer(StdlibBackend.name)
+        try:
+            assert encoder.worthwhile(4)
+            assert not encoder.worthwhile(None)
+            assert not ParallelEncoder(processes=1).worthwhile(4)
+        finally:
+            JsonBackends.prefer(JsonBackends.AUTO)
+
+    @pytest.mark.parametrize("indent", [4, 2, None])
+    @pytest.mark.parametrize("suffix", [".json", ".json.gz"])
+    def test_same_output_as_serial(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, encoder: ParallelEncoder, indent: int | None, suffix: str
+    ):
+        monkeypatch.setattr(ParallelEncoder, "worthwhile", _always_worthwhile)
+        serial, parallel = tmp_path / f"serial{suffix}", tmp_path / f"parallel{suffix}"
+        DocumentWriter(DOC, indent).write(str(serial))
+        seen: List[Tuple[int, int]] = []
+        DocumentWriter(DOC, indent, encoder).write(str(parallel), lambda done, total: seen.append((done, total)))
+        assert Helper.load_json(str(parallel)) == DOC
+        assert Helper.read_bytes(str(parallel)) == Helper.read_bytes(str(serial))
+        assert [done for done, _ in seen] == list(range(1, seen[-1][1] + 1))
+
+    def test_cancel(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, encoder: ParallelEncoder):
+        monkeypatch.setattr(ParallelEncoder, "worthwhile", _always_worthwhile)
+        with pytest.raises(SaveCancelled):
+            DocumentWriter(DOC, 4, encoder).write(str(tmp_path / "doc.json"), is_cancelled=lambda: True)
+        assert os.listdir(tmp_path) == []
@@ -0,0 +1,60 @@
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from edit_journal import EditJournal
+from lazy_document import LazyDict, LazyDocument, LazyList
+
+
+def _doc() -> Any:
+    return {"a": {"b": [1, 2, {"c": 3}], "d": {"e": 4}}, "f": [5]}
+
+
+class TestEditJournal:
+    def test_assign_copies_only_the_path(self):
+        root = _doc()
+        edit = EditJournal.assign(root, ("a", "b", 2, "c"), 9)
+        assert edit.old == 3 and edit.new == 9
+        assert edit.before is root and root == _doc()
+        after = edit.after
+        assert after["a"]["b"][2] == {"c": 9}
+        assert after is not root and after["a"] is not root["a"] and after["a"]["b"] is not root["a"]["b"]
+        assert after["f"] is root["f"]
+        assert after["a"]["d"] is root["a"]["d"]
+
+    def test_assign_root(self):
+        root = _doc()
+        edit = EditJournal.assign(root, (), [1])
+        assert edit.after == [1] and edit.before is root and edit.old is root
+
+    @pytest.mark.parametrize("path", [("x",), ("f", 1), ("f", "0"), ("a", "d", "e", "g")])
+    def test_missing_path(self, path: Any):
+        with pytest.raises(KeyError):
+            EditJournal.assign(_doc(), path, 1)
+
+    def test_undo_redo(self):
+        journal = EditJournal()
+        first = EditJournal.assign(_doc(), ("f", 0), 6)
+        journal.record(first)
+        second = EditJournal.assign(first.after, ("a", "d"), None)
+        journal.record(second)
+        assert journal.undo() is second
+        assert journal.undo() is first
+        assert journal.undo() is None and not journal.can_undo()
+        assert journal.redo() is first and journal.can_redo()
+
+        journal.record(EditJournal.assign(first.after, ("f",), []))
+        assert not journal.can_redo()
+        journal.clear()
+        assert not journal.can_undo()
+
+    def test_lazy_containers_stay_lazy(self, tmp_path: Path):
+        file = tmp_path / "doc.json"
+        file.write_text('{"a": [1, {"b": 2}], "c": {"d": 3}}')
+        root = LazyDocument(str(file)).root
+        edit = EditJournal.assign(root, ("a", 1, "b"), 7)
+        assert isinstance(edit.after, LazyDict) and isinstance(edit.after["a"], LazyList)
+        assert edit.after == {"a": [1, {"b": 7}], "c": {"d": 3}}
+        assert root == {"a": [1, {"b": 2}], "c": {"d": 3}}
+        assert edit.after["c"] is root["c"]
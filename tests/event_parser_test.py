@@ -0,0 +1,81 @@
+import gzip
+import io
+import json
+from pathlib import Path
+from typing import Any, List, Tuple
+
+import pytest
+
+from event_parser import JsonEvent, JsonEventBuilder, JsonEventParser
+from helper import Helper
+
+DOC: Any = {
+    "meta": {"version": 3, "name": "savé \"one\""},
+    "entities": [{"id": i, "pos": [i * 1.5, -i], "alive": i % 2 == 0, "owner": None} for i in range(50)],
+    "empty": {"list": [], "dict": {}},
+    "big": 12345678901234567890,
+}
+
+
+def parse(text: str, max_depth: int | None = None, chunk_size: int = 7) -> List[Tuple[JsonEvent, Any]]:
+    return list(JsonEventParser(io.BytesIO(text.encode("utf-8")).read, max_depth, chunk_size))
+
+
+def build(events: List[Tuple[JsonEvent, Any]]) -> Any:
+    builder = JsonEventBuilder()
+    for event, value in events:
+        builder.feed(event, value)
+    return builder.root
+
+
+class TestJsonEventParser:
+    @pytest.mark.parametrize("chunk_size", [1, 3, 64, 1 << 20])
+    @pytest.mark.parametrize("max_depth", [None, 0, 1, 2])
+    def test_rebuilds_document(self, chunk_size: int, max_depth: int | None):
+        text = json.dumps(DOC, indent=2)
+        assert build(parse(text, max_depth, chunk_size)) == DOC
+
+    def test_event_sequence(self):
+        assert parse('{"a": [1, "x"], "b": {}}') == [
+            (JsonEvent.START_MAP, None),
+            (JsonEvent.MAP_KEY, "a"),
+            (JsonEvent.START_ARRAY, None),
+            (JsonEvent.VALUE, 1),
+            (JsonEvent.VALUE, "x"),
+            (JsonEvent.END_ARRAY, None),
+            (JsonEvent.MAP_KEY, "b"),
+            (JsonEvent.START_MAP, None),
+            (JsonEvent.END_MAP, None),
+            (JsonEvent.END_MAP, None),
+        ]
+
+    def test_max_depth_reports_deeper_containers_as_values(self):
+        assert parse('{"a": [1, {"b": 2}]}', max_depth=1) == [
+            (JsonEvent.START_MAP, None),
+            (JsonEvent.MAP_KEY, "a"),
+            (JsonEvent.VALUE, [1, {"b": 2}]),
+            (JsonEvent.END_MAP, None),
+        ]
+
+    def test_numbers_split_across_chunks(self):
+        assert build(parse("[123456789, 0.000125]", chunk_size=2)) == [123456789, 0.000125]
+
+    def test_scalar_document(self):
+        assert parse('  "just text" ') == [(JsonEvent.VALUE, "just text")]
+
+    @pytest.mark.parametrize("text", ["", '{"a" 1}', "[1 2]", '{1: 2}', "[1, 2", "[1] x"])
+    def test_errors(self, text: str):
+        with pytest.raises(json.JSONDecodeError):
+            parse(text)
+
+    def test_error_position_is_absolute(self):
+        text = "[\n" + "1,\n" * 100 + "oops]"
+        with pytest.raises(json.JSONDecodeError) as exc:
+            parse(text, chunk_size=16)
+        assert exc.value.lineno == 102
+        assert exc.value.pos == text.index("oops")
+
+    def test_iter_events_from_gzip(self, tmp_path: Path):
+        path = tmp_path / "doc.json.gz"
+        path.write_bytes(gzip.compress(json.dumps(DOC).encode()))
+        assert build(list(Helper.iter_events(str(path), max_depth=1))) == DOC
@@ -0,0 +1,48 @@
+from typing import Any, List
+
+from item_cache import ItemCache
+
+
+def _items(count: int, text: str = "value") -> List[Any]:
+    return [(f"k{i}", "str", text, False) for i in range(count)]
+
+
+class TestItemCache:
+    def test_hits_and_misses(self):
+        cache = ItemCache()
+        assert cache.get(("a",)) is None
+        items = _items(3)
+        cache.put(("a",), items)
+        assert cache.get(("a",)) is items
+        assert (cache.hits, cache.misses, cache.hit_rate) == (1, 1, 0.5)
+        assert ("a",) in cache and cache.hits == 1
+
+    def test_size_accounting(self):
+        cache = ItemCache()
+        cache.put(("a",), _items(10))
+        cache.put(("b",), _items(5))
+        assert cache.size == ItemCache.size_of(_items(10)) + ItemCache.size_of(_items(5))
+        cache.put(("a",), _items(1))
+        assert cache.size == ItemCache.size_of(_items(1)) + ItemCache.size_of(_items(5))
+        cache.discard(("b",))
+        assert cache.size == ItemCache.size_of(_items(1))
+        cache.clear()
+        assert (len(cache), cache.size, cache.hits, cache.misses) == (0, 0, 0, 0)
+
+    def test_evicts_least_recently_used(self):
+        entry: int = ItemCache.size_of(_items(10))
+        cache = ItemCache(budget=3 * entry)
+        for name in "abc":
+            cache.put((name,), _items(10))
+        cache.get(("a",))
+        cache.put(("d",), _items(10))
+        assert list(cache) == [("c",), ("a",), ("d",)]
+        assert cache.size <= cache.budget
+        cache.set_budget(entry)
+        assert list(cache) == [("d",)]
+
+    def test_entry_over_budget_is_not_kept(self):
+        cache = ItemCache(budget=ItemCache.size_of(_items(10)))
+        cache.put(("small",), _items(10))
+        cache.put(("big",), _items(100))
+        assert list(cache) == [("small",)]
@@ -0,0 +1,61 @@
+import gzip
+import json
+import math
+from pathlib import Path
+
+import pytest
+
+from json_backend import JsonBackend, JsonBackends, StdlibBackend
+from helper import Helper
+
+
+class TestJsonBackends:
+    def setup_method(self):
+        JsonBackends.prefer(JsonBackends.AUTO)
+
+    @pytest.mark.parametrize("name", JsonBackends.names())
+    def test_roundtrip(self, name: str):
+        data = {"a": [1, 2.5, None, True], "b": {"c": "ü/x"}}
+        assert JsonBackends.loads(JsonBackends.dumps(data, 4, name), name) == data
+        assert JsonBackends.loads(JsonBackends.dumps(data, None, name), name) == data
+
+    def test_falls_back_for_values_fast_codecs_reject(self):
+        assert math.isnan(JsonBackends.loads(b'{"x": NaN}')["x"])
+        assert json.loads(JsonBackends.dumps({"big": 2**70})) == {"big": 2**70}
+
+    def test_decode_errors_are_stdlib_errors(self):
+        with pytest.raises(json.JSONDecodeError) as exc:
+            JsonBackends.loads(b'{\n    {}: []\n}')
+        assert exc.value.lineno == 2
+
+    def test_indent_selects_capable_backend(self):
+        JsonBackends.prefer("orjson")
+        assert JsonBackends.get(indent=4).supports_indent(4)
+        assert JsonBackends.get(indent=None).name == JsonBackends.get().name
+
+    def test_backends_implement_the_codec(self):
+        class Incomplete(JsonBackend):
+            name = "incomplete"
+
+        with pytest.raises(TypeError):
+            Incomplete()  # type: ignore[abstract]
+
+    def test_unknown_backend_falls_back(self):
+        assert JsonBackends.get("nope") is JsonBackends.get(JsonBackends.AUTO)
+        assert JsonBackends.names()[-1] == StdlibBackend.name
+
+
+class TestHelperLoadSave:
+    @pytest.mark.parametrize("suffix", [".json", ".json.gz"])
+    def test_save_and_load(self, tmp_path: Path, suffix: str):
+        path = str(tmp_path / f"doc{suffix}")
+        data = {"list": list(range(100)), "nested": {"x": "y"}}
+        Helper.save_json(data, path)
+        assert Helper.load_json(path) == data
+
+    def test_progress_follows_compressed_offset(self, tmp_path: Path):
+        path = tmp_path / "doc.json.gz"
+        path.write_bytes(gzip.compress(json.dumps(list(range(1000))).encode()))
+        seen: list[tuple[int, int]] = []
+        assert Helper.load_json(str(path), lambda done, total: seen.append((done, total))) == list(range(1000))
+        assert seen[-1] == (path.stat().st_size, path.stat().st_size)
@@ -1,4 +1,5 @@
 import json
+import os
 from pathlib import Path
 import sys
 import types
@@ -8,7 +9,10 @@ from PyQt6 import QtWidgets, QtCore
 from pytest import MonkeyPatch
 
 from json_inspector.manager import JsonManager
-from watchdog import FileEvent  # type: ignore
+from json_backend import JsonBackends
+from lazy_document import LazyDocument
+from load_worker import LoadWorker
+from monitor import FileEvent
 
 
 class DummyGui:
@@ -24,8 +28,11 @@ class DummyGui:
     def reload_popup(self):
         self.actions.append("reload_popup")
 
-    def reload(self):
-        self.actions.append("reload")
+    def reload(self, notify: bool = False):
+        self.actions.append(("reload", notify))
+
+    def file_deleted(self):
+        self.actions.append("file_deleted")
 
     def clear(self):
         self.actions.append("clear")
@@ -44,6 +51,9 @@ class DummyMonitor:
     def register_callback(self, cb: Any):
         self._cb = cb
 
+    def start(self):
+        self.stopped = False
+
     def stop_monitoring(self):
         self.stopped = True
 
@@ -52,12 +62,7 @@ class DummyMonitor:
 def patch_json_manager(monkeypatch: MonkeyPatch, tmp_path: Path):
     mod = types.ModuleType("monitor")
     mod.JsonFileMonitor = DummyMonitor  # type: ignore
-
-    class _FileEvent:
-        MODIFIED = "modified"
-        DELETED = "deleted"
-
-    mod.FileEvent = _FileEvent  # type: ignore
+    mod.FileEvent = FileEvent  # type: ignore
     sys.modules["monitor"] = mod
 
     import importlib
@@ -69,12 +74,15 @@ def patch_json_manager(monkeypatch: MonkeyPatch, tmp_path: Path):
     importlib.reload(gui_mod)
 
     monkeypatch.setattr("json_inspector.manager.Gui", DummyGui)
+    monkeypatch.setattr(
+        "json_inspector.manager.Settings.snapshot_dir", staticmethod(lambda: str(tmp_path / "snapshots"))
+    )
 
-    def fake_load(path: str):
+    def fake_load(path: str, *args: Any):
         with open(path, "r") as f:
             return json.load(f)
 
-    def fake_save(data: Any, path: str):
+    def fake_save(data: Any, path: str, indents: int | None = 4, encoder: Any = None):
         with open(path, "w") as f:
             json.dump(data, f)
 
@@ -91,6 +99,31 @@ class TestJsonManager:
         assert jm.data == data
         assert jm.gui.actions == ["load", "populate_tree"]
 
+    def test_load_builds_statistics_and_index(self, qtbot: Any, tmp_path: Path):
+        file: Path = tmp_path / "t.json"
+        file.write_text('{"a": [1, 2]}')
+        jm = JsonManager(str(file))
+        qtbot.waitUntil(lambda: jm.stats is not None and jm.search_index is not None)
+        assert jm.stats is not None and jm.stats.node_count == 4
+
+    @pytest.mark.parametrize("backend", ["json", "orjson"])
+    def test_incremental_load_only_with_stdlib_backend(
+        self, qtbot: Any, tmp_path: Path, monkeypatch: MonkeyPatch, backend: str
+    ):
+        file: Path = tmp_path / "t.json"
+        file.write_text('{"a": [1, 2]}')
+        jm = JsonManager(None)
+        monkeypatch.setattr(jm.settings, "incremental_load_enabled", lambda: True)
+        monkeypatch.setattr(jm.settings, "lazy_mode_enabled", lambda: False)
+        monkeypatch.setattr(LoadWorker, "INCREMENTAL_MIN_SIZE", 0)
+        JsonBackends.prefer(backend)
+        try:
+            worker = jm.load_async(str(file), incremental=True)
+            assert worker is not None and worker.incremental == (backend == "json")
+            qtbot.waitUntil(lambda: jm.data == {"a": [1, 2]})
+        finally:
+            JsonBackends.prefer(JsonBackends.AUTO)
+
     def test_init_without_path_opens_file_only(self):
         jm = JsonManager(None)
         assert jm.data is None
@@ -106,14 +139,59 @@ class TestJsonManager:
         jm.save_as(str(dest2))
         assert json.loads(dest2.read_text()) == {"a": 2}
 
+    def test_save_splices_edits_into_loaded_file(self, tmp_path: Path, monkeypatch: MonkeyPatch):
+        file: Path = tmp_path / "t.json"
+        file.write_text('{"a":  1,\n "b": [1,  2]}')
+        jm = JsonManager(str(file))
+        jm.set_value(("b", 1), 3)
+        assert jm.is_dirty()
+
+        def _no_full_save(*_args: Any, **_kwargs: Any):
+            raise AssertionError("saved in full")
+
+        monkeypatch.setattr("json_inspector.manager.Helper.save_json", _no_full_save)
+        jm.save(str(file))
+        assert file.read_text() == '{"a":  1,\n "b": [1,  3]}'
+        assert not jm.is_dirty()
+
+    def test_undo_and_redo(self):
+        jm = JsonManager(None)
+        before: Any = {"a": {"b": [1, 2]}, "c": {}}
+        jm.data = before
+        seen: List[Any] = []
+        jm.add_edit_listener(lambda path, old, new, root: seen.append((path, old, new, root)))
+        jm.set_value(("a", "b", 0), 5)
+        after: Any = jm.data
+        assert after == {"a": {"b": [5, 2]}, "c": {}} and before == {"a": {"b": [1, 2]}, "c": {}}
+        assert after["c"] is before["c"]
+        assert jm.undo() == ("a", "b", 0)
+        assert jm.data is before and seen[-1] == (("a", "b", 0), 5, 1, before)
+        assert jm.undo() is None
+        assert jm.redo() == ("a", "b", 0)
+        assert jm.data is after and jm.redo() is None
+
+    def test_reopen_reads_snapshot(self, tmp_path: Path, monkeypatch: MonkeyPatch):
+        monkeypatch.setattr("json_inspector.manager.Settings.snapshot_cache_enabled", staticmethod(lambda: True))
+        file: Path = tmp_path / "t.json"
+        file.write_text('{"a": [1, 2]}')
+        first = JsonManager(str(file))
+        assert os.path.exists(first.snapshots.file_for(str(file)))
+
+        def _no_parse(path: str):
+            raise AssertionError("parsed again")
+
+        monkeypatch.setattr("json_inspector.manager.Helper.load_json", _no_parse)
+        assert JsonManager(str(file)).data == {"a": [1, 2]}
+
     def test_save_without_data_raises(self):
         jm = JsonManager(None)
         jm.data = None
         with pytest.raises(ValueError):
             jm.save("nope.json")
 
-    def test_start_and_stop_monitoring(self):
+    def test_start_and_stop_monitoring(self, tmp_path: Path):
         jm = JsonManager(None)
+        jm.path = str(tmp_path / "t.json")
         jm.start_monitoring()
         assert hasattr(jm, "_monitor")
         jm.stop_monitoring()
@@ -122,7 +200,7 @@ class TestJsonManager:
     def test_handle_file_change(self):
         jm = JsonManager(None)
         jm.handle_file_change(FileEvent.MODIFIED)  # type: ignore
-        assert jm.gui.actions[-2:] == ["reload_popup", "reload"]  # type: ignore
+        assert jm.gui.actions[-1] == ("reload", True)  # type: ignore
         jm.data = {"x": 1}
         jm.handle_file_change(FileEvent.DELETED)  # type: ignore
         assert jm.data == {"x": 1}
@@ -138,6 +216,17 @@ class TestJsonManager:
         jm.data = {"whatever": True}
         assert jm.get_total_count(cache=False) == 3
 
+    def test_get_container_count(self, tmp_path: Path):
+        jm = JsonManager(None)
+        jm.data = {"a": [1, 2]}
+        assert jm.get_container_count() is None
+        path = tmp_path / "doc.json"
+        path.write_text('{"a": [1, {"b": []}], "c": 3}')
+        root: Any = LazyDocument(str(path)).root
+        jm.data = root
+        assert jm.get_container_count() == 4
+        assert not root.is_loaded
+
     def test_find_paths_in_data(self):
         jm = JsonManager(None)
         jm.data = {"users": [{"id": 1, "name": "Alice"}, {"id": 2, "name": "Bob"}], "count": 2}
@@ -0,0 +1,41 @@
+from typing import Any
+
+import pytest
+
+from json_pointer import JsonPointer
+
+DATA: Any = {"items": [{"name": "a", "a/b": 1, "t~": 2}], "x.y": {"1": True}}
+
+
+class TestJsonPointer:
+    @pytest.mark.parametrize(
+        "text, segments",
+        [
+            ("", []),
+            ("/items/0/name", ["items", "0", "name"]),
+            ("/items/0/a~1b", ["items", "0", "a/b"]),
+            ("/items/0/t~0", ["items", "0", "t~"]),
+            ("items[0].name", ["items", "0", "name"]),
+            ("$.items.0.name", ["items", "0", "name"]),
+            ("root['x.y'][1]", ["x.y", "1"]),
+            ('["x.y"]', ["x.y"]),
+        ],
+    )
+    def test_parse(self, text: str, segments: list[str]):
+        assert JsonPointer.parse(text) == segments
+
+    def test_parse_errors(self):
+        with pytest.raises(ValueError):
+            JsonPointer.parse("items[x]")
+
+    def test_resolve(self):
+        assert JsonPointer.resolve(DATA, ["items", "0", "a/b"]) == ("items", 0, "a/b")
+        assert JsonPointer.resolve(DATA, ["x.y", "1"]) == ("x.y", "1")
+        for segments in (["items", "1"], ["items", "name"], ["missing"], ["items", "0", "name", "deeper"]):
+            with pytest.raises(KeyError):
+                JsonPointer.resolve(DATA, segments)
+
+    def test_format_round_trips(self):
+        path = ("items", 0, "a/b")
+        assert JsonPointer.format(path) == "/items/0/a~1b"
+        assert JsonPointer.resolve(DATA, JsonPointer.parse(JsonPointer.format(path))) == path
@@ -0,0 +1,61 @@
+import gzip
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+from lazy_document import LazyDict, LazyDocument, LazyList
+from helper import Helper
+
+DOC: Dict[str, Any] = {
+    "meta": {"name": "brackets ] } in \"strings\" {[", "version": 3},
+    "entities": [{"id": i, "pos": [i, -i * 0.5], "alive": True, "owner": None} for i in range(20)],
+    "empty": [[], {}],
+    "1": "string key that looks like an index",
+}
+
+
+@pytest.fixture(params=[".json", ".json.gz"])
+def document(request: pytest.FixtureRequest, tmp_path: Path) -> LazyDocument:
+    path = tmp_path / f"doc{request.param}"
+    raw = json.dumps(DOC, indent=2).encode()
+    path.write_bytes(gzip.compress(raw) if request.param.endswith(".gz") else raw)
+    return LazyDocument(str(path))
+
+
+class TestLazyDocument:
+    def test_equals_plain_parse(self, document: LazyDocument):
+        assert document.root == DOC
+        assert LazyDocument.materialize(document.root) == DOC
+
+    def test_containers_load_on_first_touch(self, document: LazyDocument):
+        root = document.root
+        assert isinstance(root, LazyDict) and not root.is_loaded
+        entities = root["entities"]
+        assert root.is_loaded
+        assert isinstance(entities, LazyList) and not entities.is_loaded
+        assert entities[3]["pos"] == [3, -1.5]
+        assert entities.is_loaded and not entities[4].is_loaded
+
+    def test_type_names_hide_lazy_classes(self, document: LazyDocument):
+        assert Helper.type_name(document.root) == "dict"
+        assert Helper.type_name(document.root["entities"]) == "list"
+        assert [item[1] for item in Helper.prepare_items(document.root["empty"])] == ["list", "dict"]
+
+    def test_edits_survive_materialize(self, document: LazyDocument):
+        document.root["entities"][0]["id"] = 99
+        plain = LazyDocument.materialize(document.root)
+        assert plain["entities"][0]["id"] == 99
+        assert plain["meta"] == DOC["meta"]
+        assert type(plain["meta"]) is dict
+
+    def test_index_counts_containers(self, document: LazyDocument):
+        assert document.container_count == 1 + 1 + 1 + 20 * 2 + 1 + 2
+
+    @pytest.mark.parametrize("text", ["", "[1, 2", '{"a": [}', "[1}", "[]]", '{"a": [1}]'])
+    def test_broken_documents(self, tmp_path: Path, text: str):
+        path = tmp_path / "bad.json"
+        path.write_text(text)
+        with pytest.raises(json.JSONDecodeError):
+            LazyDocument.materialize(LazyDocument(str(path)).root)
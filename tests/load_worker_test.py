@@ -0,0 +1,78 @@
+import gzip
+import json
+from pathlib import Path
+from typing import Any, List, Tuple
+
+import pytest
+from PyQt6 import QtCore
+from pytest import MonkeyPatch
+
+from helper import Helper, LoadCancelled
+from load_worker import LoadWorker
+from splice_writer import SpliceWriter
+
+DOC: Any = {"items": [{"id": i, "name": f"item {i}"} for i in range(200)], "meta": {"ok": True}}
+
+
+def _write(tmp_path: Path, text: str) -> str:
+    path = tmp_path / "doc.json"
+    path.write_text(text)
+    return str(path)
+
+
+class TestLoadWorker:
+    def test_loads_file(self, qtbot: Any, tmp_path: Path):
+        path = _write(tmp_path, json.dumps(DOC))
+        worker = LoadWorker(path)
+        with qtbot.waitSignal(worker.signals.finished) as blocker:
+            QtCore.QThreadPool.globalInstance().start(worker)  # type: ignore[union-attr]
+        assert blocker.args == [DOC]
+        assert worker.stamp == SpliceWriter.stamp(path)
+
+    def test_broken_file_fails(self, qtbot: Any, tmp_path: Path):
+        worker = LoadWorker(_write(tmp_path, '{"a": [1, 2}'), attempts=1)
+        with qtbot.waitSignal(worker.signals.failed) as blocker:
+            QtCore.QThreadPool.globalInstance().start(worker)  # type: ignore[union-attr]
+        assert isinstance(blocker.args[0], json.JSONDecodeError)
+
+    @pytest.mark.parametrize(
+        "name, content",
+        [("doc.json.gz", gzip.compress(json.dumps(DOC).encode())[:-20]), ("doc.json", b'{"a": "\xff"}')],
+        ids=["truncated gzip", "invalid utf-8"],
+    )
+    def test_unreadable_file_fails(self, qtbot: Any, tmp_path: Path, name: str, content: bytes):
+        path = tmp_path / name
+        path.write_bytes(content)
+        worker = LoadWorker(str(path), attempts=1)
+        with qtbot.waitSignal(worker.signals.failed) as blocker:
+            QtCore.QThreadPool.globalInstance().start(worker)  # type: ignore[union-attr]
+        assert isinstance(blocker.args[0], Exception)
+
+    def test_cancel_mid_read(self, qtbot: Any, tmp_path: Path, monkeypatch: MonkeyPatch):
+        monkeypatch.setattr(Helper, "READ_CHUNK_SIZE", 64)
+        worker = LoadWorker(_write(tmp_path, json.dumps(DOC)))
+        progress: List[Tuple[int, int]] = []
+        finished: List[Any] = []
+
+        def on_progress(done: int, total: int) -> None:
+            # Runs on the worker thread, between two chunks.
+            progress.append((done, total))
+            worker.cancel()
+
+        worker.signals.progress.connect(on_progress, QtCore.Qt.ConnectionType.DirectConnection)  # type: ignore
+        worker.signals.finished.connect(finished.append)  # type: ignore
+        with qtbot.waitSignal(worker.signals.cancelled):
+            QtCore.QThreadPool.globalInstance().start(worker)  # type: ignore[union-attr]
+        assert progress == [(64, progress[0][1])]
+        assert progress[0][1] > 64
+        assert finished == []
+
+
+class TestReadBytes:
+    def test_cancel_between_chunks(self, tmp_path: Path, monkeypatch: MonkeyPatch):
+        monkeypatch.setattr(Helper, "READ_CHUNK_SIZE", 64)
+        path = _write(tmp_path, json.dumps(DOC))
+        reads: List[int] = []
+        with pytest.raises(LoadCancelled):
+            Helper.read_bytes(path, lambda done, total: reads.append(done), lambda: len(reads) >= 2)
+        assert reads == [64, 128]
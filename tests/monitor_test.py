@@ -0,0 +1,64 @@
+import os
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Iterator, List, Tuple
+
+import pytest
+
+from monitor import FileEvent, JsonFileMonitor
+
+Monitored = Tuple[JsonFileMonitor, Path, List[FileEvent]]
+
+
+@pytest.fixture
+def monitor(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Monitored]:
+    monkeypatch.setattr(JsonFileMonitor, "SETTLE_INTERVAL", 0.05)
+    path = tmp_path / "doc.json"
+    path.write_text('{"a": 1}')
+    mon = JsonFileMonitor(SimpleNamespace(path=str(path)))  # type: ignore
+    events: List[FileEvent] = []
+    mon.register_callback(events.append)
+    yield mon, path, events
+    mon.stop_monitoring()
+
+
+def _settle() -> None:
+    # Well past the settle interval, in case the machine is busy.
+    time.sleep(0.5)
+
+
+class TestJsonFileMonitor:
+    def test_chunked_write_dispatches_once(self, monitor: Monitored):
+        mon, path, events = monitor
+        with open(path, "w") as f:
+            for i in range(5):
+                f.write(f'{{"chunk": {i}}}' if i == 0 else " ")
+                f.flush()
+                mon.file_changed()
+                time.sleep(0.02)
+        mon.file_changed()
+        _settle()
+        assert events == [FileEvent.MODIFIED]
+
+    def test_event_without_change_is_dropped(self, monitor: Monitored):
+        mon, _path, events = monitor
+        mon.file_changed()
+        _settle()
+        assert events == []
+
+    def test_delete(self, monitor: Monitored):
+        mon, path, events = monitor
+        os.remove(path)
+        mon.file_changed()
+        _settle()
+        assert events == [FileEvent.DELETED]
+
+    def test_replace_is_a_modification(self, monitor: Monitored):
+        mon, path, events = monitor
+        os.remove(path)
+        mon.file_changed()
+        path.write_text('{"a": 2, "b": 3}')
+        mon.file_changed()
+        _settle()
+        assert events == [FileEvent.MODIFIED]
@@ -0,0 +1,57 @@
+import re
+import types
+from typing import List, Tuple
+
+import pytest
+
+from helper import LoadCancelled
+from ngram_index import NgramIndex
+
+
+@pytest.fixture
+def index() -> NgramIndex:
+    return NgramIndex.build(["alice", "bob", "malice", "alicia", "user_12_name", "x" * 300 + "lice", "a"])
+
+
+class TestNgramIndex:
+    def test_substring(self, index: NgramIndex):
+        assert index.find_terms("LIC", NgramIndex.SUBSTRING) == ["alice", "malice", "alicia", "x" * 300 + "lice"]
+        assert index.find_terms("o", NgramIndex.SUBSTRING) == ["bob"]
+        assert index.find_terms("zzz", NgramIndex.SUBSTRING) == []
+
+    def test_prefix(self, index: NgramIndex):
+        assert index.find_terms("al", NgramIndex.PREFIX) == ["alice", "alicia"]
+        assert index.find_terms("a", NgramIndex.PREFIX) == ["alice", "alicia", "a"]
+
+    def test_regex(self, index: NgramIndex):
+        assert index.find_terms(r"^user_\d+_NAME$", NgramIndex.REGEX) == ["user_12_name"]
+        assert index.find_terms("ali(ce|cia)", NgramIndex.REGEX) == ["alice", "malice", "alicia"]
+        with pytest.raises(re.error):
+            index.find_terms("(", NgramIndex.REGEX)
+
+    def test_required_literals(self):
+        assert NgramIndex.required_literals(r"user_(\d+)_name") == ["user_", "_name"]
+        assert NgramIndex.required_literals("abc|def") == []
+        assert NgramIndex.required_literals("(foo)?bar+") == ["ba", "r"]
+
+    def test_regex_without_parser_checks_every_term(self, index: NgramIndex, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr("ngram_index._parser", None)
+        assert NgramIndex.required_literals(r"user_(\d+)_name") == []
+        assert index.find_terms("ali(ce|cia)", NgramIndex.REGEX) == ["alice", "malice", "alicia"]
+
+    def test_unexpected_parse_result_checks_every_term(self, index: NgramIndex, monkeypatch: pytest.MonkeyPatch):
+        def parse(pattern: str, flags: int) -> List[Tuple[None]]:
+            return [(None,)]
+
+        monkeypatch.setattr("ngram_index._parser", types.SimpleNamespace(parse=parse))
+        assert NgramIndex.required_literals("alice") == []
+        assert index.find_terms("lic", NgramIndex.REGEX) == ["alice", "malice", "alicia", "x" * 300 + "lice"]
+
+    def test_add(self, index: NgramIndex):
+        index.add("carol")
+        assert index.find_terms("aro", NgramIndex.SUBSTRING) == ["carol"]
+        assert index.term_count == 8
+
+    def test_cancel(self):
+        with pytest.raises(LoadCancelled):
+            NgramIndex.build(map(str, range(NgramIndex.CANCEL_CHECK_INTERVAL)), lambda: True)
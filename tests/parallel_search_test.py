@@ -0,0 +1,121 @@
+import json
+from pathlib import Path
+from typing import Any, Iterator, List
+
+import pytest
+
+from json_inspector.manager import JsonManager
+from lazy_document import LazyDocument
+from ngram_index import NgramIndex
+from parallel_search import ParallelSearch, SharedDocument
+
+DOC: Any = {
+    "users": [{"id": i, "name": f"user_{i}", "tags": ["a", "b"]} for i in range(40)],
+    "deep": {"x": {"y": {"z": [{"id": "inner"}]}}},
+    "id": "top",
+}
+
+
+@pytest.fixture(scope="module")
+def search() -> Iterator[ParallelSearch]:
+    search = ParallelSearch(processes=2)
+    yield search
+    search.shutdown()
+
+
+@pytest.fixture
+def small_partitions(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(SharedDocument, "PARTITION_NODES", 7)
+
+
+def _serial(data: Any, term: str, mode: str = NgramIndex.EXACT) -> list[Any]:
+    manager = JsonManager.__new__(JsonManager)
+    manager.data = data
+    return manager.find_paths_in_data(term, mode=mode)
+
+
+def _matches(search: ParallelSearch, document: SharedDocument, term: str, mode: str = NgramIndex.EXACT) -> list[Any]:
+    return [item for item in search.search(document, term, mode) if not isinstance(item, float)]
+
+
+class TestSharedDocument:
+    def test_partitions(self, small_partitions: None):
+        document = SharedDocument.export(DOC)
+        try:
+            assert document.node_count == 40 * 6 + 7 + 1
+            assert len(document.partitions) == -(-document.node_count // 7)
+        finally:
+            document.retire()
+
+    def test_retire_waits_for_searches(self):
+        document = SharedDocument.export(DOC)
+        with document:
+            document.retire()
+            assert document.name
+        assert not document.name
+
+    def test_lazy_containers_stay_unloaded(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        path = tmp_path / "doc.json"
+        path.write_text(json.dumps(DOC))
+        root = LazyDocument(str(path)).root
+        # Decoding a container in one piece would hold its whole subtree in memory.
+        monkeypatch.setattr(LazyDocument, "decode", None)
+        document = SharedDocument.export(root)
+        try:
+            assert document.node_count == 40 * 6 + 7 + 1
+            assert not root.is_loaded  # type: ignore[union-attr]
+        finally:
+            document.retire()
+
+    def test_lazy_export_matches_plain(self, tmp_path: Path, search: ParallelSearch, small_partitions: None):
+        path = tmp_path / "doc.json"
+        path.write_text(json.dumps(DOC))
+        root: Any = LazyDocument(str(path)).root
+        root["deep"].load()
+        lazy, plain = SharedDocument.export(root), SharedDocument.export(DOC)
+        try:
+            assert lazy.node_count == plain.node_count
+            for term in ("id", "inner", "user_3"):
+                assert _matches(search, lazy, term) == _matches(search, plain, term)
+        finally:
+            lazy.retire()
+            plain.retire()
+
+
+class TestParallelSearch:
+    @pytest.mark.parametrize(
+        "term, mode",
+        [("id", NgramIndex.EXACT), ("user_1", NgramIndex.PREFIX), ("b", NgramIndex.SUBSTRING), (r"^\d$", NgramIndex.REGEX)],
+    )
+    def test_same_as_serial_scan(self, search: ParallelSearch, small_partitions: None, term: str, mode: str):
+        document = SharedDocument.export(DOC)
+        try:
+            assert _matches(search, document, term, mode) == _serial(DOC, term, mode)
+        finally:
+            document.retire()
+
+    def test_progress(self, search: ParallelSearch, small_partitions: None):
+        document = SharedDocument.export(DOC)
+        try:
+            fractions = [item for item in search.search(document, "id") if isinstance(item, float)]
+            assert len(fractions) == len(document.partitions)
+            assert fractions == sorted(fractions) and fractions[-1] == 1
+        finally:
+            document.retire()
+
+    def test_cancel(self, search: ParallelSearch, small_partitions: None):
+        document = SharedDocument.export(DOC)
+        try:
+            assert list(search.search(document, "id", is_cancelled=lambda: True)) == []
+        finally:
+            document.retire()
+
+    def test_nothing_after_cancel(self, search: ParallelSearch, small_partitions: None):
+        document = SharedDocument.export(DOC)
+        seen: List[Any] = []
+        try:
+            for item in search.search(document, "id", is_cancelled=lambda: bool(seen)):
+                seen.append(item)
+        finally:
+            document.retire()
+        assert len(seen) == 1
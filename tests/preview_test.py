@@ -0,0 +1,48 @@
+from typing import Any
+
+from preview import Preview
+
+
+class TestPreview:
+    def test_scalars_read_like_str(self):
+        assert Preview.text("plain") == "plain"
+        assert Preview.text(None) == "None"
+        assert Preview.text(1.5) == "1.5"
+        assert Preview.text("x" * 150, 10) == "x" * 10 + "…"
+
+    def test_small_containers_are_complete(self):
+        assert Preview.text({"a": 1, "b": [True, None], "c": "s"}) == '{"a": 1, "b": [true, null], "c": "s"}'
+        assert Preview.text([]) == "[]"
+        assert Preview.text({}) == "{}"
+
+    def test_large_containers_stop_early(self):
+        value: Any = {"a": 1, "b": list(range(1000)), **{f"k{i}": i for i in range(4312)}}
+        text = Preview.text(value, 40)
+        assert text.startswith('{"a": 1, "b": [0, 1, 2')
+        assert text.endswith("… 4,312 more}")
+        assert "… 99" in text
+        assert len(text) < 80
+
+    def test_item_limit(self):
+        assert Preview.text(list(range(10)), max_items=3) == "[0, 1, 2, … 7 more]"
+
+    def test_nested_budget(self):
+        text = Preview.text([[["x" * 50]]] * 3, 20)
+        assert text.startswith('[[["' + "x" * 16)
+        assert text.endswith("… 2 more]")
+
+    def test_cache_tracks_identity(self):
+        value = [1, 2, 3]
+        assert Preview.text(value) == "[1, 2, 3]"
+        value.append(4)
+        assert Preview.text(value) == "[1, 2, 3]"
+        Preview.clear_cache()
+        assert Preview.text(value) == "[1, 2, 3, 4]"
+
+    def test_pretty_is_bounded(self):
+        value = {"items": list(range(100000))}
+        text = Preview.pretty(value, 50)
+        assert text.startswith('{\n  "items": [\n    0,')
+        assert text.endswith("… (truncated)")
+        assert len(text) < 70
+        assert Preview.pretty({"a": [1]}, 100) == '{\n  "a": [\n    1\n  ]\n}'
@@ -0,0 +1,58 @@
+from typing import Any
+
+import pytest
+from PyQt6 import QtCore, QtGui
+
+from property_model import PropertyTableModel
+
+COLORS = {"int": "#00a9b5", "str": "#859900"}
+
+
+@pytest.fixture
+def model(qapp: Any) -> PropertyTableModel:
+    return PropertyTableModel(COLORS)
+
+
+def _row(model: PropertyTableModel, row: int) -> tuple[Any, ...]:
+    return tuple(model.index(row, column).data() for column in range(model.columnCount()))
+
+
+class TestPropertyTableModel:
+    def test_dict_rows(self, model: PropertyTableModel):
+        obj = {"name": "x", "count": 3, "nested": {"a": [1, 2]}}
+        model.set_object(obj)
+        assert model.rowCount() == 3
+        assert _row(model, 0) == ("name", "str", "x")
+        assert _row(model, 2) == ("nested", "dict", '{"a": [1, 2]}')
+        assert model.value_at(2) is obj["nested"]
+        brush: QtGui.QBrush = model.index(1, 1).data(QtCore.Qt.ItemDataRole.ForegroundRole)
+        assert brush.color().name() == COLORS["int"]
+
+    def test_list_and_scalar_rows(self, model: PropertyTableModel):
+        model.set_object([True, None])
+        assert [_row(model, i) for i in range(2)] == [("0", "bool", "True"), ("1", "NoneType", "None")]
+        model.set_object(1.5)
+        assert model.rowCount() == 1
+        assert _row(model, 0) == ("value", "float", "1.5")
+        model.clear()
+        assert model.rowCount() == 0
+
+    def test_previews_are_bounded(self, model: PropertyTableModel):
+        model.set_object([list(range(100000))] * 10000)
+        assert model.rowCount() == 10000
+        preview: str = model.index(9999, 2).data()
+        assert preview.startswith("[0, 1, 2") and preview.endswith(" more]")
+        assert len(preview) < PropertyTableModel.PREVIEW_LENGTH + 30
+
+    def test_refresh_row(self, qtbot: Any, model: PropertyTableModel):
+        obj: Any = {"a": 1, "b": [1]}
+        model.set_object(obj)
+        obj["a"] = "changed"
+        with qtbot.waitSignal(model.dataChanged):
+            model.refresh_row(0, "changed")
+        assert _row(model, 0) == ("a", "str", "changed")
+
+        model.set_object(5)
+        assert model.is_scalar
+        model.refresh_row(0, 6)
+        assert _row(model, 0) == ("value", "int", "6")
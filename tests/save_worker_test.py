@@ -0,0 +1,43 @@
+import json
+import pickle
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+from PyQt6 import QtCore
+from pytest import MonkeyPatch
+
+from document_writer import DocumentWriter
+from save_worker import SaveWorker
+
+DOC: Any = {"items": [{"id": i, "name": f"item {i}"} for i in range(200)]}
+
+
+class TestSaveWorker:
+    def test_saves_file(self, qtbot: Any, tmp_path: Path):
+        path = tmp_path / "doc.json"
+        worker = SaveWorker(DOC, str(path))
+        with qtbot.waitSignal(worker.signals.finished):
+            QtCore.QThreadPool.globalInstance().start(worker)  # type: ignore[union-attr]
+        assert json.loads(path.read_text()) == DOC
+
+    @pytest.mark.parametrize(
+        "error", [RecursionError(), RuntimeError("codec"), pickle.PicklingError()], ids=["recursion", "codec", "pickling"]
+    )
+    def test_failure_leaves_file_untouched(
+        self, qtbot: Any, tmp_path: Path, monkeypatch: MonkeyPatch, error: Exception
+    ):
+        path = tmp_path / "doc.json"
+        path.write_text('{"old": true}')
+
+        def encoded(*_args: Any) -> Iterator[bytes]:
+            yield b'{"items": ['
+            raise error
+
+        monkeypatch.setattr(DocumentWriter, "encoded", encoded)
+        worker = SaveWorker(DOC, str(path))
+        with qtbot.waitSignal(worker.signals.failed) as blocker:
+            QtCore.QThreadPool.globalInstance().start(worker)  # type: ignore[union-attr]
+        assert blocker.args == [error]
+        assert path.read_text() == '{"old": true}'
+        assert [p.name for p in tmp_path.iterdir()] == ["doc.json"]
@@ -0,0 +1,100 @@
+from typing import Any, Dict
+
+import pytest
+
+from helper import LoadCancelled
+from ngram_index import NgramIndex
+from search_index import NodePaths, SearchIndex
+
+
+@pytest.fixture
+def data() -> Dict[str, Any]:
+    return {
+        "users": [{"id": 1, "name": "Alice", "tags": ["admin"]}, {"id": 2, "name": "Bob", "tags": []}],
+        "count": 2,
+        "meta": {"Name": None, "flag": True},
+    }
+
+
+@pytest.fixture
+def index(data: Any) -> SearchIndex:
+    return SearchIndex.build(data)
+
+
+class TestSearchIndex:
+    def test_node_count(self, index: SearchIndex):
+        # root + users, 2 users with id/name/tags each, 1 tag, count, meta and its 2 children
+        assert index.node_count == 1 + 1 + 2 * 4 + 1 + 1 + 1 + 2
+
+    def test_keys_and_values(self, index: SearchIndex):
+        assert index.find("id") == [(("users", 0, "id"), "id"), (("users", 1, "id"), "id")]
+        assert [path for path, _ in index.find("ALICE")] == [("users", 0, "name")]
+        assert [path for path, _ in index.find("name")] == [("users", 0, "name"), ("users", 1, "name"), ("meta", "Name")]
+        assert [path for path, _ in index.find("true")] == [("meta", "flag")]
+        assert [path for path, _ in index.find("none")] == [("meta", "Name")]
+        assert index.find("missing") == []
+
+    def test_list_positions_are_keys(self, index: SearchIndex):
+        assert [path for path, _ in index.find("1")] == [("users", 0, "id"), ("users", 1)]
+        assert [path for path, _ in index.find("2")] == [("users", 1, "id"), ("count",)]
+
+    def test_update_scalar(self, data: Any, index: SearchIndex):
+        data["users"][0]["name"] = "Carol"
+        index.update(("users", 0, "name"), "Alice", "Carol")
+        assert index.find("alice") == []
+        assert [path for path, _ in index.find("carol")] == [("users", 0, "name")]
+
+    def test_update_container(self, index: SearchIndex):
+        index.update(("users", 0), {"id": 1, "name": "Alice", "tags": ["admin"]}, "gone")
+        assert index.find("alice") == []
+        assert index.find("admin") == []
+        assert [path for path, _ in index.find("gone")] == [("users", 0)]
+        assert [path for path, _ in index.find("id")] == [("users", 1, "id")]
+
+        index.update(("users", 0), "gone", {"id": 7, "nested": {"deep": "value"}})
+        assert index.find("gone") == []
+        assert [path for path, _ in index.find("deep")] == [("users", 0, "nested", "deep")]
+        assert index.find_node(("users", 0, "nested", "deep")) is not None
+
+        index.update(("users", 0, "nested"), {"deep": "value"}, 5)
+        assert index.find("value") == []
+        assert [path for path, _ in index.find("5")] == [("users", 0, "nested")]
+        # Siblings after the replaced node are still found through the original preorder ranges.
+        assert index.find_node(("meta", "flag")) is not None
+
+    def test_matches_stay_in_document_order_after_edits(self, index: SearchIndex):
+        index.update(("users", 0), {"id": 1, "name": "Alice", "tags": ["admin"]}, {"name": "Eve", "x": {"name": 1}})
+        index.update(("users", 0, "x"), {"name": 1}, {"name": 2})
+        assert [path for path, _ in index.find("name")] == [
+            ("users", 0, "name"),
+            ("users", 0, "x", "name"),
+            ("users", 1, "name"),
+            ("meta", "Name"),
+        ]
+
+    def test_update_is_idempotent(self, index: SearchIndex):
+        index.update(("count",), 2, 3)
+        index.update(("count",), 2, 3)
+        assert [path for path, _ in index.find("3")] == [("count",)]
+
+    def test_node_paths(self, index: SearchIndex):
+        paths = NodePaths(index, index.find_nodes("id"))
+        assert len(paths) == 2
+        assert paths[1] == ("users", 1, "id")
+
+    def test_cancel(self):
+        with pytest.raises(LoadCancelled):
+            SearchIndex.build({"k": list(range(SearchIndex.CANCEL_CHECK_INTERVAL + 1))}, lambda: True)
+
+    def test_search_modes(self, data: Any, index: SearchIndex):
+        assert [path for path, _ in index.find("LIC", NgramIndex.SUBSTRING)] == [("users", 0, "name")]
+        assert [path for path, _ in index.find("na", NgramIndex.PREFIX)] == [
+            ("users", 0, "name"),
+            ("users", 1, "name"),
+            ("meta", "Name"),
+        ]
+        assert [path for path, _ in index.find("^(bob|true)$", NgramIndex.REGEX)] == [("users", 1, "name"), ("meta", "flag")]
+
+        index.update(("users", 1, "name"), "Bob", "Robert")
+        assert [path for path, _ in index.find("bert", NgramIndex.SUBSTRING)] == [("users", 1, "name")]
+        assert index.find("bob", NgramIndex.SUBSTRING) == []
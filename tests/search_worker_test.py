@@ -0,0 +1,75 @@
+from typing import Any, List
+
+from json_inspector.manager import JsonManager
+from ngram_index import NgramIndex
+from search_worker import SearchWorker
+
+
+class ScanManager:
+    # Only the scan is needed, so skip building a whole JsonManager with its gui and monitor.
+    iter_paths_in_data = JsonManager.iter_paths_in_data
+    find_paths_in_data = JsonManager.find_paths_in_data
+    _iter_children = staticmethod(JsonManager._iter_children)  # type: ignore[attr-defined]
+    _scan_progress = staticmethod(JsonManager._scan_progress)  # type: ignore[attr-defined]
+
+    def __init__(self, data: Any) -> None:
+        self.data = data
+
+
+def _deep(depth: int) -> Any:
+    data: Any = {"needle": True}
+    for _ in range(depth):
+        data = {"d": [data]}
+    return data
+
+
+def _run(worker: SearchWorker) -> tuple[List[List[Any]], List[int], List[bool]]:
+    batches: List[List[Any]] = []
+    progress: List[int] = []
+    finished: List[bool] = []
+    worker.signals.found.connect(lambda paths: batches.append(list(paths)))  # type: ignore
+    worker.signals.progress.connect(progress.append)  # type: ignore
+    worker.signals.finished.connect(lambda: finished.append(True))  # type: ignore
+    worker.run()
+    return batches, progress, finished
+
+
+class TestSearchScan:
+    def test_matches_in_document_order(self):
+        manager = ScanManager({"users": [{"id": 1, "name": "Alice"}, {"id": 2, "name": "Bob"}], "id": "x"})
+        assert manager.find_paths_in_data("id") == [
+            (("users", 0, "id"), "id"),
+            (("users", 1, "id"), "id"),
+            (("id",), "id"),
+        ]
+        assert manager.find_paths_in_data("b", mode=NgramIndex.PREFIX) == [(("users", 1, "name"), "bob")]
+
+    def test_deep_documents(self):
+        manager = ScanManager(_deep(5000))
+        (path, _), = manager.find_paths_in_data("needle")
+        assert len(path) == 2 * 5000 + 1
+
+    def test_progress(self):
+        manager = ScanManager({"a": list(range(100)), "b": list(range(100))})
+        fractions = [item for item in manager.iter_paths_in_data("x", heartbeat=10) if isinstance(item, float)]
+        assert fractions == sorted(fractions)
+        assert 0.4 < fractions[len(fractions) // 2] < 0.6
+        assert fractions[-1] < 1
+
+
+class TestSearchWorker:
+    def test_streams_batches(self, qapp: Any):
+        manager = ScanManager({"items": [{"id": i} for i in range(10000)]})
+        batches, progress, finished = _run(SearchWorker(manager, "id"))  # type: ignore[arg-type]
+        assert len(batches[0]) == 1
+        assert sum(map(len, batches)) == 10000
+        assert batches[0][0] == ("items", 0, "id")
+        assert progress[-1] == SearchWorker.PROGRESS_MAX
+        assert finished == [True]
+
+    def test_cancel(self, qapp: Any):
+        manager = ScanManager({"items": list(range(SearchWorker.HEARTBEAT * 4))})
+        worker = SearchWorker(manager, "1")  # type: ignore[arg-type]
+        worker.cancel()
+        batches, progress, finished = _run(worker)
+        assert (batches, progress, finished) == ([], [], [])
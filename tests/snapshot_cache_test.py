@@ -0,0 +1,95 @@
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from helper import LoadCancelled
+from snapshot_cache import SnapshotCache, SnapshotUnavailable
+from splice_writer import SpliceWriter
+
+DOC: Any = {"a": [1, 2.5, None, True, "ü"], "b": {"c": {}}, "d": 10**30}
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> SnapshotCache:
+    return SnapshotCache(str(tmp_path / "snapshots"))
+
+
+def _source(tmp_path: Path, name: str = "doc.json", text: str = "{}") -> str:
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+
+class TestSnapshotCache:
+    def test_roundtrip(self, tmp_path: Path, cache: SnapshotCache):
+        path = _source(tmp_path)
+        stamp = SpliceWriter.stamp(path)
+        with pytest.raises(SnapshotUnavailable):
+            cache.load(path, stamp)
+        assert cache.store(path, stamp, DOC)
+        assert cache.load(path, stamp) == DOC
+
+    def test_changed_source_is_not_used(self, tmp_path: Path, cache: SnapshotCache):
+        path = _source(tmp_path)
+        cache.store(path, SpliceWriter.stamp(path), DOC)
+        with open(path, "a") as f:
+            f.write(" ")
+        with pytest.raises(SnapshotUnavailable):
+            cache.load(path, SpliceWriter.stamp(path))
+        assert not os.path.exists(cache.file_for(path))
+
+    def test_same_stamp_other_content_is_not_used(self, tmp_path: Path, cache: SnapshotCache):
+        path = _source(tmp_path, text="[1]")
+        stamp = SpliceWriter.stamp(path)
+        cache.store(path, stamp, [1])
+        Path(path).write_text("[2]")
+        os.utime(path, ns=(stamp[1], stamp[1]))
+        assert SpliceWriter.stamp(path) == stamp
+        with pytest.raises(SnapshotUnavailable):
+            cache.load(path, stamp)
+
+    def test_corrupt_snapshot_is_removed(self, tmp_path: Path, cache: SnapshotCache):
+        path = _source(tmp_path)
+        stamp = SpliceWriter.stamp(path)
+        cache.store(path, stamp, DOC)
+        snapshot = Path(cache.file_for(path))
+        snapshot.write_bytes(snapshot.read_bytes()[:-3])
+        with pytest.raises(SnapshotUnavailable):
+            cache.load(path, stamp)
+        assert not snapshot.exists()
+
+    def test_store_skips_changed_source(self, tmp_path: Path, cache: SnapshotCache):
+        path = _source(tmp_path)
+        stamp = SpliceWriter.stamp(path)
+        Path(path).write_text("[]  ")
+        assert not cache.store(path, stamp, DOC)
+        assert cache.size() == 0
+
+    def test_least_recently_used_are_evicted(self, tmp_path: Path, cache: SnapshotCache):
+        paths = [_source(tmp_path, f"{i}.json") for i in range(3)]
+        stamps = [SpliceWriter.stamp(path) for path in paths]
+        cache.store(paths[0], stamps[0], DOC)
+        one: int = cache.size()
+        cache.set_budget(2 * one)
+        cache.store(paths[1], stamps[1], DOC)
+        os.utime(cache.file_for(paths[0]), (0, 0))
+        os.utime(cache.file_for(paths[1]), (1, 1))
+        cache.load(paths[0], stamps[0])
+        cache.store(paths[2], stamps[2], DOC)
+        assert cache.size() == 2 * one
+        assert os.path.exists(cache.file_for(paths[0]))
+        assert not os.path.exists(cache.file_for(paths[1]))
+
+    def test_cancel(self, tmp_path: Path, cache: SnapshotCache):
+        path = _source(tmp_path)
+        stamp = SpliceWriter.stamp(path)
+        cache.store(path, stamp, DOC)
+        with pytest.raises(LoadCancelled):
+            cache.load(path, stamp, is_cancelled=lambda: True)
+
+    def test_unsupported_values_are_not_stored(self, tmp_path: Path, cache: SnapshotCache):
+        path = _source(tmp_path)
+        data: Any = {"a": object()}
+        assert not cache.store(path, SpliceWriter.stamp(path), data)
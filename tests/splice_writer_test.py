@@ -0,0 +1,75 @@
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from lazy_document import LazyDocument
+from splice_writer import SpliceUnavailable, SpliceWriter
+
+# Hand formatted, none of it may change outside the edited values.
+SOURCE = b"""{
+  "name":   "before",
+  "items" : [1, 2,   {"x": "[not] {a} \\"bracket"}],
+  "nested": {
+      "keep": true,
+      "list": [3, 4]
+  }
+}
+"""
+
+
+@pytest.fixture
+def source(tmp_path: Path) -> Path:
+    path = tmp_path / "doc.json"
+    path.write_bytes(SOURCE)
+    return path
+
+
+def _splice(source: Path, edits: dict[Any, Any], target: Path | None = None, **kwargs: Any) -> bytes:
+    target = target or source
+    SpliceWriter(str(source), SpliceWriter.stamp(str(source)), edits, **kwargs).write(str(target))
+    return target.read_bytes()
+
+
+class TestSpliceWriter:
+    def test_only_edited_values_change(self, source: Path):
+        written = _splice(source, {("name",): "after", ("items", 2, "x"): None})
+        assert written == SOURCE.replace(b'"before"', b'"after"').replace(b'"[not] {a} \\"bracket"', b"null")
+
+    def test_containers_follow_the_file_indent(self, source: Path):
+        written = _splice(source, {("nested", "list"): {"a": [1]}})
+        assert b'"list": {\n        "a": [\n          1\n        ]\n      }\n  }' in written
+        assert json.loads(written)["nested"]["list"] == {"a": [1]}
+
+    def test_edits_inside_edited_values_are_covered(self, source: Path):
+        edits = {("nested",): {"keep": False}, ("nested", "keep"): "ignored"}
+        assert json.loads(_splice(source, edits))["nested"] == {"keep": False}
+
+    def test_same_result_with_lazy_index(self, source: Path, tmp_path: Path):
+        edits = {("items", 1): [5], ("nested", "keep"): False}
+        document = LazyDocument(str(source))
+        with_index = _splice(source, edits, tmp_path / "indexed.json", document=document)
+        assert with_index == _splice(source, edits, tmp_path / "scanned.json")
+
+    def test_copy_without_copy_file_range(self, source: Path, monkeypatch: pytest.MonkeyPatch):
+        def _unsupported(*_args: Any) -> int:
+            raise OSError("not supported")
+
+        monkeypatch.setattr(os, "copy_file_range", _unsupported, raising=False)
+        monkeypatch.setattr(SpliceWriter, "COPY_CHUNK", 7)
+        assert _splice(source, {("name",): "after"}) == SOURCE.replace(b'"before"', b'"after"')
+
+    def test_changed_source_is_refused(self, source: Path):
+        writer = SpliceWriter(str(source), SpliceWriter.stamp(str(source)), {("name",): "after"})
+        source.write_bytes(SOURCE + b" ")
+        with pytest.raises(SpliceUnavailable):
+            writer.write(str(source))
+        assert source.read_bytes() == SOURCE + b" "
+
+    @pytest.mark.parametrize("path", [("missing",), ("items", 7), ("name", "deeper")])
+    def test_missing_path_is_refused(self, source: Path, path: Any):
+        with pytest.raises(SpliceUnavailable):
+            _splice(source, {path: 1})
+        assert source.read_bytes() == SOURCE
@@ -0,0 +1,251 @@
+from typing import Any
+
+import pytest
+from PyQt6 import QtCore, QtGui
+from pytestqt.qtbot import QtBot
+
+from document_diff import DocumentDiff
+from document_stats import DocumentStats
+from tree_model import JsonTreeModel, LazyItems
+
+COLORS = {"int": "#00a9b5", "dict": "#dc322f", "list": "#ff9900"}
+
+
+@pytest.fixture
+def data() -> Any:
+    return {"big": {f"k{i}": i for i in range(1200)}, "items": [{"id": i} for i in range(3)], "empty": {}}
+
+
+@pytest.fixture
+def model(qtbot: QtBot, data: Any) -> JsonTreeModel:
+    model = JsonTreeModel(QtCore.QThreadPool.globalInstance(), COLORS)  # type: ignore
+    model.set_root(data)
+    return model
+
+
+def _fetch(qtbot: QtBot, model: JsonTreeModel, index: QtCore.QModelIndex) -> None:
+    model.fetchMore(index)
+    qtbot.waitUntil(lambda: model.rowCount(index) > 0)
+
+
+class TestJsonTreeModel:
+    def test_root_row(self, model: JsonTreeModel):
+        assert model.rowCount() == 1
+        root = model.root_index()
+        assert root.data() == "root"
+        assert model.index(0, 1).data() == "dict"
+        assert model.hasChildren(root) and model.rowCount(root) == 0
+        assert model.canFetchMore(root)
+
+    def test_children_are_fetched_in_batches(self, qtbot: QtBot, model: JsonTreeModel):
+        root = model.root_index()
+        _fetch(qtbot, model, root)
+        big = model.index(0, 0, root)
+        assert (big.data(), model.index(0, 1, root).data()) == ("big", "dict")
+
+        _fetch(qtbot, model, big)
+        assert model.rowCount(big) == JsonTreeModel.FETCH_BATCH
+        assert model.canFetchMore(big)
+        model.fetchMore(big)
+        model.fetchMore(big)
+        assert model.rowCount(big) == 1200
+        assert not model.canFetchMore(big)
+
+        # Nodes only exist for rows that were asked for.
+        assert len(model.node(big).nodes) < 1200
+        leaf = model.index(1199, 0, big)
+        assert leaf.data() == "k1199"
+        assert leaf.data(QtCore.Qt.ItemDataRole.UserRole) == "1199"
+        brush: QtGui.QBrush = leaf.data(QtCore.Qt.ItemDataRole.ForegroundRole)
+        assert brush.color().name() == COLORS["int"]
+        assert model.parent(leaf) == big
+
+    def test_empty_container_has_no_children(self, qtbot: QtBot, model: JsonTreeModel):
+        root = model.root_index()
+        _fetch(qtbot, model, root)
+        empty = model.index(2, 0, root)
+        model.fetchMore(empty)
+        qtbot.waitUntil(lambda: model.node(empty).children is not None)
+        assert not model.hasChildren(empty)
+
+    def test_jump_to_row(self, model: JsonTreeModel):
+        root_node = model.node(model.root_index())
+        model.prepare_children(root_node)
+        assert model.ensure_row(root_node, model.row_for_key(root_node, "items")) is True
+        items = model.node(model.index(model.row_for_key(root_node, "items"), 0, model.root_index()))
+        assert model.ensure_row(items, 2) is True
+        assert model.ensure_row(items, 3) is False
+        assert items.child(2).path == ("items", 2)
+
+    def test_jump_prepares_only_the_path(self, model: JsonTreeModel):
+        root_node = model.node(model.root_index())
+        model.prepare_children(root_node)
+        big_row: int = model.row_for_key(root_node, "big")
+        model.ensure_row(root_node, big_row)
+        big = root_node.child(big_row)
+        children = model.prepare_children(big)
+        assert isinstance(children, LazyItems) and len(children) == 1200
+        assert model.row_for_key(big, "k1100") == 1100
+        assert model.row_for_key(big, "missing") == -1
+        model.ensure_row(big, 1100)
+        assert model.index_for_node(big.child(1100)).data() == "k1100"
+        assert len(children._items) < 50  # type: ignore
+
+    def test_jump_shows_a_window(self, model: JsonTreeModel):
+        root_node = model.node(model.root_index())
+        model.prepare_children(root_node)
+        model.ensure_row(root_node, model.row_for_key(root_node, "big"))
+        big = root_node.child(model.row_for_key(root_node, "big"))
+        big_index = model.index_for_node(big)
+        model.prepare_children(big)
+        model.ensure_row(big, 1100)
+        assert model.rowCount(big_index) == 1 + 1200 - (1100 - JsonTreeModel.FETCH_BATCH // 2)
+        placeholder = model.index(0, 0, big_index)
+        assert placeholder.data() == f"… {1100 - JsonTreeModel.FETCH_BATCH // 2:,} earlier items"
+        assert not model.flags(placeholder) & QtCore.Qt.ItemFlag.ItemIsSelectable
+        assert model.index(1, 0, big_index).data() == f"k{1100 - JsonTreeModel.FETCH_BATCH // 2}"
+        assert model.parent(model.index_for_node(big.child(1100))) == big_index
+
+        first: int = 1100 - JsonTreeModel.FETCH_BATCH // 2
+        model.fetch_previous(big)
+        assert model.index(1, 0, big_index).data() == f"k{first - JsonTreeModel.FETCH_BATCH}"
+        model.fetch_previous(big)
+        assert model.rowCount(big_index) == 1200
+        assert model.index(0, 0, big_index).data() == "k0"
+        assert model.index_for_node(big.child(1100)).row() == 1100
+
+    def test_subtree_totals_in_type_column(self, qtbot: QtBot, model: JsonTreeModel, data: Any):
+        root = model.root_index()
+        model.set_stats(DocumentStats.build(data))
+        _fetch(qtbot, model, root)
+        assert model.index(0, 1, root).data() == "dict · 1,200 · 13.1 KB"
+        assert model.index(1, 1, root).data() == "list · 6 · 28 B"
+        assert "6 descendants" in model.index(1, 1, root).data(QtCore.Qt.ItemDataRole.ToolTipRole)
+        model.set_root(data)
+        assert model.index(0, 1).data() == "dict"
+
+    def test_prefetch_is_bounded(self, qtbot: QtBot, model: JsonTreeModel):
+        root = model.root_index()
+        _fetch(qtbot, model, root)
+        items = model.index(1, 0, root)
+        _fetch(qtbot, model, items)
+        rows = [model.node(model.index(row, 0, items)) for row in range(3)]
+        model.prefetch(rows + rows)
+        assert len(model._prefetching) == JsonTreeModel.PREFETCH_IN_FLIGHT  # type: ignore
+        assert len(model._prefetch_queue) == 1  # type: ignore
+        model.prefetch(rows[:1])
+        assert not model._prefetch_queue  # type: ignore
+        qtbot.waitUntil(lambda: not model._prefetching)  # type: ignore
+        assert set(model._cache) == {(), ("items",), ("items", 0), ("items", 1)}  # type: ignore
+
+    def test_expand_waits_for_running_prefetch(self, qtbot: QtBot, model: JsonTreeModel):
+        root = model.root_index()
+        _fetch(qtbot, model, root)
+        items = model.index(1, 0, root)
+        model.prefetch([model.node(items)])
+        model.fetchMore(items)
+        assert len(model._active_workers) == 1  # type: ignore
+        qtbot.waitUntil(lambda: model.rowCount(items) == 3)
+
+    def test_outline_is_not_selectable(self, model: JsonTreeModel):
+        model.set_outline("dict", [("big", "dict", 1200), ("name", "…", None)], 5)
+        root = model.root_index()
+        assert model.rowCount(root) == 3
+        assert model.index(0, 1, root).data() == "dict (1,200)"
+        assert model.index(1, 1, root).data() == "…"
+        assert model.index(2, 0, root).data() == "… 5 more"
+        assert not model.flags(model.index(0, 0, root)) & QtCore.Qt.ItemFlag.ItemIsSelectable
+        assert not model.canFetchMore(model.index(0, 0, root))
+
+    def test_reset_drops_pending_results(self, qtbot: QtBot, model: JsonTreeModel, data: Any):
+        model.fetchMore(model.root_index())
+        model.set_root({"other": 1})
+        qtbot.waitUntil(lambda: not model._active_workers)  # type: ignore
+        assert model.rowCount(model.root_index()) == 0
+
+    def test_value_changed(self, qtbot: QtBot, model: JsonTreeModel, data: Any):
+        root = model.root_index()
+        _fetch(qtbot, model, root)
+        items = model.index(1, 0, root)
+        _fetch(qtbot, model, items)
+        assert model.rowCount(items) == 3
+
+        old = data["items"]
+        data["items"] = "replaced"
+        model.value_changed(("items",), old, "replaced")
+        assert model.index(1, 1, root).data() == "str"
+        assert model.rowCount(items) == 0
+        assert not model.hasChildren(items)
+        assert ("items",) not in model._cache  # type: ignore
+        assert model.node(items).value == "replaced"
+
+    def test_value_changed_keeps_sibling_prefetch(self, qtbot: QtBot, model: JsonTreeModel, data: Any):
+        root = model.root_index()
+        _fetch(qtbot, model, root)
+        items = model.index(1, 0, root)
+        _fetch(qtbot, model, items)
+        first, second = model.index(0, 0, items), model.index(1, 0, items)
+        model.prefetch([model.node(first), model.node(second)])
+        model.fetchMore(second)
+
+        old = data["items"][0]
+        data["items"][0] = 5
+        model.value_changed(("items", 0), old, 5)
+        qtbot.waitUntil(lambda: model.rowCount(second) == 1)
+        assert ("items", 0) not in model._cache  # type: ignore
+
+    def test_node_values_keep_key_types(self, qtbot: QtBot):
+        data: Any = {"1": {"a": True}, "list": [{"1": "str key"}]}
+        model = JsonTreeModel(QtCore.QThreadPool.globalInstance(), COLORS)  # type: ignore
+        model.set_root(data)
+        root = model.node(model.root_index())
+        model.prepare_children(root)
+        one = root.child(model.row_for_key(root, "1"))
+        assert (one.key, one.value) == ("1", {"a": True})
+        listed = root.child(model.row_for_key(root, "list"))
+        model.prepare_children(listed)
+        inner = listed.child(0)
+        model.prepare_children(inner)
+        assert inner.child(model.row_for_key(inner, "1")).value == "str key"
+        assert inner.child(0).path == ("list", 0, "1")
+
+    def test_apply_diff_keeps_unchanged_rows(self, qtbot: QtBot, model: JsonTreeModel, data: Any):
+        root = model.root_index()
+        _fetch(qtbot, model, root)
+        big, items = model.index(0, 0, root), model.index(1, 0, root)
+        _fetch(qtbot, model, big)
+        _fetch(qtbot, model, items)
+        first_item = model.index(0, 0, items)
+        _fetch(qtbot, model, first_item)
+        big_node, item_node = model.node(big), model.node(first_item)
+
+        new: Any = {
+            "big": dict(data["big"], k5="five"),
+            "items": [{"id": 0}, {"id": 1}, {"id": 2}, {"id": 3}],
+            "empty": {},
+        }
+        model.apply_diff(new, DocumentDiff.compare(data, new))
+
+        # The same nodes behind the same rows, now pointing into the new document.
+        assert model.index(0, 0, root).internalPointer() is big_node
+        assert model.index(0, 0, items).internalPointer() is item_node
+        assert model.rowCount(first_item) == 1 and item_node.value is new["items"][0]
+        assert model.index(5, 1, big).data() == "str"
+        assert model.index(5, 0, big).data(QtCore.Qt.ItemDataRole.UserRole) == "five"
+        assert model.rowCount(items) == 4
+        assert model.index(3, 0, items).data(QtCore.Qt.ItemDataRole.BackgroundRole) is not None
+        assert model.index(5, 0, big).data(QtCore.Qt.ItemDataRole.BackgroundRole) is not None
+        assert model.index(0, 0, items).data(QtCore.Qt.ItemDataRole.BackgroundRole) is None
+
+    def test_apply_diff_with_new_keys_prepares_rows_again(self, qtbot: QtBot, model: JsonTreeModel, data: Any):
+        root = model.root_index()
+        _fetch(qtbot, model, root)
+        items = model.index(1, 0, root)
+        _fetch(qtbot, model, items)
+
+        new: Any = {"added": 1, "items": data["items"][:1], "empty": {}}
+        model.apply_diff(new, DocumentDiff.compare(data, new))
+        qtbot.waitUntil(lambda: model.rowCount(root) == 3)
+        assert [model.index(row, 0, root).data() for row in range(3)] == ["added", "items", "empty"]
+        assert model.rowCount(model.index(1, 0, root)) == 0
+        assert ("big",) not in model._cache  # type: ignore